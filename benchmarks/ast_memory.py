@@ -0,0 +1,66 @@
+"""
+Measures the memory held by the syntax trees of the bundled jQuery and Angular
+sources, as traced by tracemalloc while the tree is kept alive, with the
+default options, with `range` and `loc`, and kept in an Arena.
+
+    python benchmarks/ast_memory.py
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+FILES = ('jquery-1.9.1.js', 'angular-1.2.5.js')
+
+OPTIONS = (
+    ('default', {}),
+    ('range+loc', {'range': True, 'loc': True}),
+    ('arena', {'arena': True}),
+    ('arena+loc', {'arena': True, 'range': True, 'loc': True}),
+)
+
+
+def countNodes(tree):
+    if isinstance(tree, esprima.arena.ArenaNode):
+        return len(tree.arena)
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, esprima.nodes.Node):
+            count += 1
+            stack.extend(value for key, value in node.items() if key != 'loc')
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+def main():
+    for name in FILES:
+        with io.open(os.path.join(ROOT, 'test', '3rdparty', name), encoding='utf-8') as f:
+            code = f.read()
+        for label, options in OPTIONS:
+            esprima.parse(code, options)
+            tracemalloc.start()
+            try:
+                before = tracemalloc.take_snapshot()
+                tree = esprima.parse(code, options)
+                after = tracemalloc.take_snapshot()
+            finally:
+                tracemalloc.stop()
+            size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+            nodes = countNodes(tree)
+            print('%-18s %-10s %7d nodes %9.1f KB %6.1f bytes/node' % (
+                name, label, nodes, size / 1024.0, float(size) / nodes))
+
+
+if __name__ == '__main__':
+    main()
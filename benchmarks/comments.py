@@ -0,0 +1,46 @@
+"""
+Times skipping of license headers, JSDoc blocks and indentation, with and
+without comment collection.
+
+    python benchmarks/comments.py [blocks]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+LICENSE = '/*!\n' + ''.join(' * Lorem ipsum dolor sit amet, consectetur adipiscing elit %d.\n' % i for i in range(200)) + ' */\n'
+
+BLOCK = '''
+    /**
+     * Returns the sum of `a` and `b`.
+     *
+     * @param {number} a The first operand.
+     * @param {number} b The second operand.
+     * @returns {number} The sum.
+     */
+    function add(a, b) {
+        // Plain addition, no coercion.
+        return a + b;
+    }
+'''
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    code = LICENSE + BLOCK * blocks
+    for options in ({}, {'comment': True}):
+        for name, fn in (('tokenize', esprima.tokenize), ('parse', esprima.parse)):
+            seconds = min(timeit.repeat(lambda: fn(code, options), number=1, repeat=3))
+            print('%-9s %-18s %8.1f ms' % (name, options or '', seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Measures the import time of esprima in fresh interpreters, together with the
+cost of the category scan that esprima.character used to run on every import.
+
+    python benchmarks/import_time.py [runs]
+"""
+
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT = '''
+import time
+start = time.perf_counter()
+import %s
+print(time.perf_counter() - start)
+'''
+
+CATEGORY_SCAN = '''
+import unicodedata
+from collections import defaultdict
+categories = defaultdict(list)
+for c in map(chr, range(0x10000)):
+    categories[unicodedata.category(c)].append(c)
+letters = set(categories['Lu'] + categories['Ll'] + categories['Lt'] +
+              categories['Lm'] + categories['Lo'] + categories['Nl'])
+parts = letters.union(categories['Mn'] + categories['Mc'] +
+                      categories['Nd'] + categories['Pc'])
+'''
+
+
+def importTime(module, runs):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    # warm the bytecode cache once, then take the best of `runs`
+    times = []
+    for _ in range(runs + 1):
+        output = subprocess.check_output([sys.executable, '-c', IMPORT % module], cwd=ROOT, env=env)
+        times.append(float(output))
+    return min(times[1:])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    scan = min(timeit.repeat(CATEGORY_SCAN, number=1, repeat=runs))
+    print('legacy category scan:      %8.2f ms' % (scan * 1000))
+    print('import esprima:            %8.2f ms' % (importTime('esprima', runs) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Reports the peak RSS of streaming the tokens of a large synthetic bundle,
+made of copies of the libraries in test/3rdparty, when the source is given
+as text, bytes, an mmap or a path. Each run is a separate process.
+
+    python benchmarks/input_memory.py [megabytes]
+"""
+
+from __future__ import print_function
+
+import glob
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADERS = {
+    'text': "code = io.open(path, encoding='utf-8').read()",
+    'bytes': "code = io.open(path, 'rb').read()",
+    'mmap': "f = io.open(path, 'rb'); code = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)",
+    'path': "code = pathlib.Path(path)",
+}
+
+SCRIPT = '''
+import io, mmap, pathlib, resource, sys
+sys.path.insert(0, %r)
+import esprima
+path = %r
+%s
+for token in esprima.iterTokens(code):
+    pass
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def bundle(path, size):
+    libraries = []
+    for name in sorted(glob.glob(os.path.join(ROOT, 'test', '3rdparty', '*.js'))):
+        with io.open(name, encoding='utf-8') as f:
+            libraries.append(f.read())
+    written = 0
+    with io.open(path, 'w', encoding='utf-8') as f:
+        while written < size:
+            for code in libraries:
+                f.write(';\n')
+                f.write(code)
+                written += len(code) + 2
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 64 * 1024 * 1024
+    fd, path = tempfile.mkstemp(suffix='.js')
+    os.close(fd)
+    try:
+        bundle(path, size)
+        print('bundle: %.1f MB' % (os.path.getsize(path) / 1e6))
+        for name in ('text', 'bytes', 'mmap', 'path'):
+            output = subprocess.check_output([sys.executable, '-c', SCRIPT % (ROOT, path, LOADERS[name])])
+            print('%-6s %8.1f MB peak RSS' % (name, int(output) / 1024.0))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Times parse() of the libraries in test/3rdparty with and without the `lazy`
+option, which checks function bodies but only builds them once they are read,
+and the cost of then reading every body (toDict). CPU time is reported, best
+of `runs`.
+
+    python benchmarks/lazy_bodies.py [runs]
+"""
+
+from __future__ import print_function
+
+import glob
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+OPTIONS = {'range': True}
+
+
+def best(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for path in sorted(glob.glob(os.path.join(ROOT, 'test', '3rdparty', '*.js'))):
+        with io.open(path, encoding='utf-8') as f:
+            code = f.read()
+        name = os.path.basename(path)
+        eager = best(lambda: esprima.parse(code, OPTIONS), runs)
+        lazy = best(lambda: esprima.parse(code, OPTIONS, lazy=True), runs)
+        full = best(lambda: esprima.toDict(esprima.parse(code, OPTIONS, lazy=True)), runs)
+        eagerFull = best(lambda: esprima.toDict(esprima.parse(code, OPTIONS)), runs)
+        print('%-26s eager %6.0f ms  lazy %6.0f ms  toDict eager %6.0f ms  lazy %6.0f ms' % (
+            name, eager * 1000, lazy * 1000, eagerFull * 1000, full * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures parse() and tokenize() with `loc=True` on the bundled jQuery and
+Angular sources: CPU time (best of `runs`), traced peak memory, and the time
+taken to then read every node location, as a consumer walking the whole tree
+would.
+
+    python benchmarks/lazy_loc.py [runs]
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+FILES = ('jquery-1.9.1.js', 'angular-1.2.5.js')
+
+
+def touch(tree):
+    lines = 0
+    stack = [tree]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, list):
+            stack.extend(obj)
+        elif isinstance(obj, esprima.nodes.Node):
+            lines += obj.loc.start.line + obj.loc.end.column
+            stack.extend(v for k, v in obj.__dict__.items() if k != 'loc')
+    return lines
+
+
+def best(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def peak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name in FILES:
+        with io.open(os.path.join(ROOT, 'test', '3rdparty', name), encoding='utf-8') as f:
+            code = f.read()
+        for label, fn in (('parse', esprima.parseScript), ('tokenize', esprima.tokenize)):
+            seconds = best(lambda: fn(code, loc=True), runs)
+            print('%-18s %-9s %6.0f ms %7.1f MB peak' % (
+                name, label, seconds * 1000, peak(lambda: fn(code, loc=True)) / 1e6))
+        tree = esprima.parseScript(code, loc=True)
+        seconds = best(lambda: touch(tree), 1)
+        print('%-18s %-9s %6.0f ms' % (name, 'read loc', seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
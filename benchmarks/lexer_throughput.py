@@ -0,0 +1,49 @@
+"""
+Compares the throughput of the default character by character scanner with
+the regex driven one (`lexer='regex'`) on the libraries in test/3rdparty,
+checking that both produce the same tokens.
+
+    python benchmarks/lexer_throughput.py [runs]
+"""
+
+from __future__ import print_function
+
+import glob
+import io
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+
+def tokens(code, **options):
+    return [(t.type, t.value, t.range) for t in esprima.tokenize(code, range=True, **options)]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    total = {}
+    size = 0
+    print('%-28s %10s %10s %8s' % ('file', 'default', 'regex', 'speedup'))
+    for path in sorted(glob.glob(os.path.join(ROOT, 'test', '3rdparty', '*.js'))):
+        with io.open(path, encoding='utf-8') as f:
+            code = f.read()
+        if tokens(code) != tokens(code, lexer='regex'):
+            sys.exit('%s: token streams differ' % path)
+        size += len(code)
+        rates = []
+        for lexer in (None, 'regex'):
+            seconds = min(timeit.repeat(lambda: esprima.tokenize(code, lexer=lexer), number=1, repeat=runs))
+            total[lexer] = total.get(lexer, 0) + seconds
+            rates.append(len(code) / seconds / 1e6)
+        print('%-28s %6.2f MB/s %6.2f MB/s %7.2fx' % (os.path.basename(path), rates[0], rates[1], rates[1] / rates[0]))
+    print('%-28s %6.2f MB/s %6.2f MB/s %7.2fx' % (
+        'total', size / total[None] / 1e6, size / total['regex'] / 1e6, total[None] / total['regex']))
+
+
+if __name__ == '__main__':
+    main()
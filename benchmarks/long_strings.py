@@ -0,0 +1,43 @@
+"""
+Times scanning of long string literals, template literals and JSX text,
+the shape of inlined data and base64 blobs in bundles.
+
+    python benchmarks/long_strings.py [megabytes]
+"""
+
+from __future__ import print_function
+
+import base64
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+
+def inputs(size):
+    blob = base64.b64encode(os.urandom(size * 3 // 4)).decode('ascii')
+    escaped = ('abc\\n\\t\\x41\\u0042\\u{1F600}\\\\\\"' * (size // 32 + 1))[:size]
+    escaped = escaped[:escaped.rfind('abc')]
+    lines = ('lorem ipsum dolor sit amet ${x} \\u0041\n' * (size // 40 + 1))
+    text = ('lorem ipsum &amp; dolor sit amet\n' * (size // 33 + 1))
+    return (
+        ('base64 string', 'var s = "%s";' % blob, {}),
+        ('escaped string', 'var s = "%s";' % escaped, {}),
+        ('template', 'var s = `%s`;' % lines, {}),
+        ('JSX text', 'var s = <p>%s</p>;' % text, {'jsx': True}),
+    )
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 4 * 1024 * 1024
+    for name, code, options in inputs(size):
+        seconds = min(timeit.repeat(lambda: esprima.parse(code, options), number=1, repeat=3))
+        print('%-16s %8.1f ms %8.2f MB/s' % (name, seconds * 1000, len(code) / seconds / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Profiles parse() of the libraries in test/3rdparty and reports the calls to,
+and the time spent in, the token predicates and dispatchers of the parser.
+
+    python benchmarks/matcher_profile.py
+"""
+
+from __future__ import print_function
+
+import cProfile
+import glob
+import io
+import os
+import pstats
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+OPTIONS = {'range': True}
+
+FUNCTIONS = (
+    'match', 'matchKeyword', 'matchContextualKeyword', 'matchAssign',
+    'binaryPrecedence', 'parseStatement', 'parseStatementListItem',
+)
+
+
+def main():
+    codes = []
+    for path in sorted(glob.glob(os.path.join(ROOT, 'test', '3rdparty', '*.js'))):
+        with io.open(path, encoding='utf-8') as f:
+            codes.append(f.read())
+
+    profile = cProfile.Profile()
+    profile.enable()
+    for code in codes:
+        esprima.parse(code, OPTIONS)
+    profile.disable()
+
+    stats = pstats.Stats(profile).stats
+    calls = 0
+    own = 0
+    for (filename, line, name), (_, ncalls, tottime, _, _) in sorted(stats.items()):
+        if name in FUNCTIONS and filename.endswith('parser.py'):
+            print('%-26s %9d calls %8.0f ms' % (name, ncalls, tottime * 1000))
+            calls += ncalls
+            own += tottime
+    print('%-26s %9d calls %8.0f ms' % ('total', calls, own * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Times parse() of the libraries in test/3rdparty without a cache, with an
+empty cache (parse and store) and with a warm one (load). CPU time is
+reported, best of `runs`, along with the size of the cache entries.
+
+    python benchmarks/parse_cache.py [runs]
+"""
+
+from __future__ import print_function
+
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+OPTIONS = {'range': True, 'loc': True}
+
+
+def best(fn, runs, setup=None):
+    times = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    directory = tempfile.mkdtemp()
+    try:
+        cache = esprima.ParseCache(directory)
+        for path in sorted(glob.glob(os.path.join(ROOT, 'test', '3rdparty', '*.js'))):
+            with io.open(path, encoding='utf-8') as f:
+                code = f.read()
+            name = os.path.basename(path)
+            plain = best(lambda: esprima.parse(code, OPTIONS), runs)
+            cold = best(lambda: esprima.parse(code, OPTIONS, cache=cache), runs, cache.clear)
+            warm = best(lambda: esprima.parse(code, OPTIONS, cache=cache), runs)
+            size = sum(os.path.getsize(os.path.join(cache.directory, entry)) for entry in os.listdir(cache.directory))
+            print('%-26s none %6.0f ms  cold %6.0f ms  warm %5.0f ms  %6.0f KB' % (
+                name, plain * 1000, cold * 1000, warm * 1000, size / 1024.0))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
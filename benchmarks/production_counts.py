@@ -0,0 +1,66 @@
+"""
+Counts the calls to every parse* production of the parser, along with the
+cover grammar wrappers, while parsing the libraries in test/3rdparty, and
+times the parse. CPU time is reported, best of `runs`.
+
+    python benchmarks/production_counts.py [runs]
+"""
+
+from __future__ import print_function
+
+import collections
+import glob
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+from esprima.parser import Parser  # noqa: E402
+
+OPTIONS = {'range': True}
+
+
+def counting(counts, name, method):
+    def wrapper(*args, **kwargs):
+        counts[name] += 1
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def best(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    counts = collections.Counter()
+    attributes = {}
+    for name in dir(Parser):
+        if name.startswith('parse') or name in ('isolateCoverGrammar', 'inheritCoverGrammar'):
+            attributes[name] = counting(counts, name, getattr(Parser, name))
+    CountingParser = type('CountingParser', (Parser,), attributes)
+
+    elapsed = 0
+    for path in sorted(glob.glob(os.path.join(ROOT, 'test', '3rdparty', '*.js'))):
+        with io.open(path, encoding='utf-8') as f:
+            code = f.read()
+        CountingParser(code, OPTIONS).parseScript()
+        elapsed += best(lambda: esprima.parse(code, OPTIONS), runs)
+
+    for name, count in counts.most_common():
+        print('%-40s %9d' % (name, count))
+    print('%-40s %9d' % ('total', sum(counts.values())))
+    print('parse time %.0f ms' % (elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Times the bare scanner (scanComments() and lex() until EOF) and tokenize()
+on the bundled jQuery and Angular sources. CPU time is reported, best of
+`runs`.
+
+    python benchmarks/scanner_speed.py [runs]
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+from esprima.error_handler import ErrorHandler  # noqa: E402
+from esprima.scanner import Scanner  # noqa: E402
+
+FILES = ('jquery-1.9.1.js', 'angular-1.2.5.js')
+
+
+def scan(code):
+    scanner = Scanner(code, ErrorHandler())
+    while True:
+        try:
+            scanner.scanComments()
+            if scanner.eof():
+                break
+            scanner.lex()
+        except esprima.Error:
+            # Without a parser, the slash of a regular expression is scanned
+            # as a punctuator and its body may not tokenize.
+            scanner.index += 1
+
+
+def best(fn, code, runs):
+    times = []
+    for _ in range(runs):
+        start = time.process_time()
+        fn(code)
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name in FILES:
+        with io.open(os.path.join(ROOT, 'test', '3rdparty', name), encoding='utf-8') as f:
+            code = f.read()
+        for label, fn in (('scanner', scan), ('tokenize', esprima.tokenize)):
+            print('%-18s %-9s %6.0f ms' % (name, label, best(fn, code, runs) * 1000))
+
+
+if __name__ == '__main__':
+    main()
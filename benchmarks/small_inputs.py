@@ -0,0 +1,75 @@
+"""
+Throughput on snippets under 100 bytes, such as inline event handlers and
+javascript: URLs: esprima.parse(), a new Parser per snippet, and one Parser
+re-armed with reset(). CPU time is reported, best of `runs`.
+
+    python benchmarks/small_inputs.py [runs]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+from esprima.parser import Parser  # noqa: E402
+
+SNIPPETS = [
+    'alert(1)',
+    'return false;',
+    'void(0)',
+    'this.style.color = "red"',
+    'history.back(); return false',
+    'toggle(this, "menu-" + id)',
+    'window.open(this.href, "_blank", "width=600,height=400"); return false;',
+    'document.getElementById("q").value = ""; this.form.submit()',
+    'if (!confirm("Delete?")) { event.preventDefault() }',
+    'location.href = "/search?q=" + encodeURIComponent(q.value)',
+]
+
+OPTIONS = {'range': True}
+
+REPEAT = 1000
+
+
+def best(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    snippets = SNIPPETS * REPEAT
+    # Handlers are function bodies.
+    options = dict(OPTIONS, tolerant=True)
+
+    def viaParse():
+        for code in snippets:
+            esprima.parse(code, options)
+
+    def viaParser():
+        for code in snippets:
+            Parser(code, options).parseScript()
+
+    parser = Parser('', options)
+
+    def viaReset():
+        for code in snippets:
+            parser.reset(code)
+            parser.parseScript()
+
+    for name, fn in (('esprima.parse', viaParse), ('Parser()', viaParser), ('Parser.reset()', viaReset)):
+        elapsed = best(fn, runs)
+        print('%-16s %8.0f snippets/s  %6.1f us each' % (name, len(snippets) / elapsed, elapsed / len(snippets) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
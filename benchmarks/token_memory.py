@@ -0,0 +1,57 @@
+"""
+Measures the memory held by the raw tokens of the bundled jQuery and Angular
+sources, as traced by tracemalloc while every token scanned is kept alive.
+
+    python benchmarks/token_memory.py
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import esprima  # noqa: E402
+
+FILES = ('jquery-1.9.1.js', 'angular-1.2.5.js')
+
+
+def scan(code):
+    # Scanned through the parser, so that regular expressions are recognized.
+    tokens = []
+    parser = esprima.parser.Parser(code)
+    nextToken = parser.nextToken
+
+    def keep():
+        token = nextToken()
+        tokens.append(token)
+        return token
+
+    parser.nextToken = keep
+    parser.parseScript()
+    return tokens
+
+
+def main():
+    for name in FILES:
+        with io.open(os.path.join(ROOT, 'test', '3rdparty', name), encoding='utf-8') as f:
+            code = f.read()
+        scan(code)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            tokens = scan(code)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        print('%-18s %7d tokens %8.1f KB %6.1f bytes/token' % (
+            name, len(tokens), size / 1024.0, float(size) / len(tokens)))
+
+
+if __name__ == '__main__':
+    main()
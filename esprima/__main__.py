@@ -23,9 +23,11 @@
 
 from __future__ import absolute_import, unicode_literals, print_function, division
 
+import mmap
 import sys
 
 from .esprima import parse, tokenize, Error, toDict
+from .scanner import readSource
 from . import version
 
 
@@ -57,6 +59,9 @@ def main():
     parser.add_option("--tolerant", dest="tolerant", default=False,
                       action="store_true",
                       help="Tolerate errors on a best-effort basis (experimental)")
+    parser.add_option("--recover", dest="recover", default=False,
+                      action="store_true",
+                      help="Replace statements and class members that do not parse with ErrorNodes")
     parser.add_option("--tokenize", dest="tokenize", default=False,
                       action="store_true",
                       help="Only tokenize, do not parse.")
@@ -66,14 +71,24 @@ def main():
     parser.set_defaults(jsx=True, classProperties=True)
     opts, args = parser.parse_args()
 
+    # The scanner decodes bytes and maps as UTF-8.
     if len(args) == 1:
         with open(args[0], 'rb') as f:
-            code = f.read().decode('utf-8')
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                code = ''
+            else:
+                try:
+                    code = readSource(buffer)
+                finally:
+                    buffer.close()
     elif sys.stdin.isatty():
         parser.print_help()
         return 64
     else:
-        code = sys.stdin.read().decode('utf-8')
+        code = getattr(sys.stdin, 'buffer', sys.stdin).read()
 
     options = opts.__dict__
     do_tokenize = options.pop('tokenize')
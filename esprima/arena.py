@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+# Copyright JS Foundation and other contributors, https://js.foundation/
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL <COPYRIGHT HOLDER> BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, unicode_literals
+
+from array import array
+
+from .cache import collectionPaused
+from .compat import basestring
+from .nodes import FIELDS, Node, fieldNames
+from .objects import Object
+from .scanner import LazySourceLocation
+
+# How each field of a shape is stored.
+TYPE = 0
+VALUE = 1
+NODE = 2
+LIST = 3
+RANGE = 4
+LOCATION = 5
+
+FACADES = {}
+
+
+def facadeClass(cls):
+    # Named after the class of the node, for the visitors to dispatch on.
+    facade = FACADES.get(cls)
+    if facade is None:
+        facade = FACADES[cls] = type(str(cls.__name__), (ArenaNode,), {'__slots__': ()})
+    return facade
+
+
+class ArenaNode(Object):
+    """
+    Stands for the node at `index` of an Arena. Its fields are read from the
+    arena when accessed, and the nodes among them are new facades.
+    """
+
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    def __getattr__(self, name):
+        return self.arena.field(self.index, name)
+
+    def __eq__(self, other):
+        return isinstance(other, ArenaNode) and self.arena is other.arena and self.index == other.index
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.arena), self.index))
+
+    def __dir__(self):
+        return list(self.keys())
+
+    def keys(self):
+        return [key for key, value in self.items()]
+
+    def items(self):
+        return self.arena.items(self.index)
+
+
+class Arena(object):
+    """
+    A syntax tree kept in flat columns rather than as an object per node.
+    Nodes are numbered in source order, parents before their children, and
+    node i has the type code kinds[i], the offsets starts[i] and ends[i], and
+    the indexes of its parent, first child and next sibling, -1 where there
+    is none. The subtree of a node is thus the run of indexes that follows it.
+
+    The other fields are laid out by the shape of the node, its class and
+    field names: the child nodes and lists of them go to `links`, the names,
+    operators, literal values and such to `values`.
+    """
+
+    def __init__(self, tree, keepRange=True):
+        self.types = []
+        self.typeCodes = {}
+        self.shapes = []
+        self.shapeIndex = {}
+        self.kinds = array('H')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.parents = array('i')
+        self.firstChild = array('i')
+        self.nextSibling = array('i')
+        self.nodeShapes = array('H')
+        self.linkStarts = array('i')
+        self.links = array('i')
+        self.valueStarts = array('i')
+        self.values = []
+        self.locations = {}
+        self.lines = None
+        self.locationSource = None
+        self.keepRange = keepRange
+        with collectionPaused():
+            self.build(tree)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def root(self):
+        return self.node(0)
+
+    def build(self, tree):
+        links = self.links
+        values = self.values
+        firstChild = self.firstChild
+        nextSibling = self.nextSibling
+        lastChild = array('i')
+        strings = {}
+
+        stack = [(tree, -1, -1)]
+        while stack:
+            node, parent, slot = stack.pop()
+            index = len(self.kinds)
+            if slot >= 0:
+                links[slot] = index
+            if parent >= 0:
+                previous = lastChild[parent]
+                if previous < 0:
+                    firstChild[parent] = index
+                else:
+                    nextSibling[previous] = index
+                lastChild[parent] = index
+            self.parents.append(parent)
+            firstChild.append(-1)
+            nextSibling.append(-1)
+            lastChild.append(-1)
+            self.linkStarts.append(len(links))
+            self.valueStarts.append(len(values))
+
+            start = end = -1
+            kind = None
+            location = None
+            names = FIELDS.get(type(node))
+            if names is None:
+                names = FIELDS[type(node)] = fieldNames(type(node))
+            children = []
+            fields = []
+            for name, value in node.items():
+                if name == 'type':
+                    kind = value
+                    field = TYPE
+                elif name == 'range':
+                    if value is not None:
+                        start, end = value
+                    if not self.keepRange:
+                        continue
+                    field = RANGE
+                elif name == 'loc':
+                    location = value
+                    field = LOCATION
+                elif name not in names:
+                    # Attached comments and attributes set by delegates.
+                    values.append(value)
+                    field = VALUE
+                elif isinstance(value, Node):
+                    children.append((value, len(links)))
+                    links.append(-1)
+                    field = NODE
+                elif isinstance(value, list) and all(v is None or isinstance(v, Node) for v in value):
+                    links.append(len(value))
+                    for v in value:
+                        if v is not None:
+                            children.append((v, len(links)))
+                        links.append(-1)
+                    field = LIST
+                else:
+                    if isinstance(value, basestring):
+                        value = strings.setdefault(value, value)
+                    values.append(value)
+                    field = VALUE
+                fields.append((name, field))
+
+            code = self.typeCodes.get(kind)
+            if code is None:
+                code = self.typeCodes[kind] = len(self.types)
+                self.types.append(kind)
+            self.kinds.append(code)
+            self.starts.append(start)
+            self.ends.append(end)
+
+            shape = (type(node), tuple(fields))
+            code = self.shapeIndex.get(shape)
+            if code is None:
+                code = self.shapeIndex[shape] = len(self.shapes)
+                self.shapes.append((facadeClass(type(node)), shape[1]))
+            self.nodeShapes.append(code)
+
+            # Locations covering the range of the node are rebuilt on access.
+            if type(location) is LazySourceLocation:
+                lines, locationStart, locationEnd, source, startPosition = object.__getattribute__(location, '_lazy')
+                if startPosition is None and locationStart == start and locationEnd == end:
+                    self.lines = lines
+                    self.locationSource = source
+                    location = None
+            if location is not None:
+                self.locations[index] = location
+
+            stack.extend((child, index, slot) for child, slot in reversed(children))
+
+    def node(self, index):
+        if index < 0:
+            return None
+        return self.shapes[self.nodeShapes[index]][0](self, index)
+
+    def type(self, index):
+        return self.types[self.kinds[index]]
+
+    def parent(self, index):
+        return self.parents[index]
+
+    def children(self, index):
+        child = self.firstChild[index]
+        while child >= 0:
+            yield child
+            child = self.nextSibling[child]
+
+    def subtree(self, index=0):
+        # From the node to the next sibling of its nearest ancestor-or-self
+        # that has one.
+        last = index
+        while last >= 0 and self.nextSibling[last] < 0:
+            last = self.parents[last]
+        return range(index, len(self.kinds) if last < 0 else self.nextSibling[last])
+
+    def select(self, name, index=0):
+        """
+        Returns the indexes of the nodes of the given type in the subtree of
+        the node at `index`, the whole tree by default.
+        """
+        code = self.typeCodes.get(name)
+        kinds = self.kinds
+        return [i for i in self.subtree(index) if kinds[i] == code]
+
+    def location(self, index):
+        location = self.locations.get(index)
+        if location is None:
+            location = LazySourceLocation(self.lines, self.starts[index], self.ends[index], self.locationSource)
+        return location
+
+    def fields(self, index):
+        # Yields the name and value of every field of the node, as getters so
+        # that only the fields asked for are built.
+        facade, fields = self.shapes[self.nodeShapes[index]]
+        link = self.linkStarts[index]
+        value = self.valueStarts[index]
+        for name, field in fields:
+            if field == VALUE:
+                yield name, self.values.__getitem__, value
+                value += 1
+            elif field == NODE:
+                yield name, self.node, self.links[link]
+                link += 1
+            elif field == LIST:
+                count = self.links[link]
+                yield name, self.nodes, (link + 1, link + 1 + count)
+                link += 1 + count
+            elif field == TYPE:
+                yield name, self.type, index
+            elif field == RANGE:
+                yield name, self.range, index
+            else:
+                yield name, self.location, index
+
+    def nodes(self, span):
+        node = self.node
+        return [node(i) for i in self.links[span[0]:span[1]]]
+
+    def range(self, index):
+        return [self.starts[index], self.ends[index]]
+
+    def field(self, index, name):
+        for key, get, arg in self.fields(index):
+            if key == name:
+                return get(arg)
+        return None
+
+    def items(self, index):
+        return [(key, get(arg)) for key, get, arg in self.fields(index)]
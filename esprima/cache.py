@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+# Copyright JS Foundation and other contributors, https://js.foundation/
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL <COPYRIGHT HOLDER> BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, unicode_literals
+
+import errno
+import gc
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+import tempfile
+import zlib
+
+from . import version
+from .objects import Object
+from .parser import LazyFunctionBody, Parser
+from .scanner import LazySourceLocation, LineIndex, Position
+
+# Bumped whenever the layout of entries or of the nodes changes.
+FORMAT = 3
+MAGIC = b'ESPRIMA-CACHE\n'
+
+# Tags of the encoded values that are not objects of a recorded shape.
+LAZY_LOCATION = -1
+LAZY_LOCATION_AT = -2
+PATTERN = -3
+LAZY_BODY = -4
+
+PATTERN_TYPE = type(re.compile(''))
+
+
+class collectionPaused(object):
+    # Building or walking a whole tree allocates many containers, and the
+    # garbage collector would otherwise scan them over and over.
+    def __enter__(self):
+        self.enabled = gc.isenabled()
+        gc.disable()
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            gc.enable()
+
+
+class TreeEncoder(object):
+    """
+    Turns a tree into plain values that marshal can store: each object
+    becomes a tuple of the index of its shape, that is its class and
+    attribute names, followed by its attribute values. Locations and
+    function bodies still unresolved only keep their offsets and what is
+    needed to resolve them, as they are rebuilt against the source when
+    loading.
+    """
+
+    def __init__(self):
+        self.shapes = []
+        self.shapeIndex = {}
+        self.locationSource = None
+        self.bodyEnds = None
+
+    def encode(self, value):
+        typ = type(value)
+        # Checked first, as isinstance() would resolve it.
+        if typ is LazySourceLocation:
+            lines, start, end, source, startPosition = object.__getattribute__(value, '_lazy')
+            self.locationSource = source
+            if startPosition is None:
+                return (LAZY_LOCATION, start, end)
+            return (LAZY_LOCATION_AT, start, end, startPosition.line, startPosition.column)
+        if typ is LazyFunctionBody:
+            parser, lines, options, range, context, ends = object.__getattribute__(value, 'body')
+            if self.bodyEnds is None:
+                self.bodyEnds = ends
+            elif ends is not self.bodyEnds:
+                ends = {}
+            return (LAZY_BODY, parser.__module__, parser.__name__, options, range[0], range[1], context, ends is self.bodyEnds)
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        if isinstance(value, Object):
+            attributes = list(value.items())
+            typ = type(value)
+            shape = (typ.__module__, getattr(typ, '__qualname__', typ.__name__), tuple(k for k, v in attributes))
+            index = self.shapeIndex.get(shape)
+            if index is None:
+                index = self.shapeIndex[shape] = len(self.shapes)
+                self.shapes.append(shape)
+            return (index,) + tuple(self.encode(v) for k, v in attributes)
+        if typ is dict:
+            return dict((k, self.encode(v)) for k, v in value.items())
+        if typ is PATTERN_TYPE:
+            return (PATTERN, value.pattern, value.flags)
+        return value
+
+    def dumps(self, tree):
+        with collectionPaused():
+            encoded = self.encode(tree)
+        return marshal.dumps((FORMAT, self.shapes, self.locationSource, self.bodyEnds, encoded), 2)
+
+
+class TreeDecoder(object):
+    def __init__(self, source):
+        self.lines = LineIndex(source, len(source))
+
+    def decode(self, value):
+        typ = type(value)
+        if typ is tuple:
+            tag = value[0]
+            if tag >= 0:
+                cls, keys = self.shapes[tag]
+                obj = cls.__new__(cls)
+                decode = self.decode
+                for key, v in zip(keys, value[1:]):
+                    setattr(obj, key, decode(v))
+                return obj
+            if tag == LAZY_LOCATION:
+                return LazySourceLocation(self.lines, value[1], value[2], self.locationSource)
+            if tag == LAZY_LOCATION_AT:
+                return LazySourceLocation(self.lines, value[1], value[2], self.locationSource,
+                                          Position(line=value[3], column=value[4]))
+            if tag == PATTERN:
+                return re.compile(value[1], value[2])
+            if tag == LAZY_BODY:
+                return LazyFunctionBody(self.parserClass(value[1], value[2]), self.lines,
+                                        value[3], (value[4], value[5]), value[6], self.bodyEnds if value[7] else {})
+        elif typ is list:
+            decode = self.decode
+            return [decode(v) for v in value]
+        elif typ is dict:
+            return dict((k, self.decode(v)) for k, v in value.items())
+        return value
+
+    def loads(self, data):
+        format, shapes, self.locationSource, self.bodyEnds, encoded = marshal.loads(data)
+        if format != FORMAT:
+            raise ValueError('Unsupported cache format')
+        self.shapes = [(self.resolve(module, name), keys) for module, name, keys in shapes]
+        with collectionPaused():
+            return self.decode(encoded)
+
+    def resolve(self, module, name):
+        if module.split('.')[0] != __name__.split('.')[0]:
+            raise ValueError('Unexpected class in cache entry')
+        cls = sys.modules[module]
+        for part in name.split('.'):
+            cls = getattr(cls, part)
+        return cls
+
+    def parserClass(self, module, name):
+        cls = self.resolve(module, name)
+        if not isinstance(cls, type) or not issubclass(cls, Parser):
+            raise ValueError('Unexpected class in cache entry')
+        return cls
+
+
+class ParseCache(object):
+    """
+    Opt-in on-disk cache of parsed trees, shared by processes that point to
+    the same directory. Entries are keyed by a hash of the source and of the
+    options, and hold the tree encoded by TreeEncoder and compressed. They are written to a
+    temporary file first and renamed into place, so readers never see a
+    partial entry. Entries of other versions live in other subdirectories.
+    Once the entries take more than `maxSize` bytes, the least recently used
+    ones are removed. The size is tracked as entries are written, and
+    the directory only rescanned when it goes over, or every `rescanEvery`
+    writes to account for those of other processes.
+    """
+
+    rescanEvery = 256
+
+    def __init__(self, directory, maxSize=256 * 1024 * 1024, level=6):
+        self.directory = os.path.join(directory, '%s-%d' % (version, FORMAT))
+        self.maxSize = maxSize
+        self.level = level
+        self.hits = 0
+        self.misses = 0
+        self.size = None
+        self.puts = 0
+        try:
+            os.makedirs(self.directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    def key(self, source, options):
+        # Options that are not plain data, such as callbacks, make the
+        # outcome uncacheable.
+        try:
+            normalized = json.dumps(options, sort_keys=True, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return None
+        digest = hashlib.sha256(source.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+        digest.update(normalized.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.ast')
+
+    def get(self, key, source):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        if not data.startswith(MAGIC):
+            self.misses += 1
+            return None
+        try:
+            tree = TreeDecoder(source).loads(zlib.decompress(data[len(MAGIC):]))
+        except Exception:
+            # A corrupt entry is dropped and parsed again.
+            self.remove(path)
+            self.misses += 1
+            return None
+        try:
+            # The modification time tracks the last use.
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return tree
+
+    def put(self, key, tree):
+        data = MAGIC + zlib.compress(TreeEncoder().dumps(tree), self.level)
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            if hasattr(os, 'replace'):
+                os.replace(temp, self.path(key))
+            else:
+                os.rename(temp, self.path(key))
+        except Exception:
+            self.remove(temp)
+            raise
+        self.puts += 1
+        if self.size is None or self.puts % self.rescanEvery == 0:
+            self.evict()
+        else:
+            # Overwritten entries are counted twice until the next rescan.
+            self.size += len(data)
+            if self.size > self.maxSize:
+                self.evict()
+
+    def evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.ast'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total > self.maxSize:
+            entries.sort()
+            for mtime, size, path in entries:
+                if total <= self.maxSize:
+                    break
+                self.remove(path)
+                total -= size
+        self.size = total
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            self.remove(os.path.join(self.directory, name))
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
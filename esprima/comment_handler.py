@@ -29,6 +29,8 @@ from .syntax import Syntax
 
 
 class Comment(Node):
+    __slots__ = ('value',)
+
     def __init__(self, type, value, range=None, loc=None):
         self.type = type
         self.value = value
@@ -62,7 +64,7 @@ class CommentHandler(object):
         if node.type is Syntax.BlockStatement and not node.body:
             innerComments = []
             for i, entry in enumerate(self.leading):
-                if metadata.end.offset >= entry.start:
+                if metadata.endOffset >= entry.start:
                     innerComments.append(entry.comment)
                     self.leading[i] = None
                     self.trailing[i] = None
@@ -76,7 +78,7 @@ class CommentHandler(object):
 
         if self.trailing:
             for i, entry in enumerate(self.trailing):
-                if entry.start >= metadata.end.offset:
+                if entry.start >= metadata.endOffset:
                     trailingComments.append(entry.comment)
             if trailingComments:
                 self.trailing = []
@@ -85,7 +87,7 @@ class CommentHandler(object):
         last = self.stack and self.stack[-1]
         if last and last.node.trailingComments:
             firstComment = last.node.trailingComments[0]
-            if firstComment and firstComment.range[0] >= metadata.end.offset:
+            if firstComment and firstComment.range[0] >= metadata.endOffset:
                 trailingComments = last.node.trailingComments
                 del last.node.trailingComments
         return trailingComments
@@ -96,7 +98,7 @@ class CommentHandler(object):
         target = None
         while self.stack:
             entry = self.stack and self.stack[-1]
-            if entry and entry.start >= metadata.start.offset:
+            if entry and entry.start >= metadata.startOffset:
                 target = entry.node
                 self.stack.pop()
             else:
@@ -105,7 +107,7 @@ class CommentHandler(object):
         if target:
             if target.leadingComments:
                 for i, comment in enumerate(target.leadingComments):
-                    if comment.range[1] <= metadata.start.offset:
+                    if comment.range[1] <= metadata.startOffset:
                         leadingComments.append(comment)
                         target.leadingComments[i] = None
             if leadingComments:
@@ -115,7 +117,7 @@ class CommentHandler(object):
             return leadingComments
 
         for i, entry in enumerate(self.leading):
-            if entry.start <= metadata.start.offset:
+            if entry.start <= metadata.startOffset:
                 leadingComments.append(entry.comment)
                 self.leading[i] = None
         if leadingComments:
@@ -137,7 +139,7 @@ class CommentHandler(object):
 
         self.stack.append(NodeInfo(
             node=node,
-            start=metadata.start.offset
+            start=metadata.startOffset
         ))
 
     def visitComment(self, node, metadata):
@@ -157,9 +159,9 @@ class CommentHandler(object):
                 comment=Comment(
                     type=type,
                     value=node.value,
-                    range=[metadata.start.offset, metadata.end.offset]
+                    range=[metadata.startOffset, metadata.endOffset]
                 ),
-                start=metadata.start.offset
+                start=metadata.startOffset
             )
             if node.loc:
                 entry.comment.loc = node.loc
@@ -34,6 +34,7 @@ if PY3:
     xrange = range
     unicode = str
     uchr = chr
+    RecursionError = RecursionError
 
     def uord(ch):
         return ord(ch[0])
@@ -43,6 +44,7 @@ else:
     long = long
     xrange = xrange
     unicode = unicode
+    RecursionError = RuntimeError
 
     try:
         # Python 2 UCS4:
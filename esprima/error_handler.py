@@ -49,9 +49,14 @@ class ErrorHandler:
     def __init__(self):
         self.errors = []
         self.tolerant = False
+        # Called with each tolerated error instead of keeping it in errors.
+        self.onError = None
 
     def recordError(self, error):
-        self.errors.append(error.toDict())
+        if self.onError is not None:
+            self.onError(error.toDict())
+        else:
+            self.errors.append(error.toDict())
 
     def tolerate(self, error):
         if self.tolerant:
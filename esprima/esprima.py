@@ -23,27 +23,75 @@
 
 from __future__ import absolute_import, unicode_literals
 
+from .arena import Arena
+from .cache import ParseCache
 from .comment_handler import CommentHandler
+from .compat import basestring
 from .error_handler import Error
 from .jsx_parser import JSXParser
 from .jsx_syntax import JSXSyntax
 from .objects import Array, toDict
 from .parser import Parser
+from .scanner import Scanner, readSource
 from .syntax import Syntax
-from .tokenizer import Tokenizer
+from .tokenizer import Tokenizer, TokenColumns, IncrementalTokenizer
 from .visitor import NodeVisitor
 from . import nodes
 from . import jsx_nodes
 
 
 __all__ = ['Syntax', 'JSXSyntax', 'Error', 'NodeVisitor', 'nodes', 'jsx_nodes',
-           'parse', 'parseModule', 'parseScript', 'tokenize', 'toDict']
+           'parse', 'parseModule', 'parseScript', 'tokenize', 'iterTokens', 'toDict',
+           'regExpCache', 'IncrementalTokenizer', 'reparse', 'ParseCache', 'parseExpression',
+           'Arena']
+
+# Shared by all parsers and tokenizers, see RegExpCache.
+regExpCache = Scanner.regExpCache
 
 
 def parse(code, options=None, delegate=None, **kwargs):
+    return parseGoal(code, options, delegate, kwargs)
+
+
+def parseGoal(code, options, delegate, kwargs, expression=False):
     options = {} if options is None else options.copy()
     options.update(kwargs)
 
+    # The tree is built as usual, needing the ranges, then moved to an Arena,
+    # of which the root node is returned.
+    if options.pop('arena', False):
+        keepRange = options.get('range', False)
+        options['range'] = True
+        ast = buildTree(code, options, delegate, expression)
+        if not keepRange:
+            # The tokens and comments collected only have ranges if asked for.
+            for token in ast.tokens or ():
+                token.range = None
+            for comment in ast.comments or ():
+                del comment.range
+        return Arena(ast, keepRange).root
+
+    return buildTree(code, options, delegate, expression)
+
+
+def buildTree(code, options, delegate, expression):
+    previous = options.pop('previous', None)
+    edit = options.pop('edit', None)
+
+    # A ParseCache, or the directory of one. Trees built with a delegate
+    # are not cached, nor are standalone expressions.
+    cache = options.pop('cache', None)
+    key = None
+    if cache is not None and delegate is None and previous is None and not expression:
+        if isinstance(cache, basestring):
+            cache = ParseCache(cache)
+        code = readSource(code)
+        key = cache.key(code, options)
+        if key is not None:
+            ast = cache.get(key, code)
+            if ast is not None:
+                return ast
+
     # ESNext presset:
     if options.get('esnext', False):
         options['jsx'] = True
@@ -81,7 +129,12 @@ def parse(code, options=None, delegate=None, **kwargs):
     else:
         parser = Parser(code, options=options, delegate=parserDelegate)
 
-    ast = parser.parseModule() if isModule else parser.parseScript()
+    if expression:
+        ast = parser.parseStandaloneExpression()
+    elif previous is not None:
+        ast = parser.reparseProgram(previous, *edit)
+    else:
+        ast = parser.parseModule() if isModule else parser.parseScript()
 
     if collectComment and commentHandler:
         ast.comments = commentHandler.comments
@@ -92,6 +145,9 @@ def parse(code, options=None, delegate=None, **kwargs):
     if parser.config.tolerant:
         ast.errors = parser.errorHandler.errors
 
+    if key is not None:
+        cache.put(key, ast)
+
     return ast
 
 
@@ -105,26 +161,60 @@ def parseScript(code, options=None, delegate=None, **kwargs):
     return parse(code, options, delegate, **kwargs)
 
 
+def parseExpression(code, options=None, delegate=None, **kwargs):
+    """
+    Parses `code` as a single expression, which must run to the end of the
+    input, and returns the expression node. The options are those of parse(),
+    except for `cache`; comments, tokens and errors are attached to the node.
+    """
+    return parseGoal(code, options, delegate, kwargs, expression=True)
+
+
+def reparse(previous, code, edit, options=None, delegate=None, **kwargs):
+    """
+    Parses `code`, the source of the `previous` program after an edit given
+    as (start, oldEnd, newEnd): previous[start:oldEnd] became code[start:newEnd].
+    Top-level statements out of reach of the edit are reused and moved, which
+    needs `range`. The options must be those `previous` was parsed with.
+    """
+    kwargs['sourceType'] = previous.sourceType
+    kwargs['previous'] = previous
+    kwargs['edit'] = edit
+    return parse(code, options, delegate, **kwargs)
+
+
 def tokenize(code, options=None, delegate=None, **kwargs):
     options = {} if options is None else options.copy()
     options.update(kwargs)
 
     tokenizer = Tokenizer(code, options)
 
-    tokens = Array()
+    if tokenizer.config.columnar:
+        # The columns are filled without building the tokens a delegate is
+        # handed.
+        if delegate is not None:
+            raise ValueError('A delegate cannot be used with columnar tokens')
+        tokens = TokenColumns(tokenizer.scanner.source, tokenizer.config.internValues)
+        try:
+            tokenizer.collectColumns(tokens)
+        except Error as e:
+            tokenizer.errorHandler.tolerate(e)
+
+        if tokenizer.errorHandler.tolerant:
+            tokens.errors = tokenizer.errors()
 
-    try:
-        while True:
-            token = tokenizer.getNextToken()
-            if not token:
-                break
-            if delegate:
-                token = delegate(token)
-            tokens.append(token)
-    except Error as e:
-        tokenizer.errorHandler.tolerate(e)
+        return tokens
+
+    tokens = Array(tokenizer.iterTokens(delegate))
 
     if tokenizer.errorHandler.tolerant:
         tokens.errors = tokenizer.errors()
 
     return tokens
+
+
+def iterTokens(code, options=None, delegate=None, **kwargs):
+    options = {} if options is None else options.copy()
+    options.update(kwargs)
+
+    return Tokenizer(code, options).iterTokens(delegate)
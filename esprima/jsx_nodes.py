@@ -28,12 +28,16 @@ from .jsx_syntax import JSXSyntax
 
 
 class JSXClosingElement(Node):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.type = JSXSyntax.JSXClosingElement
         self.name = name
 
 
 class JSXElement(Node):
+    __slots__ = ('openingElement', 'children', 'closingElement')
+
     def __init__(self, openingElement, children, closingElement):
         self.type = JSXSyntax.JSXElement
         self.openingElement = openingElement
@@ -42,23 +46,31 @@ class JSXElement(Node):
 
 
 class JSXEmptyExpression(Node):
+    __slots__ = ()
+
     def __init__(self):
         self.type = JSXSyntax.JSXEmptyExpression
 
 
 class JSXExpressionContainer(Node):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.type = JSXSyntax.JSXExpressionContainer
         self.expression = expression
 
 
 class JSXIdentifier(Node):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.type = JSXSyntax.JSXIdentifier
         self.name = name
 
 
 class JSXMemberExpression(Node):
+    __slots__ = ('object', 'property')
+
     def __init__(self, object, property):
         self.type = JSXSyntax.JSXMemberExpression
         self.object = object
@@ -66,6 +78,8 @@ class JSXMemberExpression(Node):
 
 
 class JSXAttribute(Node):
+    __slots__ = ('name', 'value')
+
     def __init__(self, name, value):
         self.type = JSXSyntax.JSXAttribute
         self.name = name
@@ -73,6 +87,8 @@ class JSXAttribute(Node):
 
 
 class JSXNamespacedName(Node):
+    __slots__ = ('namespace', 'name')
+
     def __init__(self, namespace, name):
         self.type = JSXSyntax.JSXNamespacedName
         self.namespace = namespace
@@ -80,6 +96,8 @@ class JSXNamespacedName(Node):
 
 
 class JSXOpeningElement(Node):
+    __slots__ = ('name', 'selfClosing', 'attributes')
+
     def __init__(self, name, selfClosing, attributes):
         self.type = JSXSyntax.JSXOpeningElement
         self.name = name
@@ -88,12 +106,16 @@ class JSXOpeningElement(Node):
 
 
 class JSXSpreadAttribute(Node):
+    __slots__ = ('argument',)
+
     def __init__(self, argument):
         self.type = JSXSyntax.JSXSpreadAttribute
         self.argument = argument
 
 
 class JSXText(Node):
+    __slots__ = ('value', 'raw')
+
     def __init__(self, value, raw):
         self.type = JSXSyntax.JSXText
         self.value = value
@@ -23,6 +23,8 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import re
+
 from .compat import uchr
 from .character import Character
 from . import jsx_nodes as JSXNode
@@ -32,6 +34,12 @@ from .parser import Marker, Parser
 from .token import Token, TokenName
 from .xhtml_entities import XHTMLEntities
 
+JSX_TEXT_STOP = re.compile(r'[{<]')
+JSX_STRING_STOP = {
+    "'": re.compile(r"['&]"),
+    '"': re.compile(r'["&]'),
+}
+
 
 class MetaJSXElement(object):
     def __init__(self, node=None, opening=None, closing=None, children=None):
@@ -47,6 +55,8 @@ class JSXToken(object):
 
 
 class RawJSXToken(object):
+    __slots__ = ('type', 'value', 'lineNumber', 'lineStart', 'start', 'end')
+
     def __init__(self, type=None, value=None, lineNumber=None, lineStart=None, start=None, end=None):
         self.type = type
         self.value = value
@@ -162,7 +172,7 @@ class JSXParser(Parser):
     # Scan the next JSX token. This replaces Scanner#lex when in JSX mode.
 
     def lexJSX(self):
-        ch = self.scanner.source[self.scanner.index]
+        ch = self.scanner.source[self.scanner.index:self.scanner.index + 1]
 
         # < > / : = { }
         if ch in ('<', '>', '/', ':', '=', '{', '}'):
@@ -182,16 +192,19 @@ class JSXParser(Parser):
             start = self.scanner.index
             quote = self.scanner.source[self.scanner.index]
             self.scanner.index += 1
-            str = ''
-            while not self.scanner.eof():
-                ch = self.scanner.source[self.scanner.index]
-                self.scanner.index += 1
-                if ch == quote:
+            chunks = []
+            while True:
+                m = JSX_STRING_STOP[quote].search(self.scanner.source, self.scanner.index, self.scanner.length)
+                if m is None:
+                    chunks.append(self.scanner.source[self.scanner.index:self.scanner.length])
+                    self.scanner.index = self.scanner.length
                     break
-                elif ch == '&':
-                    str += self.scanXHTMLEntity(quote)
-                else:
-                    str += ch
+                chunks.append(self.scanner.source[self.scanner.index:m.start()])
+                self.scanner.index = m.end()
+                if m.group() == quote:
+                    break
+                chunks.append(self.scanXHTMLEntity(quote))
+            str = ''.join(chunks)
 
             return RawJSXToken(
                 type=Token.StringLiteral,
@@ -281,20 +294,13 @@ class JSXParser(Parser):
 
         start = self.scanner.index
 
-        text = ''
-        while not self.scanner.eof():
-            ch = self.scanner.source[self.scanner.index]
-            if ch in ('{', '<'):
-                break
-
-            self.scanner.index += 1
-            text += ch
-            if Character.isLineTerminator(ch):
-                self.scanner.lineNumber += 1
-                if ch == '\r' and self.scanner.source[self.scanner.index] == '\n':
-                    self.scanner.index += 1
-
-                self.scanner.lineStart = self.scanner.index
+        m = JSX_TEXT_STOP.search(self.scanner.source, start, self.scanner.length)
+        self.scanner.index = m.start() if m else self.scanner.length
+        text = self.scanner.source[start:self.scanner.index]
+        self.scanner.advanceLines(start, self.scanner.index)
+        if '\r\n' in text:
+            # The LF of a CR LF pair is not kept in the text.
+            text = text.replace('\r\n', '\r')
 
         self.lastMarker.index = self.scanner.index
         self.lastMarker.line = self.scanner.lineNumber
@@ -504,7 +510,7 @@ class JSXParser(Parser):
                 child = self.finalize(node, JSXNode.JSXText(token.value, raw))
                 children.append(child)
 
-            if self.scanner.source[self.scanner.index] == '{':
+            if self.scanner.source.startswith('{', self.scanner.index):
                 container = self.parseJSXExpressionContainer()
                 children.append(container)
             else:
@@ -57,6 +57,7 @@ class Messages:
     LetInLexicalBinding = "let is disallowed as a lexically bound name"
     MissingFromClause = "Unexpected token"
     MultipleDefaultsInSwitch = "More than one default clause in switch statement"
+    NestingTooDeep = "Maximum nesting depth exceeded"
     NewlineAfterThrow = "Illegal newline after throw"
     NoAsAfterImportNamespace = "Unexpected token"
     NoCatchOrFinally = "Missing catch or finally after try"
@@ -29,32 +29,110 @@ from .scanner import RegExp
 
 
 class Node(Object):
+    """
+    Base of the syntax tree nodes. Each class lists its fields in __slots__,
+    as this one does for the type, range and loc of every node. Any other
+    attribute, such as attached comments or those set by delegates, is kept
+    in a dict created on first use, and defaults to None, except for names
+    starting with a double underscore.
+    """
+
+    __slots__ = ('type', 'range', 'loc', '_optional')
+
+    directive = None
+
+    def __getattr__(self, name):
+        # Special names are left to the protocols looking them up.
+        if name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            return getattribute(self, '_optional').get(name)
+        except AttributeError:
+            return None
+
+    def __setattr__(self, name, value):
+        try:
+            setattribute(self, name, value)
+        except AttributeError:
+            try:
+                getattribute(self, '_optional')[name] = value
+            except AttributeError:
+                setattribute(self, '_optional', {name: value})
+
+    def __delattr__(self, name):
+        try:
+            delattribute(self, name)
+        except AttributeError:
+            try:
+                del getattribute(self, '_optional')[name]
+            except (AttributeError, KeyError):
+                raise AttributeError(name)
+
     def __dir__(self):
-        return list(self.__dict__.keys())
+        return list(self.keys())
 
     def __iter__(self):
         return self.__iter__
 
     def keys(self):
-        return self.__dict__.keys()
+        return [key for key, value in self.items()]
+
+    # The fields set, in the order of the ESTree node: the type, the fields of
+    # the class, the ones common to all nodes, then the optional ones.
 
     def items(self):
-        return self.__dict__.items()
+        cls = type(self)
+        names = FIELDS.get(cls)
+        if names is None:
+            names = FIELDS[cls] = fieldNames(cls)
+        items = []
+        for name in names:
+            try:
+                items.append((name, getattribute(self, name)))
+            except AttributeError:
+                pass
+        try:
+            items.extend(getattribute(self, '_optional').items())
+        except AttributeError:
+            pass
+        return items
+
+
+FIELDS = {}
+
+getattribute = object.__getattribute__
+setattribute = object.__setattr__
+delattribute = object.__delattr__
+
+
+def fieldNames(cls):
+    names = [Node.__slots__[0]]
+    for base in reversed(cls.__mro__):
+        if base is not Node and issubclass(base, Node):
+            names.extend(base.__dict__.get('__slots__', ()))
+    names.extend(Node.__slots__[1:-1])
+    return tuple(names)
 
 
 class ArrayExpression(Node):
+    __slots__ = ('elements',)
+
     def __init__(self, elements):
         self.type = Syntax.ArrayExpression
         self.elements = elements
 
 
 class ArrayPattern(Node):
+    __slots__ = ('elements',)
+
     def __init__(self, elements):
         self.type = Syntax.ArrayPattern
         self.elements = elements
 
 
 class ArrowFunctionExpression(Node):
+    __slots__ = ('generator', 'isAsync', 'params', 'body', 'expression')
+
     def __init__(self, params, body, expression):
         self.type = Syntax.ArrowFunctionExpression
         self.generator = False
@@ -65,6 +143,8 @@ class ArrowFunctionExpression(Node):
 
 
 class AssignmentExpression(Node):
+    __slots__ = ('operator', 'left', 'right')
+
     def __init__(self, operator, left, right):
         self.type = Syntax.AssignmentExpression
         self.operator = operator
@@ -73,6 +153,8 @@ class AssignmentExpression(Node):
 
 
 class AssignmentPattern(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.type = Syntax.AssignmentPattern
         self.left = left
@@ -80,6 +162,8 @@ class AssignmentPattern(Node):
 
 
 class AsyncArrowFunctionExpression(Node):
+    __slots__ = ('generator', 'isAsync', 'params', 'body', 'expression')
+
     def __init__(self, params, body, expression):
         self.type = Syntax.ArrowFunctionExpression
         self.generator = False
@@ -90,6 +174,8 @@ class AsyncArrowFunctionExpression(Node):
 
 
 class AsyncFunctionDeclaration(Node):
+    __slots__ = ('generator', 'expression', 'isAsync', 'id', 'params', 'body')
+
     def __init__(self, id, params, body, generator=False):
         self.type = Syntax.FunctionDeclaration
         self.generator = generator
@@ -101,6 +187,8 @@ class AsyncFunctionDeclaration(Node):
 
 
 class AsyncFunctionExpression(Node):
+    __slots__ = ('generator', 'expression', 'isAsync', 'id', 'params', 'body')
+
     def __init__(self, id, params, body, generator=False):
         self.type = Syntax.FunctionExpression
         self.generator = generator
@@ -112,12 +200,16 @@ class AsyncFunctionExpression(Node):
 
 
 class AwaitExpression(Node):
+    __slots__ = ('argument',)
+
     def __init__(self, argument):
         self.type = Syntax.AwaitExpression
         self.argument = argument
 
 
 class BinaryExpression(Node):
+    __slots__ = ('operator', 'left', 'right')
+
     def __init__(self, operator, left, right):
         self.type = Syntax.LogicalExpression if operator in ('||', '&&') else Syntax.BinaryExpression
         self.operator = operator
@@ -126,18 +218,24 @@ class BinaryExpression(Node):
 
 
 class BlockStatement(Node):
+    __slots__ = ('body',)
+
     def __init__(self, body):
         self.type = Syntax.BlockStatement
         self.body = body
 
 
 class BreakStatement(Node):
+    __slots__ = ('label',)
+
     def __init__(self, label):
         self.type = Syntax.BreakStatement
         self.label = label
 
 
 class CallExpression(Node):
+    __slots__ = ('callee', 'arguments', 'optional')
+
     def __init__(self, callee, args, optional=False):
         self.type = Syntax.CallExpression
         self.callee = callee
@@ -146,6 +244,8 @@ class CallExpression(Node):
 
 
 class CatchClause(Node):
+    __slots__ = ('param', 'body')
+
     def __init__(self, param, body):
         self.type = Syntax.CatchClause
         self.param = param
@@ -153,18 +253,24 @@ class CatchClause(Node):
 
 
 class ChainExpression(Node):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.type = Syntax.ChainExpression
         self.expression = expression
 
 
 class ClassBody(Node):
+    __slots__ = ('body',)
+
     def __init__(self, body):
         self.type = Syntax.ClassBody
         self.body = body
 
 
 class ClassDeclaration(Node):
+    __slots__ = ('id', 'superClass', 'body')
+
     def __init__(self, id, superClass, body):
         self.type = Syntax.ClassDeclaration
         self.id = id
@@ -173,6 +279,8 @@ class ClassDeclaration(Node):
 
 
 class ClassExpression(Node):
+    __slots__ = ('id', 'superClass', 'body')
+
     def __init__(self, id, superClass, body):
         self.type = Syntax.ClassExpression
         self.id = id
@@ -181,6 +289,8 @@ class ClassExpression(Node):
 
 
 class ComputedMemberExpression(Node):
+    __slots__ = ('computed', 'object', 'property', 'optional')
+
     def __init__(self, object, property, optional=False):
         self.type = Syntax.MemberExpression
         self.computed = True
@@ -190,6 +300,8 @@ class ComputedMemberExpression(Node):
 
 
 class ConditionalExpression(Node):
+    __slots__ = ('test', 'consequent', 'alternate')
+
     def __init__(self, test, consequent, alternate):
         self.type = Syntax.ConditionalExpression
         self.test = test
@@ -198,17 +310,23 @@ class ConditionalExpression(Node):
 
 
 class ContinueStatement(Node):
+    __slots__ = ('label',)
+
     def __init__(self, label):
         self.type = Syntax.ContinueStatement
         self.label = label
 
 
 class DebuggerStatement(Node):
+    __slots__ = ()
+
     def __init__(self):
         self.type = Syntax.DebuggerStatement
 
 
 class Directive(Node):
+    __slots__ = ('expression', 'directive')
+
     def __init__(self, expression, directive):
         self.type = Syntax.ExpressionStatement
         self.expression = expression
@@ -216,6 +334,8 @@ class Directive(Node):
 
 
 class DoWhileStatement(Node):
+    __slots__ = ('body', 'test')
+
     def __init__(self, body, test):
         self.type = Syntax.DoWhileStatement
         self.body = body
@@ -223,23 +343,39 @@ class DoWhileStatement(Node):
 
 
 class EmptyStatement(Node):
+    __slots__ = ()
+
     def __init__(self):
         self.type = Syntax.EmptyStatement
 
 
+class ErrorNode(Node):
+    __slots__ = ('message',)
+
+    def __init__(self, message):
+        self.type = Syntax.ErrorNode
+        self.message = message
+
+
 class ExportAllDeclaration(Node):
+    __slots__ = ('source',)
+
     def __init__(self, source):
         self.type = Syntax.ExportAllDeclaration
         self.source = source
 
 
 class ExportDefaultDeclaration(Node):
+    __slots__ = ('declaration',)
+
     def __init__(self, declaration):
         self.type = Syntax.ExportDefaultDeclaration
         self.declaration = declaration
 
 
 class ExportNamedDeclaration(Node):
+    __slots__ = ('declaration', 'specifiers', 'source')
+
     def __init__(self, declaration, specifiers, source):
         self.type = Syntax.ExportNamedDeclaration
         self.declaration = declaration
@@ -248,6 +384,8 @@ class ExportNamedDeclaration(Node):
 
 
 class ExportSpecifier(Node):
+    __slots__ = ('exported', 'local')
+
     def __init__(self, local, exported):
         self.type = Syntax.ExportSpecifier
         self.exported = exported
@@ -255,18 +393,24 @@ class ExportSpecifier(Node):
 
 
 class ExportDefaultSpecifier(Node):
+    __slots__ = ('local',)
+
     def __init__(self, local):
         self.type = Syntax.ExportDefaultSpecifier
         self.local = local
 
 
 class ExpressionStatement(Node):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.type = Syntax.ExpressionStatement
         self.expression = expression
 
 
 class ForInStatement(Node):
+    __slots__ = ('each', 'left', 'right', 'body')
+
     def __init__(self, left, right, body):
         self.type = Syntax.ForInStatement
         self.each = False
@@ -276,6 +420,8 @@ class ForInStatement(Node):
 
 
 class ForOfStatement(Node):
+    __slots__ = ('left', 'right', 'body')
+
     def __init__(self, left, right, body):
         self.type = Syntax.ForOfStatement
         self.left = left
@@ -284,6 +430,8 @@ class ForOfStatement(Node):
 
 
 class ForAwaitStatement(Node):
+    __slots__ = ('left', 'right', 'body')
+
     def __init__(self, left, right, body):
         self.type = Syntax.ForAwaitStatement
         self.left = left
@@ -292,6 +440,8 @@ class ForAwaitStatement(Node):
 
 
 class ForStatement(Node):
+    __slots__ = ('init', 'test', 'update', 'body')
+
     def __init__(self, init, test, update, body):
         self.type = Syntax.ForStatement
         self.init = init
@@ -301,6 +451,8 @@ class ForStatement(Node):
 
 
 class FunctionDeclaration(Node):
+    __slots__ = ('expression', 'isAsync', 'id', 'params', 'body', 'generator')
+
     def __init__(self, id, params, body, generator):
         self.type = Syntax.FunctionDeclaration
         self.expression = False
@@ -312,6 +464,8 @@ class FunctionDeclaration(Node):
 
 
 class FunctionExpression(Node):
+    __slots__ = ('expression', 'isAsync', 'id', 'params', 'body', 'generator')
+
     def __init__(self, id, params, body, generator):
         self.type = Syntax.FunctionExpression
         self.expression = False
@@ -323,24 +477,32 @@ class FunctionExpression(Node):
 
 
 class Identifier(Node):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.type = Syntax.Identifier
         self.name = name
 
 
 class PrivateIdentifier(Node):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.type = Syntax.PrivateIdentifier
         self.name = name
 
 
 class StaticBlock(Node):
+    __slots__ = ('body',)
+
     def __init__(self, body):
         self.type = Syntax.StaticBlock
         self.body = body
 
 
 class IfStatement(Node):
+    __slots__ = ('test', 'consequent', 'alternate')
+
     def __init__(self, test, consequent, alternate):
         self.type = Syntax.IfStatement
         self.test = test
@@ -349,11 +511,15 @@ class IfStatement(Node):
 
 
 class Import(Node):
+    __slots__ = ()
+
     def __init__(self):
         self.type = Syntax.Import
 
 
 class ImportDeclaration(Node):
+    __slots__ = ('specifiers', 'source', 'assertions', 'attributes')
+
     def __init__(self, specifiers, source, assertions=None, attributes=None):
         self.type = Syntax.ImportDeclaration
         self.specifiers = specifiers
@@ -364,19 +530,35 @@ class ImportDeclaration(Node):
             self.attributes = attributes
 
 
+# A `key: value` pair of an import's assertions or attributes, which has no
+# type of its own.
+class ImportAttribute(Node):
+    __slots__ = ('key', 'value')
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+
 class ImportDefaultSpecifier(Node):
+    __slots__ = ('local',)
+
     def __init__(self, local):
         self.type = Syntax.ImportDefaultSpecifier
         self.local = local
 
 
 class ImportNamespaceSpecifier(Node):
+    __slots__ = ('local',)
+
     def __init__(self, local):
         self.type = Syntax.ImportNamespaceSpecifier
         self.local = local
 
 
 class ImportSpecifier(Node):
+    __slots__ = ('local', 'imported')
+
     def __init__(self, local, imported):
         self.type = Syntax.ImportSpecifier
         self.local = local
@@ -384,6 +566,8 @@ class ImportSpecifier(Node):
 
 
 class LabeledStatement(Node):
+    __slots__ = ('label', 'body')
+
     def __init__(self, label, body):
         self.type = Syntax.LabeledStatement
         self.label = label
@@ -391,6 +575,8 @@ class LabeledStatement(Node):
 
 
 class Literal(Node):
+    __slots__ = ('value', 'raw')
+
     def __init__(self, value, raw):
         self.type = Syntax.Literal
         self.value = value
@@ -398,6 +584,8 @@ class Literal(Node):
 
 
 class MetaProperty(Node):
+    __slots__ = ('meta', 'property')
+
     def __init__(self, meta, property):
         self.type = Syntax.MetaProperty
         self.meta = meta
@@ -405,6 +593,8 @@ class MetaProperty(Node):
 
 
 class MethodDefinition(Node):
+    __slots__ = ('key', 'computed', 'value', 'kind', 'static')
+
     def __init__(self, key, computed, value, kind, isStatic):
         self.type = Syntax.MethodDefinition
         self.key = key
@@ -415,6 +605,8 @@ class MethodDefinition(Node):
 
 
 class FieldDefinition(Node):
+    __slots__ = ('key', 'computed', 'value', 'kind', 'static')
+
     def __init__(self, key, computed, value, kind, isStatic):
         self.type = Syntax.FieldDefinition
         self.key = key
@@ -425,6 +617,8 @@ class FieldDefinition(Node):
 
 
 class Module(Node):
+    __slots__ = ('sourceType', 'body')
+
     def __init__(self, body):
         self.type = Syntax.Program
         self.sourceType = 'module'
@@ -432,6 +626,8 @@ class Module(Node):
 
 
 class NewExpression(Node):
+    __slots__ = ('callee', 'arguments')
+
     def __init__(self, callee, args):
         self.type = Syntax.NewExpression
         self.callee = callee
@@ -439,18 +635,24 @@ class NewExpression(Node):
 
 
 class ObjectExpression(Node):
+    __slots__ = ('properties',)
+
     def __init__(self, properties):
         self.type = Syntax.ObjectExpression
         self.properties = properties
 
 
 class ObjectPattern(Node):
+    __slots__ = ('properties',)
+
     def __init__(self, properties):
         self.type = Syntax.ObjectPattern
         self.properties = properties
 
 
 class Property(Node):
+    __slots__ = ('key', 'computed', 'value', 'kind', 'method', 'shorthand')
+
     def __init__(self, kind, key, computed, value, method, shorthand):
         self.type = Syntax.Property
         self.key = key
@@ -462,6 +664,8 @@ class Property(Node):
 
 
 class RegexLiteral(Node):
+    __slots__ = ('value', 'raw', 'regex')
+
     def __init__(self, value, raw, pattern, flags):
         self.type = Syntax.Literal
         self.value = value
@@ -473,18 +677,24 @@ class RegexLiteral(Node):
 
 
 class RestElement(Node):
+    __slots__ = ('argument',)
+
     def __init__(self, argument):
         self.type = Syntax.RestElement
         self.argument = argument
 
 
 class ReturnStatement(Node):
+    __slots__ = ('argument',)
+
     def __init__(self, argument):
         self.type = Syntax.ReturnStatement
         self.argument = argument
 
 
 class Script(Node):
+    __slots__ = ('sourceType', 'body')
+
     def __init__(self, body):
         self.type = Syntax.Program
         self.sourceType = 'script'
@@ -492,18 +702,24 @@ class Script(Node):
 
 
 class SequenceExpression(Node):
+    __slots__ = ('expressions',)
+
     def __init__(self, expressions):
         self.type = Syntax.SequenceExpression
         self.expressions = expressions
 
 
 class SpreadElement(Node):
+    __slots__ = ('argument',)
+
     def __init__(self, argument):
         self.type = Syntax.SpreadElement
         self.argument = argument
 
 
 class StaticMemberExpression(Node):
+    __slots__ = ('computed', 'object', 'property', 'optional')
+
     def __init__(self, object, property, optional=False):
         self.type = Syntax.MemberExpression
         self.computed = False
@@ -513,11 +729,15 @@ class StaticMemberExpression(Node):
 
 
 class Super(Node):
+    __slots__ = ()
+
     def __init__(self):
         self.type = Syntax.Super
 
 
 class SwitchCase(Node):
+    __slots__ = ('test', 'consequent')
+
     def __init__(self, test, consequent):
         self.type = Syntax.SwitchCase
         self.test = test
@@ -525,6 +745,8 @@ class SwitchCase(Node):
 
 
 class SwitchStatement(Node):
+    __slots__ = ('discriminant', 'cases')
+
     def __init__(self, discriminant, cases):
         self.type = Syntax.SwitchStatement
         self.discriminant = discriminant
@@ -532,6 +754,8 @@ class SwitchStatement(Node):
 
 
 class TaggedTemplateExpression(Node):
+    __slots__ = ('tag', 'quasi')
+
     def __init__(self, tag, quasi):
         self.type = Syntax.TaggedTemplateExpression
         self.tag = tag
@@ -539,6 +763,8 @@ class TaggedTemplateExpression(Node):
 
 
 class TemplateElement(Node):
+    __slots__ = ('value', 'tail')
+
     class Value(Object):
         def __init__(self, raw, cooked):
             self.raw = raw
@@ -551,6 +777,8 @@ class TemplateElement(Node):
 
 
 class TemplateLiteral(Node):
+    __slots__ = ('quasis', 'expressions')
+
     def __init__(self, quasis, expressions):
         self.type = Syntax.TemplateLiteral
         self.quasis = quasis
@@ -558,17 +786,23 @@ class TemplateLiteral(Node):
 
 
 class ThisExpression(Node):
+    __slots__ = ()
+
     def __init__(self):
         self.type = Syntax.ThisExpression
 
 
 class ThrowStatement(Node):
+    __slots__ = ('argument',)
+
     def __init__(self, argument):
         self.type = Syntax.ThrowStatement
         self.argument = argument
 
 
 class TryStatement(Node):
+    __slots__ = ('block', 'handler', 'finalizer')
+
     def __init__(self, block, handler, finalizer):
         self.type = Syntax.TryStatement
         self.block = block
@@ -577,6 +811,8 @@ class TryStatement(Node):
 
 
 class UnaryExpression(Node):
+    __slots__ = ('prefix', 'operator', 'argument')
+
     def __init__(self, operator, argument):
         self.type = Syntax.UnaryExpression
         self.prefix = True
@@ -585,6 +821,8 @@ class UnaryExpression(Node):
 
 
 class UpdateExpression(Node):
+    __slots__ = ('operator', 'argument', 'prefix')
+
     def __init__(self, operator, argument, prefix):
         self.type = Syntax.UpdateExpression
         self.operator = operator
@@ -593,6 +831,8 @@ class UpdateExpression(Node):
 
 
 class VariableDeclaration(Node):
+    __slots__ = ('declarations', 'kind')
+
     def __init__(self, declarations, kind):
         self.type = Syntax.VariableDeclaration
         self.declarations = declarations
@@ -600,6 +840,8 @@ class VariableDeclaration(Node):
 
 
 class VariableDeclarator(Node):
+    __slots__ = ('id', 'init')
+
     def __init__(self, id, init):
         self.type = Syntax.VariableDeclarator
         self.id = id
@@ -607,6 +849,8 @@ class VariableDeclarator(Node):
 
 
 class WhileStatement(Node):
+    __slots__ = ('test', 'body')
+
     def __init__(self, test, body):
         self.type = Syntax.WhileStatement
         self.test = test
@@ -614,6 +858,8 @@ class WhileStatement(Node):
 
 
 class WithStatement(Node):
+    __slots__ = ('object', 'body')
+
     def __init__(self, object, body):
         self.type = Syntax.WithStatement
         self.object = object
@@ -621,6 +867,8 @@ class WithStatement(Node):
 
 
 class YieldExpression(Node):
+    __slots__ = ('argument', 'delegate')
+
     def __init__(self, argument, delegate):
         self.type = Syntax.YieldExpression
         self.argument = argument
@@ -628,6 +876,8 @@ class YieldExpression(Node):
 
 
 class ArrowParameterPlaceHolder(Node):
+    __slots__ = ('params', 'isAsync')
+
     def __init__(self, params):
         self.type = Syntax.ArrowParameterPlaceHolder
         self.params = params
@@ -635,6 +885,8 @@ class ArrowParameterPlaceHolder(Node):
 
 
 class AsyncArrowParameterPlaceHolder(Node):
+    __slots__ = ('params', 'isAsync')
+
     def __init__(self, params):
         self.type = Syntax.ArrowParameterPlaceHolder
         self.params = params
@@ -642,12 +894,16 @@ class AsyncArrowParameterPlaceHolder(Node):
 
 
 class BlockComment(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.type = Syntax.BlockComment
         self.value = value
 
 
 class LineComment(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.type = Syntax.LineComment
         self.value = value
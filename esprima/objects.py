@@ -34,6 +34,8 @@ class Array(list):
 
 
 class Object(object):
+    __slots__ = ()
+
     def toDict(self):
         from .visitor import ToDictVisitor
         return ToDictVisitor().visit(self)
@@ -42,5 +44,8 @@ class Object(object):
         from .visitor import ReprVisitor
         return ReprVisitor().visit(self)
 
+    def items(self):
+        return self.__dict__.items()
+
     def __getattr__(self, name):
         return None
@@ -23,15 +23,98 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import re
+import sys
+from bisect import bisect_left
+
 from .objects import Object
-from .compat import basestring, unicode
+from .compat import RecursionError, basestring, unicode
 from .utils import format
-from .error_handler import ErrorHandler
+from .error_handler import Error, ErrorHandler
 from .messages import Messages
-from .scanner import RawToken, Scanner, SourceLocation, Position, RegExp
+from .regex_scanner import RegexScanner
+from .scanner import RawToken, Scanner, ScannerState, LazySourceLocation, NodeMetadata, Position, RegExp
 from .token import Token, TokenName
 from .syntax import Syntax
 from . import nodes as Node
+from .nodes import setattribute
+
+
+# What may follow an identifier or a literal for it to be a whole assignment
+# expression, and a whole operand of a binary operator. Comments, '/', and
+# anything that could be a suffix ('.', '?.', '(', '[', '`', '++', '--', '**')
+# are left to the full grammar.
+EXPRESSION_END = re.compile(r'[ \t\r\n]*(?:[,;)\]}:]|\Z)')
+OPERAND_END = re.compile(r'[ \t\r\n]*(?:[,;)\]}:=!>&|^%]|<(?!!--)|\+(?!\+)|-(?!-)|\*(?!\*)|\?(?!\.)|\Z)')
+
+# A property key followed by an array or object literal value, which nested
+# initializers take on without recursing.
+NESTED_VALUE = re.compile(r'[ \t\r\n]*:[ \t\r\n]*[\[{]')
+
+ASSIGN_OPERATORS = frozenset(('=', '*=', '**=', '/=', '%=', '+=', '-=', '<<=', '>>=', '>>>=', '&=', '^=', '|='))
+
+# ES2021: Logical assignment operators
+LOGICAL_ASSIGN_OPERATORS = ASSIGN_OPERATORS | frozenset(('||=', '&&=', '??='))
+
+BINARY_PRECEDENCE = {
+    '??': 1,  # ES2020: Nullish coalescing
+    '||': 2,
+    '&&': 3,
+    '|': 4,
+    '^': 5,
+    '&': 6,
+    '==': 7,
+    '!=': 7,
+    '===': 7,
+    '!==': 7,
+    '<': 8,
+    '>': 8,
+    '<=': 8,
+    '>=': 8,
+    'instanceof': 8,
+    'in': 8,
+    '<<': 9,
+    '>>': 9,
+    '>>>': 9,
+    '+': 10,
+    '-': 10,
+    '*': 12,
+    '/': 12,
+    '%': 12,
+}
+
+STATEMENT_KEYWORDS = frozenset((
+    'break', 'class', 'const', 'continue', 'debugger', 'do', 'export', 'for', 'function',
+    'if', 'import', 'let', 'return', 'switch', 'throw', 'try', 'var', 'while', 'with',
+))
+
+UNARY_OPERATORS = frozenset(('+', '-', '~', '!'))
+UNARY_KEYWORDS = frozenset(('delete', 'void', 'typeof'))
+UPDATE_OPERATORS = frozenset(('++', '--'))
+
+PROPERTY_KEY_TOKENS = frozenset((
+    Token.Identifier, Token.StringLiteral, Token.NumericLiteral, Token.BigIntLiteral,
+    Token.BooleanLiteral, Token.NullLiteral, Token.Keyword,
+))
+
+# Statements starting with a keyword, by keyword; the others are expression
+# statements.
+STATEMENT_PARSERS = {
+    'break': 'parseBreakStatement',
+    'continue': 'parseContinueStatement',
+    'debugger': 'parseDebuggerStatement',
+    'do': 'parseDoWhileStatement',
+    'for': 'parseForStatement',
+    'function': 'parseFunctionDeclaration',
+    'if': 'parseIfStatement',
+    'return': 'parseReturnStatement',
+    'switch': 'parseSwitchStatement',
+    'throw': 'parseThrowStatement',
+    'try': 'parseTryStatement',
+    'var': 'parseVariableStatement',
+    'while': 'parseWhileStatement',
+    'with': 'parseWithStatement',
+}
 
 
 class Value(object):
@@ -66,7 +149,7 @@ class Config(Object):
 
 
 class Context(object):
-    def __init__(self, isModule=False, allowAwait=False, allowIn=True, allowStrictDirective=True, allowYield=True, firstCoverInitializedNameError=None, isAssignmentTarget=False, isBindingElement=False, inFunctionBody=False, inIteration=False, inSwitch=False, labelSet=None, strict=False):
+    def __init__(self, isModule=False, allowAwait=False, allowIn=True, allowStrictDirective=True, allowYield=True, firstCoverInitializedNameError=None, isAssignmentTarget=False, isBindingElement=False, inFunctionBody=False, inIteration=False, inSwitch=False, labelSet=None, strict=False, nesting=0):
         self.isModule = isModule
         self.allowAwait = allowAwait
         self.allowIn = allowIn
@@ -80,13 +163,16 @@ class Context(object):
         self.inSwitch = inSwitch
         self.labelSet = {} if labelSet is None else labelSet
         self.strict = strict
+        self.nesting = nesting
 
 
 class Marker(object):
-    def __init__(self, index=None, line=None, column=None):
+    def __init__(self, index=None, line=None, column=None, exact=True):
         self.index = index
         self.line = line
         self.column = column
+        # Whether line and column can be derived from index.
+        self.exact = exact
 
 
 class TokenEntry(Object):
@@ -98,88 +184,120 @@ class TokenEntry(Object):
         self.loc = loc
 
 
+class LazyFunctionBody(Node.BlockStatement):
+    """
+    Placeholder for a function body skipped by the `lazy` option, holding
+    what is needed to parse it in place of its statements: the parser class,
+    the line index of the source, the options, the range of the body, the
+    context of the function and the ends of the bodies found in the source,
+    by their start. It is parsed, and turns into a plain BlockStatement, the
+    first time any of its attributes is read.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, parser, lines, options, range, context, ends):
+        object.__setattr__(self, 'body', (parser, lines, options, range, context, ends))
+
+    def __getattribute__(self, name):
+        parser, lines, options, range, context, ends = object.__getattribute__(self, 'body')
+        body = parser(lines.source, options).parseLazyFunctionBody(lines, range, context, ends)
+        object.__setattr__(self, '__class__', Node.BlockStatement)
+        for key, value in body.items():
+            setattr(self, key, value)
+        return getattr(self, name)
+
+
 class Parser(object):
+    operatorPrecedence = BINARY_PRECEDENCE
+    maxNestingDepth = 50
+
     def __init__(self, code, options={}, delegate=None):
-        self.config = Config(**options)
+        self.options = None
+        self.scanner = None
+        self.errorHandler = ErrorHandler()
+        self.reset(code, options, delegate)
 
-        self.delegate = delegate
+    # Re-arms the parser to parse `code`, with `options` (the previous ones by
+    # default) and `delegate`. The configuration and the scanner are kept as
+    # long as the options compare equal.
 
-        self.errorHandler = ErrorHandler()
-        self.errorHandler.tolerant = self.config.tolerant
-        self.scanner = Scanner(code, self.errorHandler, self.config.ecmaVersion)
-        self.scanner.trackComment = self.config.comment
+    def reset(self, code, options=None, delegate=None):
+        if options is not None and options != self.options:
+            self.configure(options)
 
-        self.operatorPrecedence = {
-            '??': 1,  # ES2020: Nullish coalescing
-            '||': 2,
-            '&&': 3,
-            '|': 4,
-            '^': 5,
-            '&': 6,
-            '==': 7,
-            '!=': 7,
-            '===': 7,
-            '!==': 7,
-            '<': 8,
-            '>': 8,
-            '<=': 8,
-            '>=': 8,
-            'instanceof': 8,
-            'in': 8,
-            '<<': 9,
-            '>>': 9,
-            '>>>': 9,
-            '+': 10,
-            '-': 10,
-            '*': 12,
-            '/': 12,
-            '%': 12,
-        }
+        self.delegate = delegate
+        # With delegateMode='batch', the delegate runs over all nodes and
+        # comments, in the order they were finalized, once the program is
+        # parsed. What it returns is ignored then.
+        self.delegated = [] if delegate and self.config.delegateMode == 'batch' else None
+        self.parseFunctionSourceElements = self.skipFunctionBody if self.lazy and not delegate else self.parseFunctionBody
+
+        self.errorHandler.errors = []
+        self.recoveryDepth = 0
+        self.pending = None
+        self.bodyEnds = {}
+        self.bodyChecked = False
+        self.scanErrors = {}
+        scanner = self.scanner
+        scanner.reset(code)
 
         self.lookahead = RawToken(
             type=Token.EOF,
             value='',
-            lineNumber=self.scanner.lineNumber,
+            lineNumber=scanner.lineNumber,
             lineStart=0,
             start=0,
             end=0
         )
         self.hasLineTerminator = False
 
-        self.context = Context(
-            isModule=False,
-            allowAwait=False,
-            allowIn=True,
-            allowStrictDirective=True,
-            allowYield=True,
-            firstCoverInitializedNameError=None,
-            isAssignmentTarget=False,
-            isBindingElement=False,
-            inFunctionBody=False,
-            inIteration=False,
-            inSwitch=False,
-            labelSet={},
-            strict=False
-        )
+        self.context = Context()
         self.tokens = []
 
         self.startMarker = Marker(
             index=0,
-            line=self.scanner.lineNumber,
+            line=scanner.lineNumber,
             column=0
         )
         self.lastMarker = Marker(
             index=0,
-            line=self.scanner.lineNumber,
+            line=scanner.lineNumber,
             column=0
         )
         self.nextToken()
         self.lastMarker = Marker(
-            index=self.scanner.index,
-            line=self.scanner.lineNumber,
-            column=self.scanner.index - self.scanner.lineStart
+            index=scanner.index,
+            line=scanner.lineNumber,
+            column=scanner.index - scanner.lineStart
         )
 
+    def configure(self, options):
+        self.config = Config(**options)
+        self.options = dict(options)
+
+        # Recovering from errors implies tolerating them.
+        self.recover = bool(self.config.recover)
+        if self.recover:
+            self.config.tolerant = True
+        self.errorHandler.tolerant = self.config.tolerant
+        self.errorHandler.onError = self.config.onError
+        # Function bodies are kept whole where tokens, comments or errors are
+        # collected from them.
+        self.lazy = bool(self.config.lazy) and not (
+            self.config.tokens or self.config.comment or self.config.tolerant or self.config.jsx)
+
+        ecmaVersion = self.config.ecmaVersion
+        scanner = RegexScanner if self.config.lexer == 'regex' else Scanner
+        if type(self.scanner) is not scanner or self.scanner.ecmaVersion != ecmaVersion:
+            self.scanner = scanner('', self.errorHandler, ecmaVersion)
+        self.scanner.trackComment = self.config.comment
+        self.scanner.regexValidation = 'full' if self.config.regexValidation is None else self.config.regexValidation
+        self.lex = self.recoverLex if self.recover else self.scanner.lex
+        self.parseStatementListItem = self.recoverStatementListItem if self.recover else self.parseStatementOrDeclaration
+
+        self.assignOperators = LOGICAL_ASSIGN_OPERATORS if ecmaVersion >= 2021 else ASSIGN_OPERATORS
+
     def throwError(self, messageFormat, *args):
         msg = format(messageFormat, *args)
         index = self.lastMarker.index
@@ -197,6 +315,8 @@ class Parser(object):
     # Throw an exception because of the token.
 
     def unexpectedTokenError(self, token=None, message=None):
+        if token and token.type is None:
+            return self.scanErrors[token.start]
         msg = message or Messages.UnexpectedToken
         if token:
             if not message:
@@ -260,21 +380,14 @@ class Parser(object):
                     if self.config.loc:
                         node.loc = e.loc
                     if self.delegate:
-                        metadata = SourceLocation(
-                            start=Position(
-                                line=e.loc.start.line,
-                                column=e.loc.start.column,
-                                offset=e.range[0],
-                            ),
-                            end=Position(
-                                line=e.loc.end.line,
-                                column=e.loc.end.column,
-                                offset=e.range[1],
-                            )
+                        metadata = NodeMetadata(
+                            e.range[0], e.loc.start.line, e.loc.start.column,
+                            e.range[1], e.loc.end.line, e.loc.end.column,
                         )
-                        new_node = self.delegate(node, metadata)
-                        if new_node is not None:
-                            node = new_node
+                        if self.delegated is not None:
+                            self.delegated.append((node, metadata))
+                        else:
+                            self.delegate(node, metadata)
 
     # From internal representation to an external structure
 
@@ -289,16 +402,7 @@ class Parser(object):
         if self.config.range:
             t.range = [token.start, token.end]
         if self.config.loc:
-            t.loc = SourceLocation(
-                start=Position(
-                    line=self.startMarker.line,
-                    column=self.startMarker.column,
-                ),
-                end=Position(
-                    line=self.scanner.lineNumber,
-                    column=self.scanner.index - self.scanner.lineStart,
-                ),
-            )
+            t.loc = LazySourceLocation(self.scanner.lines, self.startMarker.index, self.scanner.index)
         if token.type is Token.RegularExpression:
             t.regex = RegExp(
                 pattern=token.pattern,
@@ -321,7 +425,7 @@ class Parser(object):
             self.startMarker.line = self.scanner.lineNumber
             self.startMarker.column = self.scanner.index - self.scanner.lineStart
 
-        next = self.scanner.lex()
+        next = self.lex()
         self.hasLineTerminator = token.lineNumber != next.lineNumber
 
         if next and self.context.strict and next.type is Token.Identifier:
@@ -329,7 +433,7 @@ class Parser(object):
                 next.type = Token.Keyword
         self.lookahead = next
 
-        if self.config.tokens and next.type is not Token.EOF:
+        if self.config.tokens and next.type is not Token.EOF and next.type is not None:
             self.tokens.append(self.convertToken(next))
 
         return token
@@ -361,7 +465,8 @@ class Parser(object):
     def startNode(self, token, lastLineStart=0):
         column = token.start - token.lineStart
         line = token.lineNumber
-        if column < 0:
+        exact = column >= 0
+        if not exact:
             column += lastLineStart
             line -= 1
 
@@ -369,42 +474,35 @@ class Parser(object):
             index=token.start,
             line=line,
             column=column,
+            exact=exact,
         )
 
     def finalize(self, marker, node):
+        # Set through the slots, as every node goes through here.
         if self.config.range:
-            node.range = [marker.index, self.lastMarker.index]
+            setattribute(node, 'range', [marker.index, self.lastMarker.index])
 
         if self.config.loc:
-            node.loc = SourceLocation(
-                start=Position(
-                    line=marker.line,
-                    column=marker.column,
-                ),
-                end=Position(
-                    line=self.lastMarker.line,
-                    column=self.lastMarker.column,
-                ),
-            )
-            if self.config.source:
-                node.loc.source = self.config.source
+            setattribute(node, 'loc', LazySourceLocation(
+                self.scanner.lines,
+                marker.index,
+                self.lastMarker.index,
+                self.config.source or None,
+                None if marker.exact else Position(line=marker.line, column=marker.column),
+            ))
 
         if self.delegate:
-            metadata = SourceLocation(
-                start=Position(
-                    line=marker.line,
-                    column=marker.column,
-                    offset=marker.index,
-                ),
-                end=Position(
-                    line=self.lastMarker.line,
-                    column=self.lastMarker.column,
-                    offset=self.lastMarker.index,
-                )
+            lastMarker = self.lastMarker
+            metadata = NodeMetadata(
+                marker.index, marker.line, marker.column,
+                lastMarker.index, lastMarker.line, lastMarker.column,
             )
-            new_node = self.delegate(node, metadata)
-            if new_node is not None:
-                node = new_node
+            if self.delegated is not None:
+                self.delegated.append((node, metadata))
+            else:
+                new_node = self.delegate(node, metadata)
+                if new_node is not None:
+                    node = new_node
 
         return node
 
@@ -458,17 +556,7 @@ class Parser(object):
     # Return true if the next token is an assignment operator
 
     def matchAssign(self):
-        if self.lookahead.type is not Token.Punctuator:
-            return False
-
-        op = self.lookahead.value
-        operators = ['=', '*=', '**=', '/=', '%=', '+=', '-=', '<<=', '>>=', '>>>=', '&=', '^=', '|=']
-        
-        # ES2021: Logical assignment operators
-        if self.config.ecmaVersion >= 2021:
-            operators.extend(['||=', '&&=', '??='])
-            
-        return op in operators
+        return self.lookahead.type is Token.Punctuator and self.lookahead.value in self.assignOperators
 
     # Cover grammar support.
     #
@@ -551,6 +639,9 @@ class Parser(object):
     # https://tc39.github.io/ecma262/#sec-primary-expression
 
     def parsePrimaryExpression(self):
+        if self.pending is not None:
+            return self.takePending()
+
         node = self.createNode()
 
         typ = self.lookahead.type
@@ -650,28 +741,114 @@ class Parser(object):
         return self.finalize(node, Node.SpreadElement(arg))
 
     def parseArrayInitializer(self):
-        node = self.createNode()
-        elements = []
+        return self.parseInitializers()
 
-        self.expect('[')
-        while not self.match(']'):
-            if self.match(','):
-                self.nextToken()
-                elements.append(None)
-            elif self.match('...'):
-                element = self.parseSpreadElement()
-                if not self.match(']'):
-                    self.context.isAssignmentTarget = False
-                    self.context.isBindingElement = False
-                    self.expect(',')
-                elements.append(element)
+    # Array and object literals nested directly in one another, as elements or
+    # as `key: value` values, are kept on an explicit stack rather than parsed
+    # through the whole expression grammar, level after level. Once a nested
+    # literal is done, the element it starts is parsed as usual, with the
+    # literal handed to parsePrimaryExpression through takePending().
+
+    def parseInitializers(self):
+        stack = []
+        frame = self.openInitializer()
+        while True:
+            isArray, node, items, hasProto = frame[:4]
+            nested = None
+            if isArray:
+                while not self.match(']'):
+                    if self.match(','):
+                        self.nextToken()
+                        items.append(None)
+                    elif self.match('...'):
+                        element = self.parseSpreadElement()
+                        if not self.match(']'):
+                            self.context.isAssignmentTarget = False
+                            self.context.isBindingElement = False
+                            self.expect(',')
+                        items.append(element)
+                    elif self.match('[', '{'):
+                        nested = True
+                        break
+                    else:
+                        items.append(self.inheritCoverGrammar(self.parseAssignmentExpression))
+                        if not self.match(']'):
+                            self.expect(',')
+            else:
+                while not self.match('}'):
+                    if self.match('...'):
+                        items.append(self.parseSpreadElement())
+                    else:
+                        nested = self.parseNestedPropertyKey(hasProto)
+                        if nested is not None:
+                            break
+                        items.append(self.parseObjectProperty(hasProto))
+                    if not self.match('}'):
+                        self.expectCommaSeparator()
+
+            if nested is not None:
+                # As reached through parsePrimaryExpression, saving what the
+                # element's caller would have.
+                frame[4] = nested
+                stack.append(frame)
+                previousFlags = (
+                    self.context.isBindingElement, self.context.isAssignmentTarget,
+                    self.context.firstCoverInitializedNameError,
+                )
+                previousAllowIn = self.context.allowIn
+                self.context.isBindingElement = True
+                self.context.isAssignmentTarget = True
+                self.context.firstCoverInitializedNameError = None
+                self.context.allowIn = True
+                frame = self.openInitializer()
+                frame[6] = previousFlags
+                frame[7] = previousAllowIn
+                continue
+
+            if isArray:
+                self.expect(']')
+                expr = self.finalize(node, Node.ArrayExpression(items))
             else:
-                elements.append(self.inheritCoverGrammar(self.parseAssignmentExpression))
+                self.expect('}')
+                expr = self.finalize(node, Node.ObjectExpression(items))
+            if not stack:
+                return expr
+
+            startToken, previousFlags, previousAllowIn = frame[5:]
+            frame = stack.pop()
+            self.context.allowIn = previousAllowIn
+            self.pending = (expr, self.lookahead, (
+                self.context.isBindingElement, self.context.isAssignmentTarget,
+                self.context.firstCoverInitializedNameError,
+            ))
+            (self.context.isBindingElement, self.context.isAssignmentTarget,
+             self.context.firstCoverInitializedNameError) = previousFlags
+            self.lookahead = startToken
+            value = self.inheritCoverGrammar(self.parseAssignmentExpression)
+
+            if frame[0]:
+                frame[2].append(value)
                 if not self.match(']'):
                     self.expect(',')
-        self.expect(']')
+            else:
+                property, key = frame[4]
+                frame[2].append(self.finalize(property, Node.Property('init', key, False, value, False, False)))
+                if not self.match('}'):
+                    self.expectCommaSeparator()
 
-        return self.finalize(node, Node.ArrayExpression(elements))
+    def openInitializer(self):
+        startToken = self.lookahead
+        node = self.createNode()
+        isArray = startToken.value == '['
+        self.nextToken()
+        return [isArray, node, [], None if isArray else Value(False), None, startToken, None, None]
+
+    def takePending(self):
+        expr, self.lookahead, flags = self.pending
+        self.pending = None
+        (self.context.isBindingElement, self.context.isAssignmentTarget,
+         self.context.firstCoverInitializedNameError) = flags
+        return expr
 
     # https://tc39.github.io/ecma262/#sec-object-initializer
 
@@ -842,18 +1019,24 @@ class Parser(object):
         return self.finalize(node, Node.Property(kind, key, computed, value, method, shorthand))
 
     def parseObjectInitializer(self):
-        node = self.createNode()
+        return self.parseInitializers()
 
-        self.expect('{')
-        properties = []
-        hasProto = Value(False)
-        while not self.match('}'):
-            properties.append(self.parseSpreadElement() if self.match('...') else self.parseObjectProperty(hasProto))
-            if not self.match('}'):
-                self.expectCommaSeparator()
-        self.expect('}')
+    # Reads `key:` when an array or object literal follows, the way
+    # parseObjectProperty would, or returns None.
 
-        return self.finalize(node, Node.ObjectExpression(properties))
+    def parseNestedPropertyKey(self, hasProto):
+        token = self.lookahead
+        if token.type not in PROPERTY_KEY_TOKENS or NESTED_VALUE.match(self.scanner.source, token.end) is None:
+            return None
+
+        node = self.createNode()
+        key = self.parseObjectPropertyKey()
+        if self.isPropertyKey(key, '__proto__'):
+            if hasProto.value:
+                self.tolerateError(Messages.DuplicateProtoProperty)
+            hasProto.value = True
+        self.nextToken()
+        return node, key
 
     # https://tc39.github.io/ecma262/#sec-template-literals
 
@@ -948,6 +1131,7 @@ class Parser(object):
 
     def parseGroupExpression(self):
         self.expect('(')
+        self.enterNesting()
         if self.match(')'):
             self.nextToken()
             if not self.match('=>'):
@@ -1024,12 +1208,14 @@ class Parser(object):
                             expr = Node.ArrowParameterPlaceHolder(parameters)
                     self.context.isBindingElement = False
 
+        self.context.nesting -= 1
         return expr
 
     # https://tc39.github.io/ecma262/#sec-left-hand-side-expressions
 
     def parseArguments(self):
         self.expect('(')
+        self.enterNesting()
         args = []
         if not self.match(')'):
             while True:
@@ -1044,6 +1230,7 @@ class Parser(object):
                 if self.match(')'):
                     break
         self.expect(')')
+        self.context.nesting -= 1
 
         return args
 
@@ -1105,6 +1292,7 @@ class Parser(object):
 
     def parseAsyncArguments(self):
         self.expect('(')
+        self.enterNesting()
         args = []
         if not self.match(')'):
             while True:
@@ -1119,6 +1307,7 @@ class Parser(object):
                 if self.match(')'):
                     break
         self.expect(')')
+        self.context.nesting -= 1
 
         return args
 
@@ -1162,29 +1351,40 @@ class Parser(object):
 
     def parseLeftHandSideExpressionAllowCall(self):
         startToken = self.lookahead
-        maybeAsync = self.matchContextualKeyword('async')
+        maybeAsync = startToken.type is Token.Identifier and startToken.value == 'async'
+        keyword = startToken.value if startToken.type is Token.Keyword else None
 
         previousAllowIn = self.context.allowIn
         self.context.allowIn = True
 
-        if self.matchKeyword('super') and self.context.inFunctionBody:
+        if keyword == 'super' and self.context.inFunctionBody:
             expr = self.createNode()
             self.nextToken()
             expr = self.finalize(expr, Node.Super())
             if not self.match('(') and not self.match('.') and not self.match('['):
                 self.throwUnexpectedToken(self.lookahead)
         else:
-            expr = self.inheritCoverGrammar(self.parseNewExpression if self.matchKeyword('new') else self.parsePrimaryExpression)
+            expr = self.inheritCoverGrammar(self.parseNewExpression if keyword == 'new' else self.parsePrimaryExpression)
 
         while True:
-            if self.match('.'):
+            token = self.lookahead
+            if token.type is Token.Punctuator:
+                value = token.value
+            elif token.type is Token.Template and token.head:
+                quasi = self.parseTemplateLiteral()
+                expr = self.finalize(self.startNode(startToken), Node.TaggedTemplateExpression(expr, quasi))
+                continue
+            else:
+                break
+
+            if value == '.':
                 self.context.isBindingElement = False
                 self.context.isAssignmentTarget = True
-                self.expect('.')
+                self.nextToken()
                 property = self.parsePropertyName()  # Can handle private identifiers
                 expr = self.finalize(self.startNode(startToken), Node.StaticMemberExpression(expr, property))
 
-            elif self.match('?.') and self.config.ecmaVersion >= 2020:
+            elif value == '?.' and self.config.ecmaVersion >= 2020:
                 self.context.isBindingElement = False
                 self.context.isAssignmentTarget = False  # Optional chaining is not a valid assignment target
                 self.expect('?.')
@@ -1203,8 +1403,8 @@ class Parser(object):
                     property = self.parsePropertyName()
                     expr = self.finalize(self.startNode(startToken), Node.StaticMemberExpression(expr, property, optional=True))
 
-            elif self.match('('):
-                asyncArrow = maybeAsync and (startToken.lineNumber == self.lookahead.lineNumber)
+            elif value == '(':
+                asyncArrow = maybeAsync and (startToken.lineNumber == token.lineNumber)
                 self.context.isBindingElement = False
                 self.context.isAssignmentTarget = False
                 if asyncArrow:
@@ -1218,18 +1418,14 @@ class Parser(object):
                     for arg in args:
                         self.reinterpretExpressionAsPattern(arg)
                     expr = Node.AsyncArrowParameterPlaceHolder(args)
-            elif self.match('['):
+            elif value == '[':
                 self.context.isBindingElement = False
                 self.context.isAssignmentTarget = True
-                self.expect('[')
+                self.nextToken()
                 property = self.isolateCoverGrammar(self.parseExpression)
                 self.expect(']')
                 expr = self.finalize(self.startNode(startToken), Node.ComputedMemberExpression(expr, property))
 
-            elif self.lookahead.type is Token.Template and self.lookahead.head:
-                quasi = self.parseTemplateLiteral()
-                expr = self.finalize(self.startNode(startToken), Node.TaggedTemplateExpression(expr, quasi))
-
             else:
                 break
 
@@ -1300,7 +1496,7 @@ class Parser(object):
     def parseUpdateExpression(self):
         startToken = self.lookahead
 
-        if self.match('++', '--'):
+        if startToken.type is Token.Punctuator and startToken.value in UPDATE_OPERATORS:
             node = self.startNode(startToken)
             token = self.nextToken()
             expr = self.inheritCoverGrammar(self.parseUnaryExpression)
@@ -1315,7 +1511,7 @@ class Parser(object):
         else:
             expr = self.inheritCoverGrammar(self.parseLeftHandSideExpressionAllowCall)
             if not self.hasLineTerminator and self.lookahead.type is Token.Punctuator:
-                if self.match('++', '--'):
+                if self.lookahead.value in UPDATE_OPERATORS:
                     if self.context.strict and expr.type is Syntax.Identifier and self.scanner.isRestrictedWord(expr.name):
                         self.tolerateError(Messages.StrictLHSPostfix)
                     if not self.context.isAssignmentTarget:
@@ -1337,11 +1533,12 @@ class Parser(object):
         return self.finalize(node, Node.AwaitExpression(argument))
 
     def parseUnaryExpression(self):
+        token = self.lookahead
         if (
-            self.match('+', '-', '~', '!') or
-            self.matchKeyword('delete', 'void', 'typeof')
+            token.type is Token.Punctuator and token.value in UNARY_OPERATORS or
+            token.type is Token.Keyword and token.value in UNARY_KEYWORDS
         ):
-            node = self.startNode(self.lookahead)
+            node = self.startNode(token)
             token = self.nextToken()
             expr = self.inheritCoverGrammar(self.parseUnaryExpression)
             expr = self.finalize(node, Node.UnaryExpression(token.value, expr))
@@ -1357,10 +1554,15 @@ class Parser(object):
         return expr
 
     def parseExponentiationExpression(self):
+        expr = self.parseSimpleOperand(OPERAND_END)
+        if expr is not None:
+            return expr
+
         startToken = self.lookahead
 
         expr = self.inheritCoverGrammar(self.parseUnaryExpression)
-        if expr.type is not Syntax.UnaryExpression and self.match('**'):
+        token = self.lookahead
+        if token.type is Token.Punctuator and token.value == '**' and expr.type is not Syntax.UnaryExpression:
             self.nextToken()
             self.context.isAssignmentTarget = False
             self.context.isBindingElement = False
@@ -1370,6 +1572,40 @@ class Parser(object):
 
         return expr
 
+    # An identifier or a literal that `end` matches after goes through the
+    # precedence chain untouched: it is parsed here as parsePrimaryExpression
+    # would, with the cover grammar flags inheritCoverGrammar would leave.
+
+    def parseSimpleOperand(self, end):
+        token = self.lookahead
+        typ = token.type
+        if typ is Token.Identifier:
+            if token.value in ('async', 'await'):
+                return None
+        elif typ not in (Token.NumericLiteral, Token.StringLiteral, Token.BooleanLiteral, Token.NullLiteral):
+            return None
+        elif self.context.strict and token.octal:
+            return None
+
+        if end.match(self.scanner.source, token.end) is None:
+            return None
+
+        node = self.createNode()
+        self.nextToken()
+        if typ is Token.Identifier:
+            return self.finalize(node, Node.Identifier(token.value))
+
+        self.context.isAssignmentTarget = False
+        self.context.isBindingElement = False
+        raw = self.getTokenRaw(token)
+        if typ is Token.BooleanLiteral:
+            value = token.value == 'true'
+        elif typ is Token.NullLiteral:
+            value = None
+        else:
+            value = token.value
+        return self.finalize(node, Node.Literal(value, raw))
+
     # https://tc39.github.io/ecma262/#sec-exp-operator
     # https://tc39.github.io/ecma262/#sec-multiplicative-operators
     # https://tc39.github.io/ecma262/#sec-additive-operators
@@ -1380,14 +1616,14 @@ class Parser(object):
     # https://tc39.github.io/ecma262/#sec-binary-logical-operators
 
     def binaryPrecedence(self, token):
-        op = token.value
-        if token.type is Token.Punctuator:
-            precedence = self.operatorPrecedence.get(op, 0)
-        elif token.type is Token.Keyword:
-            precedence = 7 if (op == 'instanceof' or (self.context.allowIn and op == 'in')) else 0
-        else:
-            precedence = 0
-        return precedence
+        typ = token.type
+        if typ is Token.Punctuator:
+            return self.operatorPrecedence.get(token.value, 0)
+        elif typ is Token.Keyword:
+            op = token.value
+            if op == 'instanceof' or (op == 'in' and self.context.allowIn):
+                return self.operatorPrecedence[op]
+        return 0
 
     def parseBinaryExpression(self):
         startToken = self.lookahead
@@ -1447,11 +1683,20 @@ class Parser(object):
 
     # https://tc39.github.io/ecma262/#sec-conditional-operator
 
+    # Chains of conditionals in the alternate position, `a ? b : c ? d : e`,
+    # are parsed in a loop and folded from the right, each alternate being
+    # isolated as parseAssignmentExpression would be.
+
     def parseConditionalExpression(self):
         startToken = self.lookahead
 
         expr = self.inheritCoverGrammar(self.parseBinaryExpression)
-        if self.match('?'):
+        token = self.lookahead
+        if token.type is not Token.Punctuator or token.value != '?':
+            return expr
+
+        chain = []
+        while True:
             self.nextToken()
 
             previousAllowIn = self.context.allowIn
@@ -1460,13 +1705,42 @@ class Parser(object):
             self.context.allowIn = previousAllowIn
 
             self.expect(':')
-            alternate = self.isolateCoverGrammar(self.parseAssignmentExpression)
+            chain.append((startToken, expr, consequent, (
+                self.context.isBindingElement, self.context.isAssignmentTarget,
+                self.context.firstCoverInitializedNameError,
+            )))
+            self.context.isBindingElement = True
+            self.context.isAssignmentTarget = True
+            self.context.firstCoverInitializedNameError = None
 
-            expr = self.finalize(self.startNode(startToken), Node.ConditionalExpression(expr, consequent, alternate))
+            startToken = self.lookahead
+            if startToken.type is Token.Identifier and startToken.value == 'async':
+                alternate = self.parseAssignmentExpression()
+                break
+            if not self.context.allowYield and self.matchKeyword('yield'):
+                alternate = self.parseYieldExpression()
+                break
+            alternate = self.parseSimpleOperand(EXPRESSION_END)
+            if alternate is not None:
+                break
+
+            expr = self.inheritCoverGrammar(self.parseBinaryExpression)
+            token = self.lookahead
+            if token.type is not Token.Punctuator or token.value != '?':
+                alternate = self.parseAssignmentTail(startToken, expr)
+                break
+
+        while chain:
+            startToken, test, consequent, previousFlags = chain.pop()
+            if self.context.firstCoverInitializedNameError is not None:
+                self.throwUnexpectedToken(self.context.firstCoverInitializedNameError)
+            (self.context.isBindingElement, self.context.isAssignmentTarget,
+             self.context.firstCoverInitializedNameError) = previousFlags
+            alternate = self.finalize(self.startNode(startToken), Node.ConditionalExpression(test, consequent, alternate))
             self.context.isAssignmentTarget = False
             self.context.isBindingElement = False
 
-        return expr
+        return alternate
 
     # https://tc39.github.io/ecma262/#sec-assignment-operators
 
@@ -1511,10 +1785,12 @@ class Parser(object):
                 if param.right.type is Syntax.YieldExpression:
                     if param.right.argument:
                         self.throwUnexpectedToken(self.lookahead)
-                    param.right.type = Syntax.Identifier
-                    param.right.name = 'yield'
-                    del param.right.argument
-                    del param.right.delegate
+                    right = param.right
+                    param.right = Node.Identifier('yield')
+                    if right.range is not None:
+                        param.right.range = right.range
+                    if right.loc is not None:
+                        param.right.loc = right.loc
             elif asyncArrow and param.type is Syntax.Identifier and param.name == 'await':
                 self.throwUnexpectedToken(self.lookahead)
             self.checkPatternParam(options, param)
@@ -1538,87 +1814,97 @@ class Parser(object):
 
     def parseAssignmentExpression(self):
         if not self.context.allowYield and self.matchKeyword('yield'):
-            expr = self.parseYieldExpression()
-        else:
-            startToken = self.lookahead
-            token = startToken
-            expr = self.parseConditionalExpression()
+            return self.parseYieldExpression()
 
-            if token.type is Token.Identifier and (token.lineNumber == self.lookahead.lineNumber) and token.value == 'async':
-                if self.lookahead.type is Token.Identifier or self.matchKeyword('yield'):
-                    arg = self.parsePrimaryExpression()
-                    self.reinterpretExpressionAsPattern(arg)
-                    expr = Node.AsyncArrowParameterPlaceHolder([arg])
+        expr = self.parseSimpleOperand(EXPRESSION_END)
+        if expr is not None:
+            return expr
 
-            if expr.type is Syntax.ArrowParameterPlaceHolder or self.match('=>'):
+        startToken = self.lookahead
+        return self.parseAssignmentTail(startToken, self.parseConditionalExpression())
 
-                # https://tc39.github.io/ecma262/#sec-arrow-function-definitions
-                self.context.isAssignmentTarget = False
-                self.context.isBindingElement = False
-                isAsync = expr.isAsync
-                list = self.reinterpretAsCoverFormalsList(expr)
+    # The rest of an assignment expression starting with startToken, whose
+    # conditional expression is expr: an arrow function or an assignment.
 
-                if list:
-                    if self.hasLineTerminator:
-                        self.tolerateUnexpectedToken(self.lookahead)
-                    self.context.firstCoverInitializedNameError = None
+    def parseAssignmentTail(self, startToken, expr):
+        token = startToken
+        if token.type is Token.Identifier and (token.lineNumber == self.lookahead.lineNumber) and token.value == 'async':
+            if self.lookahead.type is Token.Identifier or self.matchKeyword('yield'):
+                arg = self.parsePrimaryExpression()
+                self.reinterpretExpressionAsPattern(arg)
+                expr = Node.AsyncArrowParameterPlaceHolder([arg])
 
-                    previousStrict = self.context.strict
-                    previousAllowStrictDirective = self.context.allowStrictDirective
-                    self.context.allowStrictDirective = list.simple
+        lookahead = self.lookahead
+        if expr.type is Syntax.ArrowParameterPlaceHolder or lookahead.type is Token.Punctuator and lookahead.value == '=>':
 
-                    previousAllowYield = self.context.allowYield
-                    previousAwait = self.context.allowAwait
-                    self.context.allowYield = True
-                    self.context.allowAwait = isAsync
+            # https://tc39.github.io/ecma262/#sec-arrow-function-definitions
+            self.context.isAssignmentTarget = False
+            self.context.isBindingElement = False
+            isAsync = expr.isAsync
+            list = self.reinterpretAsCoverFormalsList(expr)
 
-                    node = self.startNode(startToken)
-                    self.expect('=>')
-                    if self.match('{'):
-                        previousAllowIn = self.context.allowIn
-                        self.context.allowIn = True
-                        body = self.parseFunctionSourceElements()
-                        self.context.allowIn = previousAllowIn
-                    else:
-                        body = self.isolateCoverGrammar(self.parseAssignmentExpression)
-                    expression = body.type is not Syntax.BlockStatement
-
-                    if self.context.strict and list.firstRestricted:
-                        self.throwUnexpectedToken(list.firstRestricted, list.message)
-                    if self.context.strict and list.stricted:
-                        self.tolerateUnexpectedToken(list.stricted, list.message)
-                    if isAsync:
-                        expr = self.finalize(node, Node.AsyncArrowFunctionExpression(list.params, body, expression))
-                    else:
-                        expr = self.finalize(node, Node.ArrowFunctionExpression(list.params, body, expression))
+            if list:
+                if self.hasLineTerminator:
+                    self.tolerateUnexpectedToken(self.lookahead)
+                self.context.firstCoverInitializedNameError = None
 
-                    self.context.strict = previousStrict
-                    self.context.allowStrictDirective = previousAllowStrictDirective
-                    self.context.allowYield = previousAllowYield
-                    self.context.allowAwait = previousAwait
-            else:
-                if self.matchAssign():
-                    if not self.context.isAssignmentTarget:
-                        self.tolerateError(Messages.InvalidLHSInAssignment)
+                previousStrict = self.context.strict
+                previousAllowStrictDirective = self.context.allowStrictDirective
+                self.context.allowStrictDirective = list.simple
 
-                    if self.context.strict and expr.type is Syntax.Identifier:
-                        id = expr
-                        if self.scanner.isRestrictedWord(id.name):
-                            self.tolerateUnexpectedToken(token, Messages.StrictLHSAssignment)
-                        if self.scanner.isStrictModeReservedWord(id.name):
-                            self.tolerateUnexpectedToken(token, Messages.StrictReservedWord)
+                previousAllowYield = self.context.allowYield
+                previousAwait = self.context.allowAwait
+                self.context.allowYield = True
+                self.context.allowAwait = isAsync
 
-                    if not self.match('='):
-                        self.context.isAssignmentTarget = False
-                        self.context.isBindingElement = False
-                    else:
-                        self.reinterpretExpressionAsPattern(expr)
+                node = self.startNode(startToken)
+                self.expect('=>')
+                if self.match('{'):
+                    previousAllowIn = self.context.allowIn
+                    self.context.allowIn = True
+                    body = self.parseFunctionSourceElements()
+                    self.context.allowIn = previousAllowIn
+                    expression = False
+                else:
+                    body = self.isolateCoverGrammar(self.parseAssignmentExpression)
+                    expression = True
+
+                if self.context.strict and list.firstRestricted:
+                    self.throwUnexpectedToken(list.firstRestricted, list.message)
+                if self.context.strict and list.stricted:
+                    self.tolerateUnexpectedToken(list.stricted, list.message)
+                if isAsync:
+                    expr = self.finalize(node, Node.AsyncArrowFunctionExpression(list.params, body, expression))
+                else:
+                    expr = self.finalize(node, Node.ArrowFunctionExpression(list.params, body, expression))
+
+                self.context.strict = previousStrict
+                self.context.allowStrictDirective = previousAllowStrictDirective
+                self.context.allowYield = previousAllowYield
+                self.context.allowAwait = previousAwait
+        else:
+            if self.matchAssign():
+                if not self.context.isAssignmentTarget:
+                    self.tolerateError(Messages.InvalidLHSInAssignment)
+
+                if self.context.strict and expr.type is Syntax.Identifier:
+                    id = expr
+                    if self.scanner.isRestrictedWord(id.name):
+                        self.tolerateUnexpectedToken(token, Messages.StrictLHSAssignment)
+                    if self.scanner.isStrictModeReservedWord(id.name):
+                        self.tolerateUnexpectedToken(token, Messages.StrictReservedWord)
+
+                if not self.match('='):
+                    self.context.isAssignmentTarget = False
+                    self.context.isBindingElement = False
+                else:
+                    self.reinterpretExpressionAsPattern(expr)
 
-                    token = self.nextToken()
-                    operator = token.value
-                    right = self.isolateCoverGrammar(self.parseAssignmentExpression)
-                    expr = self.finalize(self.startNode(startToken), Node.AssignmentExpression(operator, expr, right))
-                    self.context.firstCoverInitializedNameError = None
+                token = self.nextToken()
+                operator = token.value
+                right = self.isolateCoverGrammar(self.parseAssignmentExpression)
+                expr = self.finalize(self.startNode(startToken), Node.AssignmentExpression(operator, expr, right))
+                self.context.firstCoverInitializedNameError = None
 
         return expr
 
@@ -1643,7 +1929,13 @@ class Parser(object):
 
     # https://tc39.github.io/ecma262/#sec-block
 
-    def parseStatementListItem(self):
+    # parseStatementListItem is parseStatementOrDeclaration, or with the
+    # `recover` option, this.
+
+    def recoverStatementListItem(self):
+        return self.recoverFrom(self.parseStatementOrDeclaration, False)
+
+    def parseStatementOrDeclaration(self):
         self.context.isAssignmentTarget = True
         self.context.isBindingElement = True
         if self.lookahead.type is Token.Keyword:
@@ -1678,15 +1970,122 @@ class Parser(object):
         node = self.createNode()
 
         self.expect('{')
+        self.enterNesting()
         block = []
         while True:
             if self.match('}'):
                 break
             block.append(self.parseStatementListItem())
         self.expect('}')
+        self.context.nesting -= 1
 
         return self.finalize(node, Node.BlockStatement(block))
 
+    # With the `recover` option, a statement or a class member that fails to
+    # parse is recorded in the errors and replaced with an ErrorNode spanning
+    # the tokens skipped up to the next boundary: a ';', a new line past the
+    # token in error or starting with a statement keyword (any new line, for
+    # class members) outside of brackets, or the '}' closing the enclosing
+    # block. Errors at the end of
+    # the input unwind to the top-level statement. Skipping starts over at the
+    # token in error, which is often consumed already, unless tokens or
+    # comments are collected.
+
+    def recoverFrom(self, parse, member):
+        startToken = self.lookahead
+        node = self.createNode()
+        context = dict(self.context.__dict__)
+        labels = dict(self.context.labelSet)
+        self.recoveryDepth += 1
+        try:
+            return parse()
+        except Error as error:
+            if self.recoveryDepth > 1 and self.lookahead.type is Token.EOF:
+                raise
+            self.errorHandler.recordError(error)
+            self.context.__dict__.update(context)
+            self.context.labelSet.clear()
+            self.context.labelSet.update(labels)
+            index = error.index
+            # Errors of the scanner are placed where it failed, which may be
+            # well past the start of what did not scan.
+            for start, scanError in self.scanErrors.items():
+                if scanError is error:
+                    index = start
+                    break
+            if (index is not None and startToken.start <= index < self.lookahead.start and
+                    not (self.config.tokens or self.config.comment)):
+                self.resume(index)
+                position = self.scanner.lines.position(index)
+                self.lastMarker = Marker(index=index, line=position.line, column=position.column)
+            self.skipToBoundary(startToken, member, index)
+            return self.finalize(node, Node.ErrorNode(error.message))
+        finally:
+            self.recoveryDepth -= 1
+
+    def skipToBoundary(self, startToken, member, index):
+        if self.lookahead.start == startToken.start:
+            self.nextToken()
+        depth = 0
+        while self.lookahead.type is not Token.EOF:
+            token = self.lookahead
+            if depth == 0 and self.hasLineTerminator and (
+                    member or index is None or token.start > index or
+                    token.type is Token.Keyword and token.value in STATEMENT_KEYWORDS):
+                break
+            if token.type is Token.Punctuator:
+                value = token.value
+                if value in ('(', '[', '{'):
+                    depth += 1
+                elif value in (')', ']', '}'):
+                    if depth:
+                        depth -= 1
+                    elif value == '}':
+                        break
+                elif value == ';' and depth == 0:
+                    self.nextToken()
+                    break
+            self.nextToken()
+
+    # With the `recover` option, what does not scan is skipped up to where a
+    # token scans again, and taken as a token of no type, which fails the
+    # statement it is found in with the error of the scanner.
+
+    def recoverLex(self):
+        scanner = self.scanner
+        start = scanner.index
+        lineNumber = scanner.lineNumber
+        lineStart = scanner.lineStart
+        curlyStack = list(scanner.curlyStack)
+        try:
+            return scanner.lex()
+        except Error as error:
+            self.scanErrors[start] = error
+        # The character at start is not a blank, so it is on the same line.
+        state = ScannerState(index=start + 1, lineNumber=lineNumber, lineStart=lineStart)
+        while True:
+            scanner.restoreState(state)
+            scanner.curlyStack = list(curlyStack)
+            scanner.scanComments()
+            if scanner.eof():
+                break
+            skipped = ScannerState(index=scanner.index + 1, lineNumber=scanner.lineNumber, lineStart=scanner.lineStart)
+            try:
+                scanner.lex()
+                break
+            except Error:
+                state = skipped
+        scanner.restoreState(state)
+        scanner.curlyStack = curlyStack
+        return RawToken(
+            type=None,
+            value=scanner.source[start:state.index],
+            lineNumber=lineNumber,
+            lineStart=lineStart,
+            start=start,
+            end=state.index
+        )
+
     # https://tc39.github.io/ecma262/#sec-let-and-const-declarations
 
     def parseLexicalBinding(self, kind, options):
@@ -2469,37 +2868,7 @@ class Parser(object):
                 statement = self.parseLabelledStatement()
 
         elif typ is Token.Keyword:
-            value = self.lookahead.value
-            if value == 'break':
-                statement = self.parseBreakStatement()
-            elif value == 'continue':
-                statement = self.parseContinueStatement()
-            elif value == 'debugger':
-                statement = self.parseDebuggerStatement()
-            elif value == 'do':
-                statement = self.parseDoWhileStatement()
-            elif value == 'for':
-                statement = self.parseForStatement()
-            elif value == 'function':
-                statement = self.parseFunctionDeclaration()
-            elif value == 'if':
-                statement = self.parseIfStatement()
-            elif value == 'return':
-                statement = self.parseReturnStatement()
-            elif value == 'switch':
-                statement = self.parseSwitchStatement()
-            elif value == 'throw':
-                statement = self.parseThrowStatement()
-            elif value == 'try':
-                statement = self.parseTryStatement()
-            elif value == 'var':
-                statement = self.parseVariableStatement()
-            elif value == 'while':
-                statement = self.parseWhileStatement()
-            elif value == 'with':
-                statement = self.parseWithStatement()
-            else:
-                statement = self.parseExpressionStatement()
+            statement = getattr(self, STATEMENT_PARSERS.get(self.lookahead.value, 'parseExpressionStatement'))()
 
         else:
             statement = self.throwUnexpectedToken(self.lookahead)
@@ -2508,10 +2877,11 @@ class Parser(object):
 
     # https://tc39.github.io/ecma262/#sec-function-definitions
 
-    def parseFunctionSourceElements(self):
+    def parseFunctionBody(self):
         node = self.createNode()
 
         self.expect('{')
+        self.enterNesting()
         body = self.parseDirectivePrologues()
 
         previousLabelSet = self.context.labelSet
@@ -2530,6 +2900,7 @@ class Parser(object):
             body.append(self.parseStatementListItem())
 
         self.expect('}')
+        self.context.nesting -= 1
 
         self.context.labelSet = previousLabelSet
         self.context.inIteration = previousInIteration
@@ -2538,6 +2909,61 @@ class Parser(object):
 
         return self.finalize(node, Node.BlockStatement(body))
 
+    # With the `lazy` option, function bodies are parsed for their errors and
+    # end, without ranges or locations, and the statements are dropped. They
+    # are parsed again when the placeholder is first read, and the bodies
+    # within, already checked, are then skipped to their recorded end.
+
+    def skipFunctionBody(self):
+        token = self.lookahead
+        start = token.start
+        context = self.context
+        state = (
+            context.strict, context.allowStrictDirective, context.allowYield,
+            context.allowAwait, context.allowIn, context.isModule,
+        )
+        end = self.bodyEnds.get(start) if self.bodyChecked else None
+        if end is not None and token.type is Token.Punctuator and token.value == '{':
+            scanner = self.scanner
+            position = scanner.lines.position(end)
+            scanner.restoreState(ScannerState(index=end, lineNumber=position.line, lineStart=end - position.column))
+            if scanner.curlyStack:
+                scanner.curlyStack.pop()
+            self.lookahead = RawToken(
+                type=Token.Punctuator,
+                value='}',
+                lineNumber=position.line,
+                lineStart=end - position.column,
+                start=end - 1,
+                end=end
+            )
+            self.nextToken()
+        else:
+            config = self.config
+            trackRange = config.range
+            trackLoc = config.loc
+            config.range = config.loc = False
+            try:
+                self.parseFunctionBody()
+            finally:
+                config.range = trackRange
+                config.loc = trackLoc
+            end = self.bodyEnds[start] = self.lastMarker.index
+        return LazyFunctionBody(self.__class__, self.scanner.lines, self.options, (start, end), state, self.bodyEnds)
+
+    def parseLazyFunctionBody(self, lines, range, context, ends):
+        (self.context.strict, self.context.allowStrictDirective, self.context.allowYield,
+         self.context.allowAwait, self.context.allowIn, self.context.isModule) = context
+        self.scanner.isModule = self.context.isModule
+        self.scanner.lines = lines
+        self.bodyEnds = ends
+        self.bodyChecked = True
+        self.resume(range[0])
+        body = self.guardDepth(self.parseFunctionBody)
+        if self.lastMarker.index != range[1]:
+            self.throwError(Messages.UnexpectedToken, self.lookahead.value)
+        return body
+
     def validateParam(self, options, param, name):
         key = '$' + name
         if self.context.strict:
@@ -2769,7 +3195,7 @@ class Parser(object):
             if token.type is not Token.StringLiteral:
                 break
 
-            statement = self.parseDirective()
+            statement = self.recoverFrom(self.parseDirective, False) if self.recover else self.parseDirective()
             body.append(statement)
             directive = statement.directive
             if not isinstance(directive, basestring):
@@ -3000,6 +3426,8 @@ class Parser(object):
         while not self.match('}'):
             if self.match(';'):
                 self.nextToken()
+            elif self.recover:
+                body.append(self.recoverFrom(lambda: self.parseClassElement(hasConstructor), True))
             else:
                 body.append(self.parseClassElement(hasConstructor))
         self.expect('}')
@@ -3058,17 +3486,171 @@ class Parser(object):
             self.context.allowAwait = True
             
         node = self.createNode()
-        body = self.parseDirectivePrologues()
-        while self.lookahead.type is not Token.EOF:
-            body.append(self.parseStatementListItem())
-        return self.finalize(node, Node.Module(body))
+        body = self.guardDepth(self.parseProgramBody)
+        return self.runDelegate(self.finalize(node, Node.Module(body)))
 
     def parseScript(self):
         node = self.createNode()
+        body = self.guardDepth(self.parseProgramBody)
+        return self.runDelegate(self.finalize(node, Node.Script(body)))
+
+    def parseProgramBody(self):
         body = self.parseDirectivePrologues()
         while self.lookahead.type is not Token.EOF:
             body.append(self.parseStatementListItem())
-        return self.finalize(node, Node.Script(body))
+        return body
+
+    # A single expression running to the end of the input.
+
+    def parseStandaloneExpression(self):
+        if self.config.sourceType == 'module':
+            self.context.strict = True
+            self.context.isModule = True
+            self.scanner.isModule = True
+            if self.config.ecmaVersion >= 2022:
+                self.context.allowAwait = True
+
+        expr = self.guardDepth(lambda: self.isolateCoverGrammar(self.parseExpression))
+        if self.lookahead.type is not Token.EOF:
+            self.throwUnexpectedToken(self.lookahead)
+        return self.runDelegate(expr)
+
+    # Groups, argument lists, blocks and function bodies nest at most
+    # maxNestingDepth deep, which the default recursion limit of Python
+    # allows for. Other constructs nested deeper than the Python stack allows
+    # are reported the same way, at the point reached, rather than as a
+    # RecursionError. RecursionErrors raised in callbacks are passed on.
+
+    def enterNesting(self):
+        self.context.nesting += 1
+        if self.context.nesting > self.maxNestingDepth:
+            self.throwError(Messages.NestingTooDeep)
+
+    def guardDepth(self, parse):
+        try:
+            return parse()
+        except RecursionError:
+            traceback = sys.exc_info()[2]
+            while traceback is not None:
+                if traceback.tb_frame.f_globals.get('__name__', '').split('.')[0] != __name__.split('.')[0]:
+                    raise
+                traceback = traceback.tb_next
+        self.pending = None
+        self.throwError(Messages.NestingTooDeep)
+
+    def runDelegate(self, program):
+        delegated = self.delegated
+        if delegated:
+            self.delegated = []
+            delegate = self.delegate
+            for node, metadata in delegated:
+                delegate(node, metadata)
+        return program
+
+    # Incremental reparsing, after an edit that replaced previous[start:oldEnd]
+    # with what is now source[start:newEnd]. Parsing resumes at the end of the
+    # top-level statement before the last one ending ahead of the edit, since
+    # that one may now extend further without automatic semicolon insertion,
+    # and stops as soon as a statement starts past the edit where an old one
+    # started. The statements that follow are reused, moved in place.
+
+    def reparseProgram(self, previous, start, oldEnd, newEnd):
+        isModule = previous.sourceType == 'module'
+        body = previous.body
+        ends = [statement.range[1] for statement in body] if self.config.range and previous.range else None
+        prologue = 0
+        while prologue < len(body) and body[prologue].directive is not None:
+            prologue += 1
+
+        k = bisect_left(ends, start) - 1 if ends else -1
+        if k <= prologue or self.delegate or self.config.tokens or self.config.comment or self.config.tolerant:
+            return self.parseModule() if isModule else self.parseScript()
+
+        if isModule:
+            self.context.isModule = True
+            self.scanner.isModule = True
+            self.context.allowAwait = self.config.ecmaVersion >= 2022
+        self.context.strict = isModule or any(statement.directive == 'use strict' for statement in body[:prologue])
+        self.resume(ends[k - 1])
+
+        delta = newEnd - oldEnd
+        starts = [statement.range[0] for statement in body]
+        statements = body[:k]
+        j = k
+        while self.lookahead.type is not Token.EOF:
+            index = self.lookahead.start
+            if index >= newEnd:
+                j = bisect_left(starts, index - delta, j)
+                if j < len(body) and starts[j] == index - delta:
+                    reused = body[j:]
+                    self.moveNodes(reused, delta)
+                    statements.extend(reused)
+                    self.lastMarker.index = previous.range[1] + delta
+                    break
+            statements.append(self.guardDepth(self.parseStatementListItem))
+
+        node = Marker(index=previous.range[0])
+        return self.finalize(node, Node.Module(statements) if isModule else Node.Script(statements))
+
+    # Restarts scanning at `index`, which must be a statement boundary.
+    def resume(self, index):
+        position = self.scanner.lines.position(index)
+        lineStart = index - position.column
+        self.scanner.restoreState(ScannerState(index=index, lineNumber=position.line, lineStart=lineStart))
+        self.lookahead = RawToken(
+            type=Token.EOF,
+            value='',
+            lineNumber=position.line,
+            lineStart=lineStart,
+            start=index,
+            end=index
+        )
+        self.startMarker = Marker(index=index, line=position.line, column=position.column)
+        self.lastMarker = Marker(index=index, line=position.line, column=position.column)
+        self.nextToken()
+        self.lastMarker = Marker(
+            index=self.scanner.index,
+            line=self.scanner.lineNumber,
+            column=self.scanner.index - self.scanner.lineStart
+        )
+
+    def moveNodes(self, nodes, delta):
+        trackLoc = self.config.loc
+        if not delta and not trackLoc:
+            return
+        lines = self.scanner.lines
+        source = self.config.source or None
+        seen = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            range = node.range
+            if range is not None:
+                range[0] += delta
+                range[1] += delta
+                if trackLoc:
+                    loc = node.loc
+                    if type(loc) is LazySourceLocation:
+                        object.__setattr__(loc, '_lazy', (lines, range[0], range[1], source, None))
+                    else:
+                        node.loc = LazySourceLocation(lines, range[0], range[1], source)
+            for key, value in node.items():
+                # Reading the class of a LazySourceLocation would resolve it.
+                if key == 'loc':
+                    continue
+                if type(value) is LazyFunctionBody:
+                    # The bodies within are looked up in the ends of this
+                    # parse, where they are missing, and so parsed again.
+                    parser, _, options, range, context, ends = object.__getattribute__(value, 'body')
+                    object.__setattr__(value, 'body', (
+                        parser, lines, options, (range[0] + delta, range[1] + delta), context, self.bodyEnds))
+                elif isinstance(value, Node.Node):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(v for v in value if isinstance(v, Node.Node))
 
     # https://tc39.github.io/ecma262/#sec-imports
 
@@ -3225,11 +3807,7 @@ class Parser(object):
                 self.throwError('Import assertion/attribute value must be a string literal')
             value = self.parsePrimaryExpression()
             
-            # Create an object property-like structure
-            attr = Object()
-            attr.key = key
-            attr.value = value
-            attributes.append(attr)
+            attributes.append(Node.ImportAttribute(key, value))
         
         self.expect('}')
         return attributes
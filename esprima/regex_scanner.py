@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Copyright JS Foundation and other contributors, https://js.foundation/
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL <COPYRIGHT HOLDER> BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, unicode_literals
+
+import re
+
+from .scanner import RawToken, Scanner
+from .token import Token
+
+
+# Whitespace, line terminators and complete comments. Anything else, such as
+# HTML-like comments or an unterminated block comment, is left to
+# Scanner.scanComments.
+TRIVIA = re.compile(r'''(?:
+    [\t\x0B\x0C\x20\xA0\u1680\u180E\u2000-\u200A\u202F\u205F\u3000\uFEFF]+ |
+    \r\n | [\n\r\u2028\u2029] |
+    //[^\n\r\u2028\u2029]* |
+    /\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+)*''', re.X)
+
+PUNCTUATORS = (
+    '>>>=',
+    '...', '===', '!==', '>>>', '<<=', '>>=', '**=',
+    '==', '!=', '+=', '-=', '*=', '/=', '++', '--', '<<', '>>',
+    '^=', '%=', '<=', '>=', '=>', '**', '&&', '||', '&=', '|=',
+    '(', ')', '{', '}', '[', ']', ';', ',', ':', '~', '?', '.',
+    '<', '>', '=', '!', '+', '-', '*', '%', '^', '/', '&', '|',
+)
+PUNCTUATORS_2020 = ('??', '?.')
+PUNCTUATORS_2021 = ('??=', '&&=', '||=')
+
+
+def tokenPattern(ecmaVersion):
+    punctuators = PUNCTUATORS
+    if ecmaVersion >= 2020:
+        punctuators += PUNCTUATORS_2020
+    if ecmaVersion >= 2021:
+        punctuators += PUNCTUATORS_2021
+    punctuators = sorted(punctuators, key=len, reverse=True)
+    # '?.' followed by a digit is a conditional followed by a number.
+    punctuator = '|'.join(r'\?\.(?![0-9])' if p == '?.' else re.escape(p) for p in punctuators)
+    return re.compile(r'''
+        (?P<Identifier>[A-Za-z$_][A-Za-z0-9$_]*)(?![\\\x80-\U0010FFFF]) |
+        (?P<NumericLiteral>
+            (?:0|[1-9][0-9]*)(?:\.[0-9]*)?(?:[eE][+-]?[0-9]+)? |
+            \.[0-9]+(?:[eE][+-]?[0-9]+)?
+        )(?![A-Za-z0-9$_\\.\x80-\U0010FFFF]) |
+        (?P<StringLiteral>'[^'\\\n\r\u2028\u2029]*'|"[^"\\\n\r\u2028\u2029]*") |
+        (?P<Punctuator>%s)
+    ''' % punctuator, re.X)
+
+
+class RegexScanner(Scanner):
+    """
+    Scanner driven by a single precompiled regular expression. Common
+    identifiers, numbers, strings, punctuators and trivia are matched by the
+    C regex engine; escapes, non-ASCII identifiers, templates, regular
+    expressions and errors go through the character by character Scanner,
+    so both produce identical tokens.
+    """
+
+    patterns = {}
+
+    def __init__(self, code, handler, ecmaVersion=2024):
+        super(RegexScanner, self).__init__(code, handler, ecmaVersion)
+        tier = 2021 if ecmaVersion >= 2021 else 2020 if ecmaVersion >= 2020 else 0
+        pattern = self.patterns.get(tier)
+        if pattern is None:
+            pattern = self.patterns[tier] = tokenPattern(tier)
+        self.pattern = pattern
+
+    def isCommentStart(self, index):
+        # HTML-like comments and unterminated block comments are not matched
+        # by TRIVIA.
+        source = self.source
+        ch = source[index:index + 1]
+        if ch == '-':
+            return source.startswith('-->', index)
+        if ch == '<':
+            return source.startswith('<!--', index)
+        return source.startswith('/*', index)
+
+    def scanComments(self):
+        if self.trackComment:
+            return super(RegexScanner, self).scanComments()
+
+        index = self.index
+        end = TRIVIA.match(self.source, index, self.length).end()
+        if self.isCommentStart(end):
+            return super(RegexScanner, self).scanComments()
+
+        if end != index:
+            self.advanceLines(index, end)
+            self.index = end
+        return []
+
+    def lex(self):
+        index = self.index
+        m = self.pattern.match(self.source, index, self.length)
+        if m is None or index == 0:
+            # index 0 may hold a hashbang.
+            return super(RegexScanner, self).lex()
+
+        kind = m.lastgroup
+        value = m.group()
+        end = m.end()
+
+        if kind == 'Punctuator':
+            if value == '{':
+                self.curlyStack.append('{')
+            elif value == '}':
+                if self.curlyStack:
+                    if self.curlyStack[-1] == '${':
+                        return super(RegexScanner, self).lex()
+                    self.curlyStack.pop()
+            type = Token.Punctuator
+
+        elif kind == 'Identifier':
+            if len(value) == 1:
+                type = Token.Identifier
+            elif self.isKeyword(value):
+                type = Token.Keyword
+            elif value == 'null':
+                type = Token.NullLiteral
+            elif value == 'true' or value == 'false':
+                type = Token.BooleanLiteral
+            else:
+                type = Token.Identifier
+
+        elif kind == 'NumericLiteral':
+            type = Token.NumericLiteral
+            value = float(value)
+            value = int(value) if value.is_integer() else value
+
+        else:
+            self.index = end
+            return RawToken(
+                type=Token.StringLiteral,
+                value=value[1:-1],
+                lineNumber=self.lineNumber,
+                lineStart=self.lineStart,
+                start=index,
+                end=end
+            )
+
+        self.index = end
+        return RawToken(
+            type=type,
+            value=value,
+            lineNumber=self.lineNumber,
+            lineStart=self.lineStart,
+            start=index,
+            end=end
+        )
@@ -0,0 +1,911 @@
+# -*- coding: utf-8 -*-
+# Copyright JS Foundation and other contributors, https://js.foundation/
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#   * Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#   * Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL <COPYRIGHT HOLDER> BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, unicode_literals
+
+from .character import Character
+from .compat import RecursionError, uchr
+
+# https://tc39.es/ecma262/2024/#sec-regexp-regular-expression-objects
+#
+# Validates the pattern and flags of a regular expression literal in a single
+# pass, following the ECMAScript 2024 grammar, with the Annex B extensions
+# when neither the u nor the v flag is given.
+#
+# With `ast`, validate() returns a tree of tuples, each starting with its
+# type and source range:
+#
+#   ('Disjunction', start, end, [alternatives])
+#   ('Alternative', start, end, [terms])
+#   ('Assertion', start, end, kind, disjunction)  kind is '^', '$', '\\b',
+#       '\\B' (with no disjunction), 'lookahead', 'negativeLookahead',
+#       'lookbehind' or 'negativeLookbehind'
+#   ('Quantifier', start, end, min, max, greedy, atom)  max is None if unbounded
+#   ('Group', start, end, index, name, disjunction)  index is None if not capturing
+#   ('Backreference', start, end, ref)  ref is a group number or name
+#   ('Dot', start, end)
+#   ('Character', start, end, codePoint)
+#   ('CharacterSet', start, end, kind)  kind is one of 'dDsSwW'
+#   ('Property', start, end, negate, name, value)
+#   ('CharacterClass', start, end, negate, kind, [items])  kind is
+#       'ClassUnion', 'ClassIntersection' or 'ClassSubtraction'
+#   ('ClassRange', start, end, min, max)
+#   ('ClassStrings', start, end, [strings])
+
+FLAGS = frozenset('dgimsuvy')
+SYNTAX_CHARACTERS = frozenset('^$\\.*+?()[]{}|')
+DECIMAL_DIGITS = frozenset('0123456789')
+OCTAL_DIGITS = frozenset('01234567')
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+ASCII_LETTERS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+PROPERTY_CHARACTERS = ASCII_LETTERS | DECIMAL_DIGITS | frozenset('_')
+CONTROL_ESCAPES = {'f': 0x0C, 'n': 0x0A, 'r': 0x0D, 't': 0x09, 'v': 0x0B}
+CLASS_ESCAPES = frozenset('dDsSwW')
+LOOKAROUNDS = (
+    ('(?=', 'lookahead'),
+    ('(?!', 'negativeLookahead'),
+    ('(?<=', 'lookbehind'),
+    ('(?<!', 'negativeLookbehind'),
+)
+
+# With the v flag.
+CLASS_SET_SYNTAX_CHARACTERS = frozenset('()[]{}/-\\|')
+CLASS_SET_RESERVED_DOUBLE_PUNCTUATORS = frozenset('&!#$%*+,.:;<=>?@^`~')
+CLASS_SET_RESERVED_PUNCTUATORS = frozenset('&-!#%,:;<=>@`~')
+
+# https://tc39.es/ecma262/2024/#table-binary-unicode-properties
+BINARY_PROPERTIES = frozenset((
+    'ASCII', 'ASCII_Hex_Digit', 'AHex', 'Alphabetic', 'Alpha', 'Any',
+    'Assigned', 'Bidi_Control', 'Bidi_C', 'Bidi_Mirrored', 'Bidi_M',
+    'Case_Ignorable', 'CI', 'Cased', 'Changes_When_Casefolded', 'CWCF',
+    'Changes_When_Casemapped', 'CWCM', 'Changes_When_Lowercased', 'CWL',
+    'Changes_When_NFKC_Casefolded', 'CWKCF', 'Changes_When_Titlecased', 'CWT',
+    'Changes_When_Uppercased', 'CWU', 'Dash', 'Default_Ignorable_Code_Point',
+    'DI', 'Deprecated', 'Dep', 'Diacritic', 'Dia', 'Emoji', 'Emoji_Component',
+    'EComp', 'Emoji_Modifier', 'EMod', 'Emoji_Modifier_Base', 'EBase',
+    'Emoji_Presentation', 'EPres', 'Extended_Pictographic', 'ExtPict',
+    'Extender', 'Ext', 'Grapheme_Base', 'Gr_Base', 'Grapheme_Extend',
+    'Gr_Ext', 'Hex_Digit', 'Hex', 'IDS_Binary_Operator', 'IDSB',
+    'IDS_Trinary_Operator', 'IDST', 'ID_Continue', 'IDC', 'ID_Start', 'IDS',
+    'Ideographic', 'Ideo', 'Join_Control', 'Join_C', 'Logical_Order_Exception',
+    'LOE', 'Lowercase', 'Lower', 'Math', 'Noncharacter_Code_Point', 'NChar',
+    'Pattern_Syntax', 'Pat_Syn', 'Pattern_White_Space', 'Pat_WS',
+    'Quotation_Mark', 'QMark', 'Radical', 'Regional_Indicator', 'RI',
+    'Sentence_Terminal', 'STerm', 'Soft_Dotted', 'SD', 'Terminal_Punctuation',
+    'Term', 'Unified_Ideograph', 'UIdeo', 'Uppercase', 'Upper',
+    'Variation_Selector', 'VS', 'White_Space', 'space', 'XID_Continue', 'XIDC',
+    'XID_Start', 'XIDS',
+))
+
+# https://tc39.es/ecma262/2024/#table-binary-unicode-properties-of-strings
+STRING_PROPERTIES = frozenset((
+    'Basic_Emoji', 'Emoji_Keycap_Sequence', 'RGI_Emoji_Modifier_Sequence',
+    'RGI_Emoji_Flag_Sequence', 'RGI_Emoji_Tag_Sequence',
+    'RGI_Emoji_ZWJ_Sequence', 'RGI_Emoji',
+))
+
+GENERAL_CATEGORY_NAMES = frozenset(('General_Category', 'gc'))
+SCRIPT_NAMES = frozenset(('Script', 'sc', 'Script_Extensions', 'scx'))
+
+# https://unicode.org/Public/UCD/latest/ucd/PropertyValueAliases.txt
+GENERAL_CATEGORY_VALUES = frozenset((
+    'Cased_Letter', 'LC', 'Close_Punctuation', 'Pe', 'Connector_Punctuation',
+    'Pc', 'Control', 'Cc', 'cntrl', 'Currency_Symbol', 'Sc',
+    'Dash_Punctuation', 'Pd', 'Decimal_Number', 'Nd', 'digit', 'Enclosing_Mark',
+    'Me', 'Final_Punctuation', 'Pf', 'Format', 'Cf', 'Initial_Punctuation',
+    'Pi', 'Letter', 'L', 'Letter_Number', 'Nl', 'Line_Separator', 'Zl',
+    'Lowercase_Letter', 'Ll', 'Mark', 'M', 'Combining_Mark', 'Math_Symbol',
+    'Sm', 'Modifier_Letter', 'Lm', 'Modifier_Symbol', 'Sk', 'Nonspacing_Mark',
+    'Mn', 'Number', 'N', 'Open_Punctuation', 'Ps', 'Other', 'C', 'Other_Letter',
+    'Lo', 'Other_Number', 'No', 'Other_Punctuation', 'Po', 'Other_Symbol', 'So',
+    'Paragraph_Separator', 'Zp', 'Private_Use', 'Co', 'Punctuation', 'P',
+    'punct', 'Separator', 'Z', 'Space_Separator', 'Zs', 'Spacing_Mark', 'Mc',
+    'Surrogate', 'Cs', 'Symbol', 'S', 'Titlecase_Letter', 'Lt', 'Unassigned',
+    'Cn', 'Uppercase_Letter', 'Lu',
+))
+
+SCRIPT_VALUES = frozenset((
+    'Adlam', 'Adlm', 'Ahom', 'Anatolian_Hieroglyphs', 'Hluw', 'Arabic', 'Arab',
+    'Armenian', 'Armn', 'Avestan', 'Avst', 'Balinese', 'Bali', 'Bamum', 'Bamu',
+    'Bassa_Vah', 'Bass', 'Batak', 'Batk', 'Bengali', 'Beng', 'Bhaiksuki',
+    'Bhks', 'Bopomofo', 'Bopo', 'Brahmi', 'Brah', 'Braille', 'Brai',
+    'Buginese', 'Bugi', 'Buhid', 'Buhd', 'Canadian_Aboriginal', 'Cans',
+    'Carian', 'Cari', 'Caucasian_Albanian', 'Aghb', 'Chakma', 'Cakm', 'Cham',
+    'Cherokee', 'Cher', 'Chorasmian', 'Chrs', 'Common', 'Zyyy', 'Coptic',
+    'Copt', 'Qaac', 'Cuneiform', 'Xsux', 'Cypriot', 'Cprt', 'Cypro_Minoan',
+    'Cpmn', 'Cyrillic', 'Cyrl', 'Deseret', 'Dsrt', 'Devanagari', 'Deva',
+    'Dives_Akuru', 'Diak', 'Dogra', 'Dogr', 'Duployan', 'Dupl',
+    'Egyptian_Hieroglyphs', 'Egyp', 'Elbasan', 'Elba', 'Elymaic', 'Elym',
+    'Ethiopic', 'Ethi', 'Georgian', 'Geor', 'Glagolitic', 'Glag', 'Gothic',
+    'Goth', 'Grantha', 'Gran', 'Greek', 'Grek', 'Gujarati', 'Gujr',
+    'Gunjala_Gondi', 'Gong', 'Gurmukhi', 'Guru', 'Han', 'Hani', 'Hangul',
+    'Hang', 'Hanifi_Rohingya', 'Rohg', 'Hanunoo', 'Hano', 'Hatran', 'Hatr',
+    'Hebrew', 'Hebr', 'Hiragana', 'Hira', 'Imperial_Aramaic', 'Armi',
+    'Inherited', 'Zinh', 'Qaai', 'Inscriptional_Pahlavi', 'Phli',
+    'Inscriptional_Parthian', 'Prti', 'Javanese', 'Java', 'Kaithi', 'Kthi',
+    'Kannada', 'Knda', 'Katakana', 'Kana', 'Kawi', 'Kayah_Li', 'Kali',
+    'Kharoshthi', 'Khar', 'Khitan_Small_Script', 'Kits', 'Khmer', 'Khmr',
+    'Khojki', 'Khoj', 'Khudawadi', 'Sind', 'Lao', 'Laoo', 'Latin', 'Latn',
+    'Lepcha', 'Lepc', 'Limbu', 'Limb', 'Linear_A', 'Lina', 'Linear_B', 'Linb',
+    'Lisu', 'Lycian', 'Lyci', 'Lydian', 'Lydi', 'Mahajani', 'Mahj', 'Makasar',
+    'Maka', 'Malayalam', 'Mlym', 'Mandaic', 'Mand', 'Manichaean', 'Mani',
+    'Marchen', 'Marc', 'Masaram_Gondi', 'Gonm', 'Medefaidrin', 'Medf',
+    'Meetei_Mayek', 'Mtei', 'Mende_Kikakui', 'Mend', 'Meroitic_Cursive',
+    'Merc', 'Meroitic_Hieroglyphs', 'Mero', 'Miao', 'Plrd', 'Modi', 'Mongolian',
+    'Mong', 'Mro', 'Mroo', 'Multani', 'Mult', 'Myanmar', 'Mymr', 'Nabataean',
+    'Nbat', 'Nag_Mundari', 'Nagm', 'Nandinagari', 'Nand', 'New_Tai_Lue',
+    'Talu', 'Newa', 'Nko', 'Nkoo', 'Nushu', 'Nshu', 'Nyiakeng_Puachue_Hmong',
+    'Hmnp', 'Ogham', 'Ogam', 'Ol_Chiki', 'Olck', 'Old_Hungarian', 'Hung',
+    'Old_Italic', 'Ital', 'Old_North_Arabian', 'Narb', 'Old_Permic', 'Perm',
+    'Old_Persian', 'Xpeo', 'Old_Sogdian', 'Sogo', 'Old_South_Arabian', 'Sarb',
+    'Old_Turkic', 'Orkh', 'Old_Uyghur', 'Ougr', 'Oriya', 'Orya', 'Osage',
+    'Osge', 'Osmanya', 'Osma', 'Pahawh_Hmong', 'Hmng', 'Palmyrene', 'Palm',
+    'Pau_Cin_Hau', 'Pauc', 'Phags_Pa', 'Phag', 'Phoenician', 'Phnx',
+    'Psalter_Pahlavi', 'Phlp', 'Rejang', 'Rjng', 'Runic', 'Runr', 'Samaritan',
+    'Samr', 'Saurashtra', 'Saur', 'Sharada', 'Shrd', 'Shavian', 'Shaw',
+    'Siddham', 'Sidd', 'SignWriting', 'Sgnw', 'Sinhala', 'Sinh', 'Sogdian',
+    'Sogd', 'Sora_Sompeng', 'Sora', 'Soyombo', 'Soyo', 'Sundanese', 'Sund',
+    'Syloti_Nagri', 'Sylo', 'Syriac', 'Syrc', 'Tagalog', 'Tglg', 'Tagbanwa',
+    'Tagb', 'Tai_Le', 'Tale', 'Tai_Tham', 'Lana', 'Tai_Viet', 'Tavt', 'Takri',
+    'Takr', 'Tamil', 'Taml', 'Tangsa', 'Tnsa', 'Tangut', 'Tang', 'Telugu',
+    'Telu', 'Thaana', 'Thaa', 'Thai', 'Tibetan', 'Tibt', 'Tifinagh', 'Tfng',
+    'Tirhuta', 'Tirh', 'Toto', 'Ugaritic', 'Ugar', 'Vai', 'Vaii', 'Vithkuqi',
+    'Vith', 'Wancho', 'Wcho', 'Warang_Citi', 'Wara', 'Yezidi', 'Yezi', 'Yi',
+    'Yiii', 'Zanabazar_Square', 'Zanb', 'Unknown', 'Zzzz',
+))
+
+
+class RegExpError(Exception):
+    def __init__(self, message, index):
+        super(RegExpError, self).__init__(message)
+        self.message = message
+        self.index = index
+
+
+class RegExpValidator(object):
+    def __init__(self, pattern, flags='', ast=False):
+        self.source = pattern
+        self.length = len(pattern)
+        self.flags = flags
+        self.unicodeMode = 'u' in flags or 'v' in flags
+        self.unicodeSets = 'v' in flags
+        self.ast = ast
+
+        self.index = 0
+        self.groupCount = 0
+        self.groupIndex = 0
+        self.namedGroups = False
+        self.groupNames = set()
+        self.references = []
+
+    def raiseError(self, message, index=None):
+        raise RegExpError(message, self.index if index is None else index)
+
+    def node(self, *args):
+        return args if self.ast else None
+
+    def peek(self, offset=0):
+        return self.source[self.index + offset:self.index + offset + 1]
+
+    def eat(self, s):
+        if self.source.startswith(s, self.index):
+            self.index += len(s)
+            return True
+        return False
+
+    def codePointAt(self, i, unicodeMode):
+        # Returns the code point at i and its length, joining surrogate pairs
+        # in unicode mode.
+        cp = ord(self.source[i])
+        if unicodeMode and 0xD800 <= cp <= 0xDBFF and i + 1 < self.length:
+            low = ord(self.source[i + 1])
+            if 0xDC00 <= low <= 0xDFFF:
+                return (cp - 0xD800) * 0x400 + low - 0xDC00 + 0x10000, 2
+        return cp, 1
+
+    def validate(self):
+        seen = set()
+        for ch in self.flags:
+            if ch not in FLAGS or ch in seen:
+                self.raiseError('Invalid flags', self.length)
+            seen.add(ch)
+        if 'u' in seen and 'v' in seen:
+            self.raiseError('Invalid flags', self.length)
+
+        self.scanGroups()
+        node = self.parseDisjunction()
+        if self.index < self.length:
+            # Only an unmatched ')' ends the top level disjunction early.
+            self.raiseError("Unmatched ')'")
+
+        for name, index in self.references:
+            if name not in self.groupNames:
+                self.raiseError('Invalid named capture referenced', index)
+
+        return node
+
+    # Counts capturing groups ahead of parsing, as decimal escapes and \k
+    # depend on the groups of the whole pattern.
+    def scanGroups(self):
+        source = self.source
+        length = self.length
+        inClass = 0
+        i = 0
+        while i < length:
+            ch = source[i]
+            if ch == '\\':
+                i += 1
+            elif inClass:
+                if ch == ']':
+                    inClass -= 1
+                elif ch == '[' and self.unicodeSets:
+                    inClass += 1
+            elif ch == '[':
+                inClass = 1
+            elif ch == '(':
+                if not source.startswith('?', i + 1):
+                    self.groupCount += 1
+                elif source.startswith('?<', i + 1) and i + 3 < length and source[i + 3] not in ('=', '!'):
+                    self.groupCount += 1
+                    self.namedGroups = True
+            i += 1
+
+    # https://tc39.es/ecma262/2024/#prod-Disjunction
+    # Groups and lookarounds are kept on a stack rather than parsed
+    # recursively, so that deeply nested ones do not exhaust the Python stack.
+
+    def parseDisjunction(self):
+        source = self.source
+        stack = []
+        start = alternativeStart = self.index
+        alternatives = []
+        terms = []
+        while True:
+            ch = source[self.index] if self.index < self.length else None
+            if ch == '|':
+                alternatives.append(self.node('Alternative', alternativeStart, self.index, terms))
+                self.index += 1
+                alternativeStart = self.index
+                terms = []
+            elif ch is None or ch == ')':
+                alternatives.append(self.node('Alternative', alternativeStart, self.index, terms))
+                disjunction = self.node('Disjunction', start, self.index, alternatives)
+                if not stack:
+                    return disjunction
+                group, start, alternativeStart, alternatives, terms = stack.pop()
+                self.expectGroupEnd(group[0])
+                terms.append(self.closeGroup(group, disjunction))
+            elif ch == '(':
+                stack.append((self.openGroup(), start, alternativeStart, alternatives, terms))
+                start = alternativeStart = self.index
+                alternatives = []
+                terms = []
+            else:
+                terms.append(self.parseTerm())
+
+    def parseTerm(self):
+        start = self.index
+        source = self.source
+        ch = source[start]
+
+        if ch == '^' or ch == '$':
+            self.index += 1
+            return self.node('Assertion', start, self.index, ch, None)
+
+        if ch == '\\' and self.peek(1) in ('b', 'B'):
+            self.index += 2
+            return self.node('Assertion', start, self.index, source[start:self.index], None)
+
+        return self.parseQuantifier(start, self.parseAtom())
+
+    # https://tc39.es/ecma262/2024/#prod-Quantifier
+
+    def parseQuantifier(self, start, atom):
+        ch = self.peek()
+        if ch == '*':
+            min, max = 0, None
+            self.index += 1
+        elif ch == '+':
+            min, max = 1, None
+            self.index += 1
+        elif ch == '?':
+            min, max = 0, 1
+            self.index += 1
+        elif ch == '{':
+            braced = self.parseBracedQuantifier()
+            if braced is None:
+                return atom
+            min, max = braced
+        else:
+            return atom
+
+        greedy = not self.eat('?')
+        return self.node('Quantifier', start, self.index, min, max, greedy, atom)
+
+    def readDigits(self, i):
+        source = self.source
+        start = i
+        while i < self.length and source[i] in DECIMAL_DIGITS:
+            i += 1
+        return (int(source[start:i]) if i > start else None), i
+
+    # Returns (min, max) for a {n}, {n,} or {n,m} quantifier, or None with
+    # the index unchanged.
+    def parseBracedQuantifier(self):
+        start = self.index
+        min, i = self.readDigits(start + 1)
+        if min is None:
+            if self.unicodeMode:
+                self.raiseError('Incomplete quantifier')
+            return None
+
+        max = min
+        if self.source.startswith(',', i):
+            max, i = self.readDigits(i + 1)
+        if not self.source.startswith('}', i):
+            if self.unicodeMode:
+                self.raiseError('Incomplete quantifier')
+            return None
+
+        self.index = i + 1
+        if max is not None and min > max:
+            self.raiseError('numbers out of order in {} quantifier', start)
+        return min, max
+
+    # https://tc39.es/ecma262/2024/#prod-Atom
+
+    def parseAtom(self):
+        start = self.index
+        source = self.source
+        ch = source[start]
+
+        if ch == '.':
+            self.index += 1
+            return self.node('Dot', start, self.index)
+        if ch == '[':
+            return self.parseClass()
+        if ch == '\\':
+            return self.parseAtomEscape()
+        if ch in ('*', '+', '?'):
+            self.raiseError('Nothing to repeat')
+        if ch == '{':
+            if self.unicodeMode or self.parseBracedQuantifier() is not None:
+                self.raiseError('Nothing to repeat', start)
+        elif ch in (']', '}') and self.unicodeMode:
+            self.raiseError('Lone quantifier brackets')
+
+        cp, size = self.codePointAt(start, self.unicodeMode)
+        self.index += size
+        return self.node('Character', start, self.index, cp)
+
+    def expectGroupEnd(self, start):
+        if not self.eat(')'):
+            self.raiseError('Unterminated group', start)
+
+    # Reads the opening of a group or lookaround, and returns its start, its
+    # kind, and the index and name of a capturing group.
+    def openGroup(self):
+        start = self.index
+        source = self.source
+        index = name = None
+        for prefix, kind in LOOKAROUNDS:
+            if source.startswith(prefix, start):
+                self.index += len(prefix)
+                return start, kind, index, name
+        if source.startswith('(?:', start):
+            self.index += 3
+        elif source.startswith('(?<', start):
+            self.index += 3
+            name = self.parseGroupName()
+            if name in self.groupNames:
+                self.raiseError('Duplicate capture group name', start)
+            self.groupNames.add(name)
+            self.groupIndex += 1
+            index = self.groupIndex
+        elif source.startswith('(?', start):
+            self.raiseError('Invalid group')
+        else:
+            self.index += 1
+            self.groupIndex += 1
+            index = self.groupIndex
+        return start, 'group', index, name
+
+    def closeGroup(self, group, disjunction):
+        start, kind, index, name = group
+        if kind == 'group':
+            return self.parseQuantifier(start, self.node('Group', start, self.index, index, name, disjunction))
+        node = self.node('Assertion', start, self.index, kind, disjunction)
+        if not self.unicodeMode and kind in ('lookahead', 'negativeLookahead'):
+            # Annex B: lookaheads can be quantified.
+            return self.parseQuantifier(start, node)
+        return node
+
+    # https://tc39.es/ecma262/2024/#prod-GroupName, after the '<'.
+    def parseGroupName(self):
+        start = self.index
+        source = self.source
+        chars = []
+        while True:
+            if self.index >= self.length:
+                self.raiseError('Invalid capture group name', start)
+            ch = source[self.index]
+            if ch == '>':
+                break
+            if ch == '\\':
+                self.index += 1
+                cp = self.parseUnicodeEscape(True) if self.eat('u') else None
+                if cp is None:
+                    self.raiseError('Invalid capture group name', start)
+            else:
+                cp, size = self.codePointAt(self.index, True)
+                self.index += size
+            ch = uchr(cp)
+            valid = Character.isIdentifierPart(ch) if chars else Character.isIdentifierStart(ch)
+            if not valid or ch == '\\':
+                self.raiseError('Invalid capture group name', start)
+            chars.append(ch)
+
+        if not chars:
+            self.raiseError('Invalid capture group name', start)
+        self.index += 1
+        return ''.join(chars)
+
+    def readHex(self, count):
+        digits = self.source[self.index:self.index + count]
+        if len(digits) != count or any(c not in HEX_DIGITS for c in digits):
+            return None
+        self.index += count
+        return int(digits, 16)
+
+    # Parses what follows '\u'. Returns the code point, or None with the
+    # index unchanged.
+    def parseUnicodeEscape(self, unicodeMode):
+        start = self.index
+        source = self.source
+        if unicodeMode and self.eat('{'):
+            i = self.index
+            while i < self.length and source[i] in HEX_DIGITS:
+                i += 1
+            if i > self.index and source.startswith('}', i):
+                cp = int(source[self.index:i], 16)
+                if cp <= 0x10FFFF:
+                    self.index = i + 1
+                    return cp
+            self.index = start
+            return None
+
+        cp = self.readHex(4)
+        if cp is None:
+            return None
+
+        if unicodeMode and 0xD800 <= cp <= 0xDBFF and source.startswith('\\u', self.index):
+            lead = self.index
+            self.index += 2
+            low = self.readHex(4)
+            if low is not None and 0xDC00 <= low <= 0xDFFF:
+                return (cp - 0xD800) * 0x400 + low - 0xDC00 + 0x10000
+            self.index = lead
+
+        return cp
+
+    def parseLegacyOctalEscape(self):
+        source = self.source
+        first = source[self.index]
+        value = int(first)
+        self.index += 1
+        if self.peek() in OCTAL_DIGITS:
+            value = value * 8 + int(source[self.index])
+            self.index += 1
+            if first in ('0', '1', '2', '3') and self.peek() in OCTAL_DIGITS:
+                value = value * 8 + int(source[self.index])
+                self.index += 1
+        return value
+
+    # https://tc39.es/ecma262/2024/#prod-CharacterEscape, after the '\'.
+    def parseCharacterEscape(self):
+        source = self.source
+        ch = source[self.index]
+
+        if ch in CONTROL_ESCAPES:
+            self.index += 1
+            return CONTROL_ESCAPES[ch]
+
+        if ch == 'c':
+            letter = self.peek(1)
+            if letter in ASCII_LETTERS:
+                self.index += 2
+                return ord(letter) % 32
+            if self.unicodeMode:
+                self.raiseError('Invalid unicode escape')
+            # Annex B: the backslash stands for itself, 'c' comes next.
+            return 0x5C
+
+        if ch == 'x':
+            self.index += 1
+            cp = self.readHex(2)
+            if cp is not None:
+                return cp
+            if self.unicodeMode:
+                self.raiseError('Invalid escape')
+            return 0x78
+
+        if ch == 'u':
+            self.index += 1
+            cp = self.parseUnicodeEscape(self.unicodeMode)
+            if cp is not None:
+                return cp
+            if self.unicodeMode:
+                self.raiseError('Invalid Unicode escape')
+            return 0x75
+
+        if self.unicodeMode:
+            if ch in SYNTAX_CHARACTERS or ch == '/':
+                self.index += 1
+                return ord(ch)
+            self.raiseError('Invalid escape')
+
+        cp, size = self.codePointAt(self.index, False)
+        self.index += size
+        return cp
+
+    # https://tc39.es/ecma262/2024/#prod-AtomEscape
+
+    def parseAtomEscape(self):
+        start = self.index
+        source = self.source
+        self.index += 1
+        if self.index >= self.length:
+            self.raiseError('\\ at end of pattern', start)
+        ch = source[self.index]
+
+        if ch in DECIMAL_DIGITS and ch != '0':
+            ref, end = self.readDigits(self.index)
+            if ref <= self.groupCount:
+                self.index = end
+                return self.node('Backreference', start, self.index, ref)
+            if self.unicodeMode:
+                self.raiseError('Invalid escape')
+            # Annex B: a legacy octal escape, or \8 and \9 standing for
+            # themselves.
+            cp = self.parseLegacyOctalEscape() if ch in OCTAL_DIGITS else self.parseCharacterEscape()
+            return self.node('Character', start, self.index, cp)
+
+        if ch == '0':
+            if self.peek(1) in DECIMAL_DIGITS:
+                if self.unicodeMode:
+                    self.raiseError('Invalid decimal escape')
+                cp = self.parseLegacyOctalEscape()
+            else:
+                self.index += 1
+                cp = 0
+            return self.node('Character', start, self.index, cp)
+
+        if ch == 'k' and (self.unicodeMode or self.namedGroups):
+            self.index += 1
+            if not self.eat('<'):
+                self.raiseError('Invalid named reference')
+            name = self.parseGroupName()
+            self.references.append((name, start))
+            return self.node('Backreference', start, self.index, name)
+
+        if ch in CLASS_ESCAPES:
+            self.index += 1
+            return self.node('CharacterSet', start, self.index, ch)
+
+        if ch in ('p', 'P') and self.unicodeMode:
+            return self.parseProperty(start)[0]
+
+        cp = self.parseCharacterEscape()
+        return self.node('Character', start, self.index, cp)
+
+    # https://tc39.es/ecma262/2024/#prod-UnicodePropertyValueExpression
+    # Returns the node and whether it matches strings.
+    def parseProperty(self, start):
+        source = self.source
+        negate = source[self.index] == 'P'
+        self.index += 1
+        if not self.eat('{'):
+            self.raiseError('Invalid property name')
+
+        i = self.index
+        while i < self.length and source[i] in PROPERTY_CHARACTERS:
+            i += 1
+        name = source[self.index:i]
+        value = None
+        self.index = i
+        if self.eat('='):
+            i = self.index
+            while i < self.length and source[i] in PROPERTY_CHARACTERS:
+                i += 1
+            value = source[self.index:i]
+            self.index = i
+        if not self.eat('}'):
+            self.raiseError('Invalid property name', start)
+
+        strings = False
+        if value is not None:
+            if name in GENERAL_CATEGORY_NAMES:
+                valid = value in GENERAL_CATEGORY_VALUES
+            elif name in SCRIPT_NAMES:
+                valid = value in SCRIPT_VALUES
+            else:
+                valid = False
+        elif name in GENERAL_CATEGORY_VALUES or name in BINARY_PROPERTIES:
+            valid = True
+        else:
+            valid = strings = self.unicodeSets and not negate and name in STRING_PROPERTIES
+        if not valid:
+            self.raiseError('Invalid property name', start)
+
+        return self.node('Property', start, self.index, negate, name, value), strings
+
+    # https://tc39.es/ecma262/2024/#prod-CharacterClass
+
+    def parseClass(self):
+        start = self.index
+        self.index += 1
+        negate = self.eat('^')
+        if self.unicodeSets:
+            node, strings = self.parseClassSetContents(start, negate)
+            if negate and strings:
+                self.raiseError('Negated character class may contain strings', start)
+            return node
+
+        source = self.source
+        items = []
+        while True:
+            if self.index >= self.length:
+                self.raiseError('Unterminated character class', start)
+            if source[self.index] == ']':
+                self.index += 1
+                break
+
+            atomStart = self.index
+            low, atom = self.parseClassAtom()
+            if source.startswith('-', self.index) and self.index + 1 < self.length and source[self.index + 1] != ']':
+                dash = self.index
+                self.index += 1
+                high, other = self.parseClassAtom()
+                if low < 0 or high < 0:
+                    if self.unicodeMode:
+                        self.raiseError('Invalid character class', atomStart)
+                    # Annex B: a class escape on either side makes the dash
+                    # a plain character.
+                    items.extend((atom, self.node('Character', dash, dash + 1, 0x2D), other))
+                    continue
+                if low > high:
+                    self.raiseError('Range out of order in character class', atomStart)
+                items.append(self.node('ClassRange', atomStart, self.index, low, high))
+            else:
+                items.append(atom)
+
+        return self.node('CharacterClass', start, self.index, negate, 'ClassUnion', items)
+
+    # Returns the code point of a class atom, or -1 for a character set, and
+    # its node.
+    def parseClassAtom(self):
+        start = self.index
+        source = self.source
+        if source[start] != '\\':
+            cp, size = self.codePointAt(start, self.unicodeMode)
+            self.index += size
+            return cp, self.node('Character', start, self.index, cp)
+
+        self.index += 1
+        if self.index >= self.length:
+            self.raiseError('\\ at end of pattern', start)
+        ch = source[self.index]
+
+        if ch in CLASS_ESCAPES:
+            self.index += 1
+            return -1, self.node('CharacterSet', start, self.index, ch)
+        if ch in ('p', 'P') and self.unicodeMode:
+            return -1, self.parseProperty(start)[0]
+
+        if ch == 'b':
+            self.index += 1
+            cp = 0x08
+        elif ch == '-' and self.unicodeMode:
+            self.index += 1
+            cp = 0x2D
+        elif ch == 'c' and not self.unicodeMode and (self.peek(1) in DECIMAL_DIGITS or self.peek(1) == '_'):
+            # Annex B: ClassControlLetter.
+            cp = ord(self.peek(1)) % 32
+            self.index += 2
+        elif ch in DECIMAL_DIGITS:
+            if self.unicodeMode:
+                if ch != '0' or self.peek(1) in DECIMAL_DIGITS:
+                    self.raiseError('Invalid class escape')
+                self.index += 1
+                cp = 0
+            elif ch in OCTAL_DIGITS:
+                cp = self.parseLegacyOctalEscape()
+            else:
+                self.index += 1
+                cp = ord(ch)
+        elif ch == 'k' and self.namedGroups:
+            self.raiseError('Invalid escape')
+        else:
+            cp = self.parseCharacterEscape()
+
+        return cp, self.node('Character', start, self.index, cp)
+
+    # https://tc39.es/ecma262/2024/#prod-ClassSetExpression
+    # With the v flag, after the '[' and '^'. Returns the node and whether
+    # it may match strings.
+    def parseClassSetContents(self, start, negate):
+        source = self.source
+        kind = None
+        items = []
+        strings = []
+        while True:
+            if self.index >= self.length:
+                self.raiseError('Unterminated character class', start)
+            if source[self.index] == ']':
+                self.index += 1
+                break
+
+            operator = source[self.index:self.index + 2]
+            if operator == '&&' or operator == '--':
+                operator = 'ClassIntersection' if operator == '&&' else 'ClassSubtraction'
+                if not items or kind not in (None, operator):
+                    self.raiseError('Invalid set operation in character class')
+                kind = operator
+                self.index += 2
+                if operator == 'ClassIntersection' and source.startswith('&', self.index):
+                    self.raiseError('Invalid character in character class')
+                cp, item, itemStrings = self.parseClassSetOperand()
+                items.append(item)
+                strings.append(itemStrings)
+                continue
+
+            if kind is not None and kind != 'ClassUnion':
+                self.raiseError('Invalid set operation in character class')
+
+            itemStart = self.index
+            low, item, itemStrings = self.parseClassSetOperand()
+            if source.startswith('-', self.index) and not source.startswith('--', self.index):
+                self.index += 1
+                high, other, _ = self.parseClassSetOperand()
+                if low < 0 or high < 0:
+                    self.raiseError('Invalid character class', itemStart)
+                if low > high:
+                    self.raiseError('Range out of order in character class', itemStart)
+                item = self.node('ClassRange', itemStart, self.index, low, high)
+                kind = 'ClassUnion'
+            elif items:
+                kind = 'ClassUnion'
+            items.append(item)
+            strings.append(itemStrings)
+
+        kind = kind or 'ClassUnion'
+        if kind == 'ClassUnion':
+            mayContainStrings = any(strings)
+        elif kind == 'ClassIntersection':
+            mayContainStrings = all(strings)
+        else:
+            mayContainStrings = strings[0]
+        return self.node('CharacterClass', start, self.index, negate, kind, items), mayContainStrings
+
+    # Returns the code point of a single character operand, or -1, its node
+    # and whether it may match strings.
+    def parseClassSetOperand(self):
+        start = self.index
+        source = self.source
+        if self.index >= self.length:
+            self.raiseError('Unterminated character class')
+        ch = source[start]
+
+        if ch == '[':
+            self.index += 1
+            negate = self.eat('^')
+            node, strings = self.parseClassSetContents(start, negate)
+            if negate and strings:
+                self.raiseError('Negated character class may contain strings', start)
+            return -1, node, strings
+
+        if ch == '\\':
+            next = self.peek(1)
+            if next == 'q' and self.peek(2) == '{':
+                return self.parseClassStrings()
+            if next in CLASS_ESCAPES:
+                self.index += 2
+                return -1, self.node('CharacterSet', start, self.index, next), False
+            if next in ('p', 'P'):
+                self.index += 1
+                node, strings = self.parseProperty(start)
+                return -1, node, strings
+
+        cp = self.parseClassSetCharacter()
+        return cp, self.node('Character', start, self.index, cp), False
+
+    # https://tc39.es/ecma262/2024/#prod-ClassSetCharacter
+    def parseClassSetCharacter(self):
+        start = self.index
+        source = self.source
+        ch = source[start]
+
+        if ch == '\\':
+            self.index += 1
+            ch = self.peek()
+            if not ch:
+                self.raiseError('\\ at end of pattern', start)
+            if ch in CLASS_SET_RESERVED_PUNCTUATORS:
+                self.index += 1
+                return ord(ch)
+            if ch == 'b':
+                self.index += 1
+                return 0x08
+            if ch in DECIMAL_DIGITS:
+                if ch != '0' or self.peek(1) in DECIMAL_DIGITS:
+                    self.raiseError('Invalid class escape')
+                self.index += 1
+                return 0
+            return self.parseCharacterEscape()
+
+        if ch in CLASS_SET_SYNTAX_CHARACTERS:
+            self.raiseError('Invalid character in character class')
+        if ch in CLASS_SET_RESERVED_DOUBLE_PUNCTUATORS and self.peek(1) == ch:
+            self.raiseError('Invalid set operation in character class')
+
+        cp, size = self.codePointAt(start, True)
+        self.index += size
+        return cp
+
+    # https://tc39.es/ecma262/2024/#prod-ClassStringDisjunction
+    def parseClassStrings(self):
+        start = self.index
+        source = self.source
+        self.index += 3
+        strings = []
+        chars = []
+        while True:
+            if self.index >= self.length:
+                self.raiseError('Unterminated character class', start)
+            ch = source[self.index]
+            if ch == '}' or ch == '|':
+                self.index += 1
+                strings.append(''.join(uchr(cp) for cp in chars))
+                if ch == '}':
+                    break
+                chars = []
+            else:
+                chars.append(self.parseClassSetCharacter())
+
+        mayContainStrings = any(len(s) != 1 for s in strings)
+        return -1, self.node('ClassStrings', start, self.index, strings), mayContainStrings
+
+
+def validateRegExp(pattern, flags='', ast=False):
+    """
+    Checks a regular expression literal against the ECMAScript 2024 grammar.
+    Raises RegExpError if it is invalid, otherwise returns its AST when `ast`
+    is set, or None.
+    """
+    validator = RegExpValidator(pattern, flags, ast)
+    try:
+        return validator.validate()
+    except RecursionError:
+        # Left for the classes of the v flag, which may nest.
+        pass
+    raise RegExpError('Regular expression too deeply nested', 0)
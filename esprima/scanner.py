@@ -23,16 +23,78 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import io
+import mmap
 import re
 import warnings
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
 
 from .objects import Object
 from .compat import xrange, unicode, uchr, uord
-from .character import Character, HEX_CONV, OCTAL_CONV
+from .character import Character, HEX_CONV, OCTAL_CONV, LINE_TERMINATOR, WHITE_SPACE, ASCII_IDENTIFIER_START, ASCII_IDENTIFIER_PART
 from .messages import Messages
+from .regexp import RegExpError, validateRegExp
 from .token import Token
 
 
+LINE_TERMINATORS = re.compile(r'\r\n|[\n\r\u2028\u2029]')
+NEXT_LINE_TERMINATOR = re.compile(r'[\n\r\u2028\u2029]')
+SPACES = re.compile('[%s]+' % ''.join(sorted(WHITE_SPACE)))
+BLANKS = re.compile('[%s]+' % ''.join(sorted(WHITE_SPACE | LINE_TERMINATOR)))
+
+STRING_STOP = {
+    "'": re.compile(r"['\\\n\r\u2028\u2029]"),
+    '"': re.compile(r'["\\\n\r\u2028\u2029]'),
+}
+TEMPLATE_STOP = re.compile(r'[`$\\\n\r\u2028\u2029]')
+
+# Indexed by code point, used instead of the Character predicates for ASCII
+# characters. The backslash starting an escaped identifier character is left
+# to getComplexIdentifier.
+ASCII_IDENTIFIER_PART_TABLE = tuple(
+    uchr(cp) in ASCII_IDENTIFIER_PART and cp != 0x5C for cp in xrange(0x80)
+)
+
+# https://tc39.github.io/ecma262/#table-34
+SINGLE_CHARACTER_ESCAPES = {
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+    'b': '\b',
+    'f': '\f',
+    'v': '\x0B',
+}
+
+
+def readSource(code):
+    """
+    Returns code as text. Bytes, bytearrays, memoryviews and mmaps are
+    decoded from UTF-8 in one pass, and path-like objects name a UTF-8 file,
+    which is mapped into memory rather than read.
+    """
+    if isinstance(code, unicode):
+        return code
+    if hasattr(code, '__fspath__'):
+        with io.open(code.__fspath__(), 'rb') as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                return ''
+            try:
+                return unicode(buffer, 'utf-8')
+            finally:
+                buffer.close()
+    if isinstance(code, memoryview):
+        # Python 2 cannot decode memoryviews directly.
+        code = code.tobytes()
+    if isinstance(code, (bytes, bytearray, mmap.mmap)):
+        return unicode(code, 'utf-8')
+    return unicode(code)
+
+
 def hexValue(ch):
     return HEX_CONV[ch]
 
@@ -61,6 +123,78 @@ class SourceLocation(Object):
         self.source = source
 
 
+class NodeMetadata(object):
+    """
+    The location handed to delegates along with each node: offsets, lines and
+    columns of both ends, made into Positions only when `start` or `end` is
+    read.
+    """
+
+    __slots__ = ('startOffset', 'startLine', 'startColumn', 'endOffset', 'endLine', 'endColumn')
+
+    source = None
+
+    def __init__(self, startOffset, startLine, startColumn, endOffset, endLine, endColumn):
+        self.startOffset = startOffset
+        self.startLine = startLine
+        self.startColumn = startColumn
+        self.endOffset = endOffset
+        self.endLine = endLine
+        self.endColumn = endColumn
+
+    @property
+    def start(self):
+        return Position(line=self.startLine, column=self.startColumn, offset=self.startOffset)
+
+    @property
+    def end(self):
+        return Position(line=self.endLine, column=self.endColumn, offset=self.endOffset)
+
+
+class LazySourceLocation(SourceLocation):
+    """
+    A SourceLocation holding only offsets. Its positions are resolved through
+    the LineIndex, and the object turns into a plain SourceLocation, the first
+    time any of its attributes is read.
+    """
+
+    def __init__(self, lines, start, end, source=None, startPosition=None):
+        object.__setattr__(self, '_lazy', (lines, start, end, source, startPosition))
+
+    def __getattribute__(self, name):
+        lines, start, end, source, startPosition = object.__getattribute__(self, '_lazy')
+        object.__delattr__(self, '_lazy')
+        object.__setattr__(self, '__class__', SourceLocation)
+        self.start = startPosition or lines.position(start)
+        self.end = lines.position(end)
+        self.source = source
+        return getattr(self, name)
+
+
+class LineIndex(object):
+    """
+    Offsets of the first character of every line, built on first use.
+    """
+
+    def __init__(self, source, length):
+        self.source = source
+        self.length = length
+        self.starts = None
+
+    def build(self):
+        starts = array('I', [0])
+        starts.extend(m.end() for m in LINE_TERMINATORS.finditer(self.source, 0, self.length))
+        self.starts = starts
+
+    def position(self, offset):
+        if self.starts is None:
+            self.build()
+        if not self.length:
+            return Position(line=0, column=offset)
+        line = bisect_right(self.starts, offset)
+        return Position(line=line, column=offset - self.starts[line - 1])
+
+
 class Comment(Object):
     def __init__(self, multiLine=None, slice=None, range=None, loc=None):
         self.multiLine = multiLine
@@ -69,10 +203,10 @@ class Comment(Object):
         self.loc = loc
 
 
-class RawToken(Object):
-    def __init__(self, type=None, value=None, pattern=None, flags=None, regex=None, octal=None, cooked=None, head=None, tail=None, lineNumber=None, lineStart=None, start=None, end=None, raw=None):
-        self.type = type
-        self.value = value
+class TokenDetail(object):
+    __slots__ = ('pattern', 'flags', 'regex', 'octal', 'cooked', 'head', 'tail', 'raw')
+
+    def __init__(self, pattern=None, flags=None, regex=None, octal=None, cooked=None, head=None, tail=None, raw=None):
         self.pattern = pattern
         self.flags = flags
         self.regex = regex
@@ -80,11 +214,42 @@ class RawToken(Object):
         self.cooked = cooked
         self.head = head
         self.tail = tail
+        self.raw = raw
+
+
+def tokenDetail(name):
+    def get(self):
+        detail = self.detail
+        return None if detail is None else getattr(detail, name)
+    return property(get)
+
+
+class RawToken(object):
+    """
+    A scanned token. The fields only regular expressions, templates, octal
+    literals and BigInts have are kept in a TokenDetail, read through the
+    properties below.
+    """
+
+    __slots__ = ('type', 'value', 'lineNumber', 'lineStart', 'start', 'end', 'detail')
+
+    def __init__(self, type=None, value=None, lineNumber=None, lineStart=None, start=None, end=None, detail=None):
+        self.type = type
+        self.value = value
         self.lineNumber = lineNumber
         self.lineStart = lineStart
         self.start = start
         self.end = end
-        self.raw = raw
+        self.detail = detail
+
+    pattern = tokenDetail('pattern')
+    flags = tokenDetail('flags')
+    regex = tokenDetail('regex')
+    octal = tokenDetail('octal')
+    cooked = tokenDetail('cooked')
+    head = tokenDetail('head')
+    tail = tokenDetail('tail')
+    raw = tokenDetail('raw')
 
 
 class ScannerState(Object):
@@ -94,6 +259,39 @@ class ScannerState(Object):
         self.lineStart = lineStart
 
 
+class RegExpCache(object):
+    """
+    Bounded LRU cache of regular expression validation outcomes, keyed by
+    pattern, flags and validation level and shared by all scanners. `hits`
+    and `misses` count lookups since the last clear().
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries[key] = entry
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class Octal(object):
     def __init__(self, octal, code):
         self.octal = octal
@@ -102,13 +300,21 @@ class Octal(object):
 
 class Scanner(object):
     def __init__(self, code, handler, ecmaVersion=2024):
-        self.source = unicode(code) + '\x00'
         self.errorHandler = handler
         self.trackComment = False
-        self.isModule = False
         self.ecmaVersion = ecmaVersion
+        # One of 'none', 'syntax' or 'full'.
+        self.regexValidation = 'full'
+        self.reset(code)
 
-        self.length = len(code)
+    # Starts over on `code`, keeping the settings.
+
+    def reset(self, code):
+        # Reads past the end are bounds checked, there is no sentinel.
+        self.source = readSource(code)
+        self.isModule = False
+        self.length = len(self.source)
+        self.lines = LineIndex(self.source, self.length)
         self.index = 0
         self.lineNumber = 1 if self.length > 0 else 0
         self.lineStart = 0
@@ -137,6 +343,12 @@ class Scanner(object):
         self.errorHandler.tolerateError(self.index, self.lineNumber,
             self.index - self.lineStart + 1, message)
 
+    # Accounts for the line terminators in source[start:end].
+    def advanceLines(self, start, end):
+        for m in LINE_TERMINATORS.finditer(self.source, start, end):
+            self.lineNumber += 1
+            self.lineStart = m.end()
+
     # https://tc39.github.io/ecma262/#sec-comments
 
     def skipSingleLineComment(self, offset):
@@ -152,30 +364,30 @@ class Scanner(object):
                 end=Position()
             )
 
-        while not self.eof():
-            ch = self.source[self.index]
-            self.index += 1
-            if Character.isLineTerminator(ch):
-                if self.trackComment:
-                    loc.end = Position(
-                        line=self.lineNumber,
-                        column=self.index - self.lineStart - 1
-                    )
-                    entry = Comment(
-                        multiLine=False,
-                        slice=[start + offset, self.index - 1],
-                        range=[start, self.index - 1],
-                        loc=loc
-                    )
-                    comments.append(entry)
-
-                if ch == '\r' and self.source[self.index] == '\n':
-                    self.index += 1
+        m = NEXT_LINE_TERMINATOR.search(self.source, self.index, self.length)
+        if m:
+            self.index = m.end()
+            if self.trackComment:
+                loc.end = Position(
+                    line=self.lineNumber,
+                    column=self.index - self.lineStart - 1
+                )
+                entry = Comment(
+                    multiLine=False,
+                    slice=[start + offset, self.index - 1],
+                    range=[start, self.index - 1],
+                    loc=loc
+                )
+                comments.append(entry)
 
-                self.lineNumber += 1
-                self.lineStart = self.index
-                return comments
+            if m.group() == '\r' and self.source.startswith('\n', self.index):
+                self.index += 1
+
+            self.lineNumber += 1
+            self.lineStart = self.index
+            return comments
 
+        self.index = max(self.index, self.length)
         if self.trackComment:
             loc.end = Position(
                 line=self.lineNumber,
@@ -205,39 +417,29 @@ class Scanner(object):
                 end=Position()
             )
 
-        while not self.eof():
-            ch = self.source[self.index]
-            if Character.isLineTerminator(ch):
-                if ch == '\r' and self.source[self.index + 1] == '\n':
-                    self.index += 1
-
-                self.lineNumber += 1
-                self.index += 1
-                self.lineStart = self.index
-            elif ch == '*':
-                # Block comment ends with '*/'.
-                if self.source[self.index + 1] == '/':
-                    self.index += 2
-                    if self.trackComment:
-                        loc.end = Position(
-                            line=self.lineNumber,
-                            column=self.index - self.lineStart
-                        )
-                        entry = Comment(
-                            multiLine=True,
-                            slice=[start + 2, self.index - 2],
-                            range=[start, self.index],
-                            loc=loc
-                        )
-                        comments.append(entry)
-
-                    return comments
+        # Block comment ends with '*/'.
+        end = self.source.find('*/', self.index, self.length)
+        if end >= 0:
+            self.advanceLines(self.index, end)
+            self.index = end + 2
+            if self.trackComment:
+                loc.end = Position(
+                    line=self.lineNumber,
+                    column=self.index - self.lineStart
+                )
+                entry = Comment(
+                    multiLine=True,
+                    slice=[start + 2, self.index - 2],
+                    range=[start, self.index],
+                    loc=loc
+                )
+                comments.append(entry)
 
-                self.index += 1
-            else:
-                self.index += 1
+            return comments
 
         # Ran off the end of the file - the whole thing is a comment
+        self.advanceLines(self.index, self.length)
+        self.index = max(self.index, self.length)
         if self.trackComment:
             loc.end = Position(
                 line=self.lineNumber,
@@ -258,21 +460,17 @@ class Scanner(object):
         comments = []
 
         start = self.index == 0
-        while not self.eof():
+        while self.index < self.length:
             ch = self.source[self.index]
-
-            if Character.isWhiteSpace(ch):
-                self.index += 1
-            elif Character.isLineTerminator(ch):
-                self.index += 1
-                if ch == '\r' and self.source[self.index] == '\n':
-                    self.index += 1
-
-                self.lineNumber += 1
-                self.lineStart = self.index
+            if ch in WHITE_SPACE:
+                self.index = SPACES.match(self.source, self.index, self.length).end()
+            elif ch in LINE_TERMINATOR:
+                end = BLANKS.match(self.source, self.index, self.length).end()
+                self.advanceLines(self.index, end)
+                self.index = end
                 start = True
             elif ch == '/':  # U+002F is '/'
-                ch = self.source[self.index + 1]
+                ch = self.source[self.index + 1:self.index + 2]
                 if ch == '/':
                     self.index += 2
                     comment = self.skipSingleLineComment(2)
@@ -392,7 +590,7 @@ class Scanner(object):
         return uchr(code)
 
     def scanUnicodeCodePointEscape(self):
-        ch = self.source[self.index]
+        ch = self.source[self.index:self.index + 1]
         code = 0
 
         # At least, one hex digit is required.
@@ -414,6 +612,19 @@ class Scanner(object):
 
     def getIdentifier(self):
         start = self.index
+        source = self.source
+        index = start + 1
+        try:
+            while ASCII_IDENTIFIER_PART_TABLE[ord(source[index])]:
+                index += 1
+        except IndexError:
+            # Not ASCII, take the general path below.
+            pass
+        else:
+            if source[index] != '\\':
+                self.index = index
+                return source[start:index]
+
         self.index += 1
         while not self.eof():
             ch = self.source[self.index]
@@ -442,11 +653,11 @@ class Scanner(object):
 
         # '\u' (U+005C, U+0075) denotes an escaped character.
         if cp == 0x5C:
-            if self.source[self.index] != 'u':
+            if not self.source.startswith('u', self.index):
                 self.throwUnexpectedToken()
 
             self.index += 1
-            if self.source[self.index] == '{':
+            if self.source.startswith('{', self.index):
                 self.index += 1
                 ch = self.scanUnicodeCodePointEscape()
             else:
@@ -468,11 +679,11 @@ class Scanner(object):
             # '\u' (U+005C, U+0075) denotes an escaped character.
             if cp == 0x5C:
                 id = id[:-1]
-                if self.source[self.index] != 'u':
+                if not self.source.startswith('u', self.index):
                     self.throwUnexpectedToken()
 
                 self.index += 1
-                if self.source[self.index] == '{':
+                if self.source.startswith('{', self.index):
                     self.index += 1
                     ch = self.scanUnicodeCodePointEscape()
                 else:
@@ -576,7 +787,7 @@ class Scanner(object):
         # Hashbangs are treated as comments and skipped
         # Advance past the line terminator if present
         if not self.eof() and Character.isLineTerminator(self.source[self.index]):
-            if self.source[self.index] == '\r' and self.source[self.index + 1] == '\n':
+            if self.source.startswith('\r\n', self.index):
                 self.index += 2
             else:
                 self.index += 1
@@ -604,7 +815,7 @@ class Scanner(object):
 
         elif str == '.':
             self.index += 1
-            if self.source[self.index] == '.' and self.source[self.index + 1] == '.':
+            if self.source.startswith('..', self.index):
                 # Spread operator: ...
                 self.index += 2
                 str = '...'
@@ -681,7 +892,7 @@ class Scanner(object):
                     else:
 
                         # 1-character punctuators.
-                        str = self.source[self.index]
+                        str = self.source[self.index:self.index + 1]
                         if str in '<>=!+-*%^/':
                             self.index += 1
                         elif str == '&':
@@ -689,10 +900,10 @@ class Scanner(object):
                             if self.source[self.index + 1:self.index + 3] == '&=' and self.ecmaVersion >= 2021:
                                 str = '&&='
                                 self.index += 3
-                            elif self.source[self.index + 1] == '&':
+                            elif self.source[self.index + 1:self.index + 2] == '&':
                                 str = '&&'
                                 self.index += 2
-                            elif self.source[self.index + 1] == '=':
+                            elif self.source[self.index + 1:self.index + 2] == '=':
                                 str = '&='
                                 self.index += 2
                             else:
@@ -702,10 +913,10 @@ class Scanner(object):
                             if self.source[self.index + 1:self.index + 3] == '|=' and self.ecmaVersion >= 2021:
                                 str = '||='
                                 self.index += 3
-                            elif self.source[self.index + 1] == '|':
+                            elif self.source[self.index + 1:self.index + 2] == '|':
                                 str = '||'
                                 self.index += 2
-                            elif self.source[self.index + 1] == '=':
+                            elif self.source[self.index + 1:self.index + 2] == '=':
                                 str = '|='
                                 self.index += 2
                             else:
@@ -729,16 +940,16 @@ class Scanner(object):
         num = ''
 
         while not self.eof():
-            if not Character.isHexDigit(self.source[self.index]):
+            if not Character.isHexDigit(self.source[self.index:self.index + 1]):
                 break
 
-            num += self.source[self.index]
+            num += self.source[self.index:self.index + 1]
             self.index += 1
 
         if len(num) == 0:
             self.throwUnexpectedToken()
 
-        if Character.isIdentifierStart(self.source[self.index]):
+        if Character.isIdentifierStart(self.source[self.index:self.index + 1]):
             self.throwUnexpectedToken()
 
         return RawToken(
@@ -754,11 +965,11 @@ class Scanner(object):
         num = ''
 
         while not self.eof():
-            ch = self.source[self.index]
+            ch = self.source[self.index:self.index + 1]
             if ch != '0' and ch != '1':
                 break
 
-            num += self.source[self.index]
+            num += self.source[self.index:self.index + 1]
             self.index += 1
 
         if len(num) == 0:
@@ -766,7 +977,7 @@ class Scanner(object):
             self.throwUnexpectedToken()
 
         if not self.eof():
-            ch = self.source[self.index]
+            ch = self.source[self.index:self.index + 1]
             if Character.isIdentifierStart(ch) or Character.isDecimalDigit(ch):
                 self.throwUnexpectedToken()
 
@@ -785,27 +996,27 @@ class Scanner(object):
 
         if Character.isOctalDigit(prefix[0]):
             octal = True
-            num = '0' + self.source[self.index]
+            num = '0' + self.source[self.index:self.index + 1]
         self.index += 1
 
         while not self.eof():
-            if not Character.isOctalDigit(self.source[self.index]):
+            if not Character.isOctalDigit(self.source[self.index:self.index + 1]):
                 break
 
-            num += self.source[self.index]
+            num += self.source[self.index:self.index + 1]
             self.index += 1
 
         if not octal and len(num) == 0:
             # only 0o or 0O
             self.throwUnexpectedToken()
 
-        if Character.isIdentifierStart(self.source[self.index]) or Character.isDecimalDigit(self.source[self.index]):
+        if Character.isIdentifierStart(self.source[self.index:self.index + 1]) or Character.isDecimalDigit(self.source[self.index:self.index + 1]):
             self.throwUnexpectedToken()
 
         return RawToken(
             type=Token.NumericLiteral,
             value=int(num, 8),
-            octal=octal,
+            detail=TokenDetail(octal=True) if octal else None,
             lineNumber=self.lineNumber,
             lineStart=self.lineStart,
             start=start,
@@ -830,9 +1041,9 @@ class Scanner(object):
 
         num = ''
         if ch != '.':
-            num = self.source[self.index]
+            num = self.source[self.index:self.index + 1]
             self.index += 1
-            ch = self.source[self.index]
+            ch = self.source[self.index:self.index + 1]
 
             # Hex number starts with '0x'.
             # Octal number starts with '0'.
@@ -854,8 +1065,8 @@ class Scanner(object):
                     if self.isImplicitOctalLiteral():
                         return self.scanOctalLiteral(ch, start)
 
-            while Character.isDecimalDigit(self.source[self.index]) or (self.ecmaVersion >= 2021 and self.source[self.index] == '_'):
-                ch = self.source[self.index]
+            while Character.isDecimalDigit(self.source[self.index:self.index + 1]) or (self.ecmaVersion >= 2021 and self.source[self.index:self.index + 1] == '_'):
+                ch = self.source[self.index:self.index + 1]
                 if ch == '_':
                     # ES2021: Numeric separator - validate placement
                     next_char = self.source[self.index + 1] if self.index + 1 < self.length else ''
@@ -866,13 +1077,13 @@ class Scanner(object):
                     num += ch
                     self.index += 1
 
-            ch = self.source[self.index]
+            ch = self.source[self.index:self.index + 1]
 
         if ch == '.':
-            num += self.source[self.index]
+            num += self.source[self.index:self.index + 1]
             self.index += 1
-            while Character.isDecimalDigit(self.source[self.index]) or (self.ecmaVersion >= 2021 and self.source[self.index] == '_'):
-                ch = self.source[self.index]
+            while Character.isDecimalDigit(self.source[self.index:self.index + 1]) or (self.ecmaVersion >= 2021 and self.source[self.index:self.index + 1] == '_'):
+                ch = self.source[self.index:self.index + 1]
                 if ch == '_':
                     # ES2021: Numeric separator in fractional part
                     next_char = self.source[self.index + 1] if self.index + 1 < self.length else ''
@@ -883,20 +1094,20 @@ class Scanner(object):
                     num += ch
                     self.index += 1
 
-            ch = self.source[self.index]
+            ch = self.source[self.index:self.index + 1]
 
         if ch in ('e', 'E'):
-            num += self.source[self.index]
+            num += self.source[self.index:self.index + 1]
             self.index += 1
 
-            ch = self.source[self.index]
+            ch = self.source[self.index:self.index + 1]
             if ch in ('+', '-'):
-                num += self.source[self.index]
+                num += self.source[self.index:self.index + 1]
                 self.index += 1
 
-            if Character.isDecimalDigit(self.source[self.index]):
-                while Character.isDecimalDigit(self.source[self.index]) or (self.ecmaVersion >= 2021 and self.source[self.index] == '_'):
-                    ch = self.source[self.index]
+            if Character.isDecimalDigit(self.source[self.index:self.index + 1]):
+                while Character.isDecimalDigit(self.source[self.index:self.index + 1]) or (self.ecmaVersion >= 2021 and self.source[self.index:self.index + 1] == '_'):
+                    ch = self.source[self.index:self.index + 1]
                     if ch == '_':
                         # ES2021: Numeric separator in exponent
                         next_char = self.source[self.index + 1] if self.index + 1 < self.length else ''
@@ -911,7 +1122,7 @@ class Scanner(object):
                 self.throwUnexpectedToken()
 
         # Check for BigInt literal (ES2020)
-        if self.source[self.index] == 'n':
+        if self.source[self.index:self.index + 1] == 'n':
             # BigInt literals cannot have decimals or exponents
             if '.' in num or 'e' in num.lower():
                 self.throwUnexpectedToken()
@@ -928,14 +1139,14 @@ class Scanner(object):
                 return RawToken(
                     type=Token.BigIntLiteral,
                     value=bigint_value,
-                    raw=num + 'n',
+                    detail=TokenDetail(raw=num + 'n'),
                     lineNumber=self.lineNumber,
                     lineStart=self.lineStart,
                     start=start,
                     end=self.index
                 )
 
-        if Character.isIdentifierStart(self.source[self.index]):
+        if Character.isIdentifierStart(self.source[self.index:self.index + 1]):
             self.throwUnexpectedToken()
 
         value = float(num)
@@ -955,55 +1166,53 @@ class Scanner(object):
         quote = self.source[start]
         assert quote in ('\'', '"'), 'String literal must starts with a quote'
 
+        source = self.source
+        stop = STRING_STOP[quote]
         self.index += 1
         octal = False
-        str = ''
+        chunks = []
 
-        while not self.eof():
-            ch = self.source[self.index]
-            self.index += 1
+        while True:
+            m = stop.search(source, self.index, self.length)
+            if m is None:
+                break
+
+            end = m.start()
+            chunks.append(source[self.index:end])
+            ch = source[end]
+            self.index = end + 1
 
             if ch == quote:
                 quote = ''
                 break
             elif ch == '\\':
-                ch = self.source[self.index]
+                ch = source[self.index:self.index + 1]
                 self.index += 1
-                if not ch or not Character.isLineTerminator(ch):
+                if ch in SINGLE_CHARACTER_ESCAPES:
+                    chunks.append(SINGLE_CHARACTER_ESCAPES[ch])
+                elif not ch or not Character.isLineTerminator(ch):
                     if ch == 'u':
-                        if self.source[self.index] == '{':
+                        if source.startswith('{', self.index):
                             self.index += 1
-                            str += self.scanUnicodeCodePointEscape()
+                            chunks.append(self.scanUnicodeCodePointEscape())
                         else:
                             unescapedChar = self.scanHexEscape(ch)
                             if not unescapedChar:
                                 self.throwUnexpectedToken()
 
-                            str += unescapedChar
+                            chunks.append(unescapedChar)
 
                     elif ch == 'x':
                         unescaped = self.scanHexEscape(ch)
                         if not unescaped:
                             self.throwUnexpectedToken(Messages.InvalidHexEscapeSequence)
 
-                        str += unescaped
-                    elif ch == 'n':
-                        str += '\n'
-                    elif ch == 'r':
-                        str += '\r'
-                    elif ch == 't':
-                        str += '\t'
-                    elif ch == 'b':
-                        str += '\b'
-                    elif ch == 'f':
-                        str += '\f'
-                    elif ch == 'v':
-                        str += '\x0B'
+                        chunks.append(unescaped)
                     elif ch in (
                         '8',
                         '9',
                     ):
-                        str += ch
+                        chunks.append(ch)
                         self.tolerateUnexpectedToken()
 
                     else:
@@ -1011,21 +1220,19 @@ class Scanner(object):
                             octToDec = self.octalToDecimal(ch)
 
                             octal = octToDec.octal or octal
-                            str += uchr(octToDec.code)
+                            chunks.append(uchr(octToDec.code))
                         else:
-                            str += ch
+                            chunks.append(ch)
 
                 else:
                     self.lineNumber += 1
-                    if ch == '\r' and self.source[self.index] == '\n':
+                    if ch == '\r' and source.startswith('\n', self.index):
                         self.index += 1
 
                     self.lineStart = self.index
 
-            elif Character.isLineTerminator(ch):
-                break
             else:
-                str += ch
+                break
 
         if quote != '':
             self.index = start
@@ -1033,8 +1240,8 @@ class Scanner(object):
 
         return RawToken(
             type=Token.StringLiteral,
-            value=str,
-            octal=octal,
+            value=''.join(chunks),
+            detail=TokenDetail(octal=True) if octal else None,
             lineNumber=self.lineNumber,
             lineStart=self.lineStart,
             start=start,
@@ -1044,97 +1251,94 @@ class Scanner(object):
     # https://tc39.github.io/ecma262/#sec-template-literal-lexical-components
 
     def scanTemplate(self):
-        cooked = ''
+        chunks = []
         terminated = False
         start = self.index
+        source = self.source
 
-        head = self.source[start] == '`'
+        head = source[start] == '`'
         tail = False
         rawOffset = 2
 
         self.index += 1
 
-        while not self.eof():
-            ch = self.source[self.index]
-            self.index += 1
+        while True:
+            m = TEMPLATE_STOP.search(source, self.index, self.length)
+            if m is None:
+                self.index = max(self.index, self.length)
+                break
+
+            end = m.start()
+            chunks.append(source[self.index:end])
+            ch = source[end]
+            self.index = end + 1
+
             if ch == '`':
                 rawOffset = 1
                 tail = True
                 terminated = True
                 break
             elif ch == '$':
-                if self.source[self.index] == '{':
+                if source.startswith('{', self.index):
                     self.curlyStack.append('${')
                     self.index += 1
                     terminated = True
                     break
 
-                cooked += ch
+                chunks.append(ch)
             elif ch == '\\':
-                ch = self.source[self.index]
+                ch = source[self.index:self.index + 1]
                 self.index += 1
-                if not Character.isLineTerminator(ch):
-                    if ch == 'n':
-                        cooked += '\n'
-                    elif ch == 'r':
-                        cooked += '\r'
-                    elif ch == 't':
-                        cooked += '\t'
-                    elif ch == 'u':
-                        if self.source[self.index] == '{':
+                if ch in SINGLE_CHARACTER_ESCAPES:
+                    chunks.append(SINGLE_CHARACTER_ESCAPES[ch])
+                elif not Character.isLineTerminator(ch):
+                    if ch == 'u':
+                        if source.startswith('{', self.index):
                             self.index += 1
-                            cooked += self.scanUnicodeCodePointEscape()
+                            chunks.append(self.scanUnicodeCodePointEscape())
                         else:
                             restore = self.index
                             unescapedChar = self.scanHexEscape(ch)
                             if unescapedChar:
-                                cooked += unescapedChar
+                                chunks.append(unescapedChar)
                             else:
                                 self.index = restore
-                                cooked += ch
+                                chunks.append(ch)
 
                     elif ch == 'x':
                         unescaped = self.scanHexEscape(ch)
                         if not unescaped:
                             self.throwUnexpectedToken(Messages.InvalidHexEscapeSequence)
 
-                        cooked += unescaped
-                    elif ch == 'b':
-                        cooked += '\b'
-                    elif ch == 'f':
-                        cooked += '\f'
-                    elif ch == 'v':
-                        cooked += '\v'
+                        chunks.append(unescaped)
 
                     else:
                         if ch == '0':
-                            if Character.isDecimalDigit(self.source[self.index]):
+                            if Character.isDecimalDigit(source[self.index:self.index + 1]):
                                 # Illegal: \01 \02 and so on
                                 self.throwUnexpectedToken(Messages.TemplateOctalLiteral)
 
-                            cooked += '\0'
+                            chunks.append('\0')
                         elif Character.isOctalDigit(ch):
                             # Illegal: \1 \2
                             self.throwUnexpectedToken(Messages.TemplateOctalLiteral)
                         else:
-                            cooked += ch
+                            chunks.append(ch)
 
                 else:
                     self.lineNumber += 1
-                    if ch == '\r' and self.source[self.index] == '\n':
+                    if ch == '\r' and source.startswith('\n', self.index):
                         self.index += 1
 
                     self.lineStart = self.index
 
-            elif Character.isLineTerminator(ch):
+            else:
                 self.lineNumber += 1
-                if ch == '\r' and self.source[self.index] == '\n':
+                if ch == '\r' and source.startswith('\n', self.index):
                     self.index += 1
 
                 self.lineStart = self.index
-                cooked += '\n'
-            else:
-                cooked += ch
+                chunks.append('\n')
 
         if not terminated:
             self.throwUnexpectedToken()
@@ -1145,10 +1349,8 @@ class Scanner(object):
 
         return RawToken(
             type=Token.Template,
-            value=self.source[start + 1:self.index - rawOffset],
-            cooked=cooked,
-            head=head,
-            tail=tail,
+            value=source[start + 1:self.index - rawOffset],
+            detail=TokenDetail(cooked=''.join(chunks), head=head, tail=tail),
             lineNumber=self.lineNumber,
             lineStart=self.lineStart,
             start=start,
@@ -1158,12 +1360,36 @@ class Scanner(object):
     # https://tc39.github.io/ecma262/#sec-literals-regular-expression-literals
 
     def testRegExp(self, pattern, flags):
+        level = self.regexValidation
+        if level == 'none':
+            return None
+
+        key = (pattern, flags, level)
+        entry = self.regExpCache.get(key)
+        if entry is None:
+            entry = self.validateRegExp(pattern, flags, level)
+            self.regExpCache.put(key, entry)
+
+        value, invalid = entry
+        for _ in xrange(invalid):
+            self.tolerateUnexpectedToken(Messages.InvalidRegExp)
+        return value
+
+    # Returns the compiled pattern, or None, along with the number of
+    # InvalidRegExp errors to report. Validity follows the ECMAScript grammar;
+    # the full level also compiles an approximation of the pattern with `re`.
+    def validateRegExp(self, pattern, flags, level):
+        try:
+            validateRegExp(pattern, flags)
+        except RegExpError:
+            return None, 1
+
+        if level == 'syntax':
+            return None, 0
+
         # The BMP character to use as a replacement for astral symbols when
         # translating an ES6 "u"-flagged pattern to an ES5-compatible
         # approximation.
-        # Note: replacing with '\uFFFF' enables false positives in unlikely
-        # scenarios. For example, `[\u{1044f}-\u{10440}]` is an invalid
-        # pattern that would not be detected by this substitution.
         astralSubstitute = '\uFFFF'
 
         # Replace every Unicode escape sequence with the equivalent
@@ -1172,29 +1398,24 @@ class Scanner(object):
         # for more information.)
         def astralSub(m):
             codePoint = int(m.group(1) or m.group(2), 16)
-            if codePoint > 0x10FFFF:
-                self.tolerateUnexpectedToken(Messages.InvalidRegExp)
-            elif codePoint <= 0xFFFF:
+            if codePoint <= 0xFFFF:
                 return uchr(codePoint)
             return astralSubstitute
         pattern = re.sub(r'\\u\{([0-9a-fA-F]+)\}|\\u([a-fA-F0-9]{4})', astralSub, pattern)
 
-        # Replace each paired surrogate with a single ASCII symbol to
-        # avoid throwing on regular expressions that are only valid in
-        # combination with the "u" flag.
+        # Replace each paired surrogate with a single ASCII symbol.
         pattern = re.sub(r'[\uD800-\uDBFF][\uDC00-\uDFFF]', astralSubstitute, pattern)
 
         # Return a regular expression object for this pattern-flag pair, or
-        # `null` in case the current environment doesn't support the flags it
-        # uses.
+        # `null` in case `re` doesn't support the syntax or flags it uses.
         pyflags = 0 | re.M if 'm' in flags else 0 | re.I if 'i' in flags else 0
         try:
             # Suppress FutureWarning about possible nested sets in regex patterns
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore", message="Possible nested set", category=FutureWarning)
-                return re.compile(pattern, pyflags)
+                return re.compile(pattern, pyflags), 0
         except Exception:
-            self.tolerateUnexpectedToken(Messages.InvalidRegExp)
+            return None, 0
 
     def scanRegExpBody(self):
         ch = self.source[self.index]
@@ -1210,7 +1431,7 @@ class Scanner(object):
             self.index += 1
             str += ch
             if ch == '\\':
-                ch = self.source[self.index]
+                ch = self.source[self.index:self.index + 1]
                 self.index += 1
                 # https://tc39.github.io/ecma262/#sec-literals-regular-expression-literals
                 if Character.isLineTerminator(ch):
@@ -1284,9 +1505,7 @@ class Scanner(object):
         return RawToken(
             type=Token.RegularExpression,
             value='',
-            pattern=pattern,
-            flags=flags,
-            regex=value,
+            detail=TokenDetail(pattern=pattern, flags=flags, regex=value),
             lineNumber=self.lineNumber,
             lineStart=self.lineStart,
             start=start,
@@ -1294,7 +1513,7 @@ class Scanner(object):
         )
 
     def lex(self):
-        if self.eof():
+        if self.index >= self.length:
             return RawToken(
                 type=Token.EOF,
                 value='',
@@ -1310,6 +1529,12 @@ class Scanner(object):
         if self.index == 0 and ch == '#' and self.index + 1 < self.length and self.source[self.index + 1] == '!' and self.ecmaVersion >= 2023:
             return self.scanHashbang()
 
+        cp = ord(ch)
+        if cp < 0x80:
+            scan = self.asciiScanners[cp]
+            if scan is not None:
+                return scan(self)
+
         if Character.isIdentifierStart(ch):
             return self.scanIdentifier()
 
@@ -1324,7 +1549,7 @@ class Scanner(object):
         # Dot (.) U+002E can also start a floating-point number, hence the need
         # to check the next character.
         if ch == '.':
-            if Character.isDecimalDigit(self.source[self.index + 1]):
+            if Character.isDecimalDigit(self.source[self.index + 1:self.index + 2]):
                 return self.scanNumericLiteral()
 
             return self.scanPunctuator()
@@ -1350,3 +1575,23 @@ class Scanner(object):
                 return self.scanIdentifier()
 
         return self.scanPunctuator()
+
+
+def asciiScanners():
+    # Scanners for the tokens an ASCII character can start without looking
+    # any further, None where Scanner.lex has to decide.
+    scanners = [None] * 0x80
+    for cp in xrange(0x80):
+        ch = uchr(cp)
+        if ch in ASCII_IDENTIFIER_START:
+            scanners[cp] = Scanner.scanIdentifier
+        elif Character.isDecimalDigit(ch):
+            scanners[cp] = Scanner.scanNumericLiteral
+        elif ch in ('\'', '"'):
+            scanners[cp] = Scanner.scanStringLiteral
+        elif ch in '()[]{;,:?~<>=!+-*/%&|^':
+            scanners[cp] = Scanner.scanPunctuator
+    return tuple(scanners)
+
+Scanner.asciiScanners = asciiScanners()
+Scanner.regExpCache = RegExpCache()
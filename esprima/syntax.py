@@ -45,6 +45,7 @@ class Syntax:
     DoWhileStatement = "DoWhileStatement"
     DebuggerStatement = "DebuggerStatement"
     EmptyStatement = "EmptyStatement"
+    ErrorNode = "ErrorNode"
     ExportAllDeclaration = "ExportAllDeclaration"
     ExportDefaultDeclaration = "ExportDefaultDeclaration"
     ExportNamedDeclaration = "ExportNamedDeclaration"
@@ -23,11 +23,15 @@
 
 from __future__ import absolute_import, unicode_literals
 
+from array import array
+from bisect import bisect_left
 from collections import deque
 
-from .objects import Object
-from .error_handler import ErrorHandler
-from .scanner import Scanner, SourceLocation, Position, RegExp
+from .objects import Array, Object
+from .compat import xrange
+from .error_handler import Error, ErrorHandler
+from .regex_scanner import RegexScanner
+from .scanner import Scanner, ScannerState, SourceLocation, LazySourceLocation, Position, RegExp, readSource
 from .token import Token, TokenName
 
 
@@ -40,10 +44,81 @@ class BufferEntry(Object):
         self.loc = loc
 
 
+class TokenColumns(object):
+    """
+    Tokens as parallel arrays of type codes (see Token), start and end
+    offsets and start line numbers, returned by tokenize() with `columnar`.
+    With `internValues`, `valueIds` holds the index of each token value in
+    `valueTable`; otherwise values are sliced from the source when asked for.
+    Comments are not included.
+    """
+
+    def __init__(self, source, internValues=False):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.lines = array('I')
+        self.valueIds = array('I') if internValues else None
+        self.valueTable = [] if internValues else None
+        self.valueIndex = {} if internValues else None
+        self.errors = None
+
+    def append(self, type, start, end, line):
+        self.types.append(type)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        if self.valueIds is not None:
+            value = self.source[start:end]
+            id = self.valueIndex.get(value)
+            if id is None:
+                id = self.valueIndex[value] = len(self.valueTable)
+                self.valueTable.append(value)
+            self.valueIds.append(id)
+
+    def __len__(self):
+        return len(self.types)
+
+    def type(self, i):
+        return TokenName[self.types[i]]
+
+    def value(self, i):
+        if self.valueIds is not None:
+            return self.valueTable[self.valueIds[i]]
+        return self.source[self.starts[i]:self.ends[i]]
+
+    def __getitem__(self, i):
+        return BufferEntry(type=self.type(i), value=self.value(i), range=[self.starts[i], self.ends[i]])
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+
+    def toNumpy(self):
+        """
+        Returns a NumPy structured array with the fields type, start, end,
+        line and, with interned values, value. NumPy is imported on demand.
+        """
+        import numpy
+
+        columns = [('type', self.types), ('start', self.starts), ('end', self.ends), ('line', self.lines)]
+        if self.valueIds is not None:
+            columns.append(('value', self.valueIds))
+        result = numpy.empty(len(self), dtype=[(name, numpy.asarray(column).dtype) for name, column in columns])
+        for name, column in columns:
+            result[name] = numpy.asarray(column)
+        return result
+
+
 class Reader(object):
+    # Only the last few punctuators and keywords are kept, along with the
+    # ones preceding the latest '(' and '{', so that memory does not grow
+    # with the input.
     def __init__(self):
-        self.values = []
-        self.curly = self.paren = -1
+        self.values = deque(maxlen=5)
+        self.paren = None
+        self.curly = (None,) * 5
 
     # A function following one of those tokens is an expression.
     def beforeFunctionExpression(self, t):
@@ -74,20 +149,20 @@ class Reader(object):
         ):
             regex = False
         elif previous == ')':
-            keyword = self.values[self.paren - 1]
+            keyword = self.paren
             regex = keyword in ('if', 'while', 'for', 'with')
 
         elif previous == '}':
             # Dividing a function by anything makes little sense,
             # but we have to check for that.
             regex = True
-            if len(self.values) >= 3 and self.values[self.curly - 3] == 'function':
+            if self.curly[-3] == 'function':
                 # Anonymous function, e.g. function(){} /42
-                check = self.values[self.curly - 4]
+                check = self.curly[-4]
                 regex = not self.beforeFunctionExpression(check) if check else False
-            elif len(self.values) >= 4 and self.values[self.curly - 4] == 'function':
+            elif self.curly[-4] == 'function':
                 # Named function, e.g. function f(){} /42/
-                check = self.values[self.curly - 5]
+                check = self.curly[-5]
                 regex = not self.beforeFunctionExpression(check) if check else True
 
         return regex
@@ -95,9 +170,9 @@ class Reader(object):
     def append(self, token):
         if token.type in (Token.Punctuator, Token.Keyword):
             if token.value == '{':
-                self.curly = len(self.values)
+                self.curly = (None,) * (5 - len(self.values)) + tuple(self.values)
             elif token.value == '(':
-                self.paren = len(self.values)
+                self.paren = self.values[-1] if self.values else None
             self.values.append(token.value)
         else:
             self.values.append(None)
@@ -119,8 +194,12 @@ class Tokenizer(object):
 
         self.errorHandler = ErrorHandler()
         self.errorHandler.tolerant = self.config.tolerant
-        self.scanner = Scanner(code, self.errorHandler)
+        self.errorHandler.onError = self.config.onError
+        scanner = RegexScanner if self.config.lexer == 'regex' else Scanner
+        self.scanner = scanner(code, self.errorHandler)
         self.scanner.trackComment = self.config.comment
+        if self.config.regexValidation is not None:
+            self.scanner.regexValidation = self.config.regexValidation
 
         self.trackRange = self.config.range
         self.trackLoc = self.config.loc
@@ -130,6 +209,44 @@ class Tokenizer(object):
     def errors(self):
         return self.errorHandler.errors
 
+    def scanToken(self):
+        maybeRegex = self.scanner.source[self.scanner.index] == '/' and self.reader.isRegexStart()
+        if maybeRegex:
+            state = self.scanner.saveState()
+            try:
+                token = self.scanner.scanRegExp()
+            except Error:
+                self.scanner.restoreState(state)
+                token = self.scanner.lex()
+        else:
+            token = self.scanner.lex()
+
+        self.reader.append(token)
+        return token
+
+    def collectColumns(self, columns):
+        scanner = self.scanner
+        append = columns.append
+        while True:
+            scanner.scanComments()
+            if scanner.eof():
+                break
+            line = scanner.lineNumber
+            token = self.scanToken()
+            append(token.type, token.start, token.end, line)
+
+    def iterTokens(self, delegate=None):
+        try:
+            while True:
+                token = self.getNextToken()
+                if not token:
+                    break
+                if delegate:
+                    token = delegate(token)
+                yield token
+        except Error as e:
+            self.errorHandler.tolerate(e)
+
     def getNextToken(self):
         if not self.buffer:
 
@@ -148,27 +265,8 @@ class Tokenizer(object):
                     self.buffer.append(comment)
 
             if not self.scanner.eof():
-                if self.trackLoc:
-                    loc = SourceLocation(
-                        start=Position(
-                            line=self.scanner.lineNumber,
-                            column=self.scanner.index - self.scanner.lineStart
-                        ),
-                        end=Position(),
-                    )
-
-                maybeRegex = self.scanner.source[self.scanner.index] == '/' and self.reader.isRegexStart()
-                if maybeRegex:
-                    state = self.scanner.saveState()
-                    try:
-                        token = self.scanner.scanRegExp()
-                    except Exception:
-                        self.scanner.restoreState(state)
-                        token = self.scanner.lex()
-                else:
-                    token = self.scanner.lex()
-
-                self.reader.append(token)
+                start = self.scanner.index
+                token = self.scanToken()
 
                 entry = BufferEntry(
                     type=TokenName[token.type],
@@ -177,11 +275,7 @@ class Tokenizer(object):
                 if self.trackRange:
                     entry.range = [token.start, token.end]
                 if self.trackLoc:
-                    loc.end = Position(
-                        line=self.scanner.lineNumber,
-                        column=self.scanner.index - self.scanner.lineStart
-                    )
-                    entry.loc = loc
+                    entry.loc = LazySourceLocation(self.scanner.lines, start, self.scanner.index)
                 if token.type is Token.RegularExpression:
                     entry.regex = RegExp(
                         pattern=token.pattern,
@@ -191,3 +285,224 @@ class Tokenizer(object):
                 self.buffer.append(entry)
 
         return self.buffer.popleft() if self.buffer else None
+
+
+class TokenSteps(object):
+    """
+    Lexer states of an incremental tokenizer, one per step, that is a token
+    along with the comments preceding it: the scanner position, the
+    context needed to restart (template braces and the regular expression
+    context of the reader), the index of the first entry of the step in the
+    token list and the errors it raised, if any.
+    """
+
+    def __init__(self):
+        self.starts = array('I')
+        self.lineNumbers = array('I')
+        self.lineStarts = array('I')
+        self.contexts = []
+        self.offsets = array('I')
+        self.errors = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def append(self, state, offset, errors):
+        self.starts.append(state[0])
+        self.lineNumbers.append(state[1])
+        self.lineStarts.append(state[2])
+        self.contexts.append(state[3])
+        self.offsets.append(offset)
+        self.errors.append(errors)
+
+    def state(self, i):
+        return self.starts[i], self.lineNumbers[i], self.lineStarts[i], self.contexts[i]
+
+
+class IncrementalTokenizer(object):
+    """
+    A tokenizer session over a buffer that is edited in place.
+
+    edit() restarts from the last step before the line of the edit, since a
+    failed regular expression scan may have looked ahead up to the end of
+    that line. The old steps are reused as soon as a new one starts past the
+    edit with the same lexer state; their tokens are moved in place. Tokens
+    always have their range.
+    """
+
+    def __init__(self, code, options=None, **kwargs):
+        options = {} if options is None else options.copy()
+        options.update(kwargs)
+        options['range'] = True
+        self.options = options
+
+        tokenizer = Tokenizer(code, options)
+        self.tolerant = tokenizer.errorHandler.tolerant
+        self.trackLoc = tokenizer.trackLoc
+        self.source = tokenizer.scanner.source
+        self.lines = tokenizer.scanner.lines
+        self.steps = TokenSteps()
+        self.tokens = Array()
+        self.scan(tokenizer, self.steps, self.tokens)
+        self.updateErrors()
+
+    def saveState(self, tokenizer):
+        scanner = tokenizer.scanner
+        reader = tokenizer.reader
+        context = (tuple(scanner.curlyStack), tuple(reader.values), reader.paren, reader.curly)
+        return scanner.index, scanner.lineNumber, scanner.lineStart, context
+
+    def restoreState(self, tokenizer, state):
+        index, lineNumber, lineStart, (curlyStack, values, paren, curly) = state
+        tokenizer.scanner.restoreState(ScannerState(index=index, lineNumber=lineNumber, lineStart=lineStart))
+        tokenizer.scanner.curlyStack = list(curlyStack)
+        tokenizer.reader.values = deque(values, maxlen=5)
+        tokenizer.reader.paren = paren
+        tokenizer.reader.curly = curly
+
+    def scanStep(self, tokenizer):
+        # Returns the entries of the next step, the errors it raised and
+        # whether the stream goes on.
+        errors = tokenizer.errorHandler.errors
+        count = len(errors)
+        entries = []
+        more = True
+        try:
+            entry = tokenizer.getNextToken()
+            if entry is None:
+                more = False
+            else:
+                entries.append(entry)
+                while tokenizer.buffer:
+                    entries.append(tokenizer.getNextToken())
+        except Error as e:
+            tokenizer.errorHandler.tolerate(e)
+            more = False
+        return entries, errors[count:] or None, more
+
+    # Scans steps until the end of the stream or, when `resync` is given,
+    # until it returns True for the state before a step, which is returned.
+    def scan(self, tokenizer, steps, tokens, resync=None):
+        while True:
+            state = self.saveState(tokenizer)
+            if resync is not None and resync(state):
+                return state
+            entries, errors, more = self.scanStep(tokenizer)
+            if entries or errors:
+                steps.append(state, len(tokens), errors)
+                tokens.extend(entries)
+            if not more:
+                return None
+
+    def updateErrors(self):
+        if self.tolerant:
+            self.tokens.errors = [error for errors in self.steps.errors if errors for error in errors]
+
+    def edit(self, start, end, text):
+        """
+        Replaces source[start:end] with `text` and re-tokenizes. Returns the
+        updated token list and the changed range, as (first, oldStop,
+        newStop): tokens[first:newStop] replace old tokens[first:oldStop].
+        """
+        source = self.source
+        if not 0 <= start <= end <= len(source):
+            raise ValueError('Invalid edit range')
+        text = readSource(text)
+        delta = len(text) - (end - start)
+        editEnd = start + len(text)
+
+        tokenizer = Tokenizer(source[:start] + text + source[end:], self.options)
+        lines = tokenizer.scanner.lines
+
+        old = self.steps
+        lineStart = start - self.lines.position(start).column if source else 0
+        k = max(bisect_left(old.starts, lineStart) - 1, 0)
+        if k:
+            self.restoreState(tokenizer, old.state(k))
+
+        found = [k]
+
+        def resync(state):
+            if state[0] < editEnd:
+                return False
+            index = state[0] - delta
+            j = found[0] = bisect_left(old.starts, index, found[0])
+            return j < len(old) and old.starts[j] == index and old.contexts[j] == state[3]
+
+        relexed = TokenSteps()
+        tokens = []
+        state = self.scan(tokenizer, relexed, tokens, resync)
+
+        first = old.offsets[k] if k < len(old) else len(self.tokens)
+        newStop = first + len(tokens)
+        j = found[0] if state is not None else len(old)
+        oldStop = old.offsets[j] if j < len(old) else len(self.tokens)
+
+        steps = TokenSteps()
+        steps.starts = old.starts[:k] + relexed.starts
+        steps.lineNumbers = old.lineNumbers[:k] + relexed.lineNumbers
+        steps.lineStarts = old.lineStarts[:k] + relexed.lineStarts
+        steps.contexts = old.contexts[:k] + relexed.contexts
+        steps.offsets = old.offsets[:k]
+        steps.offsets.extend(offset + first for offset in relexed.offsets)
+        steps.errors = old.errors[:k] + relexed.errors
+
+        reused = self.tokens[oldStop:]
+        if state is not None:
+            lineDelta = state[1] - old.lineNumbers[j]
+            syncLineStart = old.lineStarts[j]
+            newLineStart = state[2]
+
+            # Positions of comments and errors are relative to the line start
+            # tracked by the scanner, either the one at the point where the
+            # streams line up again or one after it.
+            def move(offset):
+                return newLineStart if offset == syncLineStart else offset + delta
+
+            steps.starts.extend(index + delta for index in old.starts[j:])
+            steps.lineNumbers.extend(line + lineDelta for line in old.lineNumbers[j:])
+            steps.lineStarts.extend(move(offset) for offset in old.lineStarts[j:])
+            steps.contexts.extend(old.contexts[j:])
+            steps.offsets.extend(offset - oldStop + newStop for offset in old.offsets[j:])
+            handler = tokenizer.errorHandler
+            steps.errors.extend(errors and [self.moveError(error, delta, lineDelta, move, handler) for error in errors]
+                                for errors in old.errors[j:])
+            if delta or lineDelta or self.trackLoc:
+                for entry in reused:
+                    self.moveEntry(entry, delta, lineDelta, move, lines)
+
+        self.source = tokenizer.scanner.source
+        self.lines = lines
+        self.steps = steps
+        self.tokens = Array(self.tokens[:first])
+        self.tokens.extend(tokens)
+        self.tokens.extend(reused)
+        self.updateErrors()
+        return self.tokens, (first, oldStop, newStop)
+
+    def moveEntry(self, entry, delta, lineDelta, move, lines):
+        range = entry.range
+        range[0] += delta
+        range[1] += delta
+        loc = entry.loc
+        if loc is None:
+            return
+        if entry.type in ('BlockComment', 'LineComment'):
+            entry.loc = SourceLocation(
+                start=self.movePosition(loc.start, range[0], delta, lineDelta, move),
+                end=self.movePosition(loc.end, range[1], delta, lineDelta, move)
+            )
+        else:
+            entry.loc = LazySourceLocation(lines, range[0], range[1])
+
+    def movePosition(self, position, index, delta, lineDelta, move):
+        return Position(
+            line=position.line + lineDelta,
+            column=index - move(index - delta - position.column)
+        )
+
+    def moveError(self, error, delta, lineDelta, move, handler):
+        index = error['index'] + delta
+        column = index - move(error['index'] - error['column'] + 1) + 1
+        description = error['message'].split(': ', 2)[-1]
+        return handler.createError(index, error['lineNumber'] + lineDelta, column, description).toDict()
@@ -129,7 +129,7 @@ class Visitor(object):
 
     def visit_Object(self, obj):
         """Called if no explicit visitor function exists for an Object."""
-        yield obj.__dict__
+        yield dict(obj.items())
         yield Visited(obj)
 
     def visit_Generic(self, obj):
@@ -169,7 +169,7 @@ class ReprVisitor(Visitor):
         yield Visited("...")
 
     def visit_Object(self, obj):
-        value_repr = yield obj.__dict__
+        value_repr = yield dict(obj.items())
         yield Visited(value_repr)
 
     def visit_Generic(self, obj):
@@ -263,7 +263,7 @@ class ToDictVisitor(Visitor):
         })
 
     def visit_Object(self, obj):
-        obj = yield obj.__dict__
+        obj = yield dict(obj.items())
         yield Visited(obj)
 
     def visit_list(self, obj):
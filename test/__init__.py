@@ -23,15 +23,21 @@
 
 from __future__ import absolute_import
 
+import copy
 import os
 import re
 import json
+import shutil
+import tempfile
 import glob
 import fnmatch
 import unittest
 
-from esprima import parse, tokenize, Error, toDict
+from esprima import NodeVisitor, parse, parseExpression, reparse, ParseCache, tokenize, iterTokens, regExpCache, Error, toDict, IncrementalTokenizer
 from esprima.nodes import Script
+from esprima.compat import RecursionError
+from esprima.parser import Parser
+from esprima.regexp import RegExpError, validateRegExp
 
 BASE_DIR = os.path.dirname(__file__)
 
@@ -196,6 +202,274 @@ class TestEsprima(unittest.TestCase):
         r = parse(script)
         self.assertIsInstance(r, Script)
 
+    def test_regex_lexer(self):
+        code = 'var a = {b: 0x1F, c: .5e3, "d": `e${f}g`}; /* x\n */ a ??= /h[/]/g.test(\'i\\n\') // j\n<!-- k'
+        for options in ({}, {'comment': True, 'range': True, 'loc': True}):
+            self.assertEqual(
+                toDict(tokenize(code, options)),
+                toDict(tokenize(code, options, lexer='regex')))
+            self.assertEqual(
+                toDict(parse(code, options, tokens=True)),
+                toDict(parse(code, options, tokens=True, lexer='regex')))
+
+    def test_long_literals(self):
+        blob = 'x' * 100000
+        r = parse('a = "%s\\n\\x41"; b = `%s\\u{42}${c}\r\n`' % (blob, blob))
+        self.assertEqual(r.body[0].expression.right.value, blob + '\nA')
+        self.assertEqual(r.body[1].expression.right.quasis[0].value.cooked, blob + 'B')
+        self.assertEqual(r.body[1].expression.right.quasis[1].value.cooked, '\n')
+
+    def test_comment_lines(self):
+        code = '/* a\r\n b\u2028 */ // c\r\n\t x /* d'
+        tokens = tokenize(code, comment=True, loc=True, tolerant=True)
+        self.assertEqual([t.type for t in tokens], ['BlockComment', 'LineComment', 'Identifier', 'BlockComment'])
+        self.assertEqual((tokens[2].loc.start.line, tokens[2].loc.start.column), (4, 2))
+        self.assertEqual(tokens[3].value, ' d')
+
+    def test_astral_identifier(self):
+        r = parse('var \U00010400\U00010401 = 1')
+        self.assertEqual(r.body[0].declarations[0].id.name, '\U00010400\U00010401')
+
+    def test_lazy_loc(self):
+        r = parse('a;\r\n\u2028 b +\n c', loc=True, source='x.js')
+        expression = r.body[1].expression
+        self.assertEqual(type(expression.loc).__name__, 'LazySourceLocation')
+        self.assertEqual(expression.loc.toDict(), {
+            'start': {'line': 3, 'column': 1},
+            'end': {'line': 4, 'column': 2},
+            'source': 'x.js',
+        })
+        self.assertEqual(type(expression.loc).__name__, 'SourceLocation')
+        self.assertEqual(parse('', loc=True).loc.toDict(), {'start': {'line': 0, 'column': 0}, 'end': {'line': 0, 'column': 0}})
+
+    def test_columnar_tokens(self):
+        code = 'a = /x/g\n// c\n+ `t${a}`'
+        tokens = tokenize(code, range=True)
+        columns = tokenize(code, comment=True, columnar=True, internValues=True)
+        self.assertEqual([(t.type, t.value, t.range) for t in columns], [(t.type, t.value, t.range) for t in tokens])
+        self.assertEqual(list(columns.lines), [1, 1, 1, 3, 3, 3, 3])
+        self.assertEqual(columns.valueTable, ['a', '=', '/x/g', '+', '`t${', '}`'])
+        self.assertRaises(ValueError, tokenize, code, {'columnar': True}, lambda token: token)
+
+    def test_iter_tokens(self):
+        errors = []
+        tokens = iterTokens('if (x) /a/.test(y); function f() {} /b/;\n' * 1000 + '/*', tolerant=True, onError=errors.append)
+        self.assertEqual(next(tokens).value, 'if')
+        self.assertEqual(sum(t.type == 'RegularExpression' for t in tokens), 2000)
+        self.assertEqual(len(errors), 1)
+
+    def test_bytes_input(self):
+        code = 'var s = "\u00e9"'
+        expected = parse(code, range=True).toDict()
+        data = code.encode('utf-8')
+        self.assertEqual(parse(data, range=True).toDict(), expected)
+        self.assertEqual(parse(memoryview(data), range=True).toDict(), expected)
+        with self.assertRaises(Error):
+            parse(data[:-1])
+
+    def test_regex_validation(self):
+        regExpCache.clear()
+        code = 'a = /x+/; b = /x+/; c = /(/'
+        self.assertEqual(len(tokenize(code, tolerant=True).errors), 1)
+        self.assertEqual((regExpCache.hits, regExpCache.misses), (1, 2))
+        self.assertEqual(len(tokenize(code, tolerant=True, regexValidation='syntax').errors), 1)
+        self.assertEqual(len(tokenize(code, tolerant=True, regexValidation='none').errors), 0)
+        self.assertIsNone(parse('/a/', regexValidation='syntax').body[0].expression.value)
+
+    def test_incremental_tokenizer(self):
+        code = 'a = b / c;\nd = `x${e}y`;\nf(/g/);\n'
+        session = IncrementalTokenizer(code, loc=True, comment=True, tolerant=True)
+        for start, end, text in ((4, 5, '('), (4, 5, 'b'), (11, 11, '/*x*/'), (0, 1, 'aa\n')):
+            tokens, changed = session.edit(start, end, text)
+            self.assertEqual([toDict(t) for t in tokens],
+                             [toDict(t) for t in tokenize(session.source, range=True, loc=True, comment=True, tolerant=True)])
+        self.assertEqual(changed, (0, 2, 2))
+
+    def test_reparse(self):
+        code = '"use strict";\nvar a = 1\nf(a);\nfunction g() { return a; }\nh();\n'
+        previous = parse(code, range=True, loc=True)
+        reused = previous.body[4]
+        start = code.index('return')
+        code = code[:start] + 'b = 2;\n' + code[start:]
+        program = reparse(previous, code, (start, start, start + 7), range=True, loc=True)
+        self.assertIs(program.body[4], reused)
+        self.assertEqual(toDict(program), toDict(parse(code, range=True, loc=True)))
+
+    def test_parse_cache(self):
+        directory = tempfile.mkdtemp()
+        try:
+            cache = ParseCache(directory)
+            code = 'var a = /x/g, b = `${a}`;'
+            first = parse(code, range=True, loc=True, cache=cache)
+            second = parse(code, range=True, loc=True, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(toDict(first), toDict(second))
+            cache.maxSize = 1
+            parse('b', cache=cache)
+            self.assertEqual(len(os.listdir(cache.directory)), 0)
+            self.assertEqual(cache.size, 0)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_lazy_function_bodies(self):
+        code = 'function f(a) { return /}/.test(`${ {a} }`) }\nvar g = () => { x / 2 }, h = function () { "use strict" }'
+        program = parse(code, range=True, loc=True, lazy=True)
+        self.assertEqual(type(program.body[0].body).__name__, 'LazyFunctionBody')
+        self.assertEqual(toDict(program), toDict(parse(code, range=True, loc=True)))
+        for code2 in (
+            'function f() { x = a.return / 2; } function g() { y = 1 / 3; }',
+            'function outer(){ function f(s){ if (g(s)) /{/.test(s); } return 1; }',
+            'function f(s){ if (g(s)) /}/.test(s); return 1; } var z;',
+        ):
+            self.assertEqual(toDict(parse(code2, range=True, lazy=True)), toDict(parse(code2, range=True)))
+        self.assertRaises(Error, parse, 'function f() { let let }', lazy=True)
+        self.assertRaises(Error, parse, 'function f(){ a b }', lazy=True)
+        directory = tempfile.mkdtemp()
+        try:
+            for _ in range(2):
+                program = parse(code, range=True, loc=True, lazy=True, cache=directory)
+                self.assertEqual(type(program.body[0].body).__name__, 'LazyFunctionBody')
+            self.assertEqual(toDict(program), toDict(parse(code, range=True, loc=True)))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_delegate_batch(self):
+        code = '/* a */ var x = f(1); // b'
+        seen = []
+
+        def delegate(node, metadata):
+            seen.append((node.type, metadata.start.offset, metadata.end.line, metadata.endColumn))
+
+        parse(code, delegate=delegate)
+        reentrant = list(seen)
+        del seen[:]
+        parse(code, delegate=delegate, delegateMode='batch')
+        self.assertEqual(seen, reentrant)
+        self.assertEqual(seen[-1], ('Program', 8, 1, 21))
+        self.assertEqual(toDict(parse(code, attachComment=True, delegateMode='batch')), toDict(parse(code, attachComment=True)))
+
+    def test_relational_precedence(self):
+        expression = parse('a == b instanceof C || d in e < f').body[0].expression
+        self.assertEqual(expression.left.operator, '==')
+        self.assertEqual(expression.left.right.operator, 'instanceof')
+        self.assertEqual(expression.right.operator, '<')
+
+    def test_recover(self):
+        code = 'var a = = 1;\nfunction f() {\n  let x = (;\n  return x\n}\nclass C { m( { }\n}\nvar b = 2'
+        program = parse(code, recover=True, range=True)
+        self.assertEqual([node.type for node in program.body], ['ErrorNode', 'FunctionDeclaration', 'ClassDeclaration', 'VariableDeclaration'])
+        self.assertEqual(program.body[0].range, [0, 12])
+        self.assertEqual([node.type for node in program.body[1].body.body], ['ErrorNode', 'ReturnStatement'])
+        self.assertEqual(program.body[2].body.body[0].type, 'ErrorNode')
+        self.assertEqual(len(program.errors), 3)
+        self.assertRaises(Error, parse, code, tolerant=True)
+        program = parse('a: b(;\na: 1', recover=True)
+        self.assertEqual([node.type for node in program.body], ['ErrorNode', 'LabeledStatement'])
+        self.assertEqual(len(program.errors), 1)
+        code = "'use str*ict'; `\\"
+        self.assertEqual(parse(code, recover=True, range=True).body[1].range, [15, len(code)])
+        for code, ranges in (
+            ('x; "\\u{110000}"; y', [[0, 2], [3, 16], [17, 18]]),
+            ('a();\n`\nb();', [[0, 4], [5, 6], [7, 11]]),
+            ('"\\u{110000}"; x', [[0, 13], [14, 15]]),
+            ('x = 1\n@@@\ny = 2', [[0, 5], [6, 9], [10, 15]]),
+        ):
+            program = parse(code, recover=True, range=True)
+            self.assertEqual([node.range for node in program.body], ranges)
+            self.assertEqual(program.body[1 if len(ranges) == 3 else 0].type, 'ErrorNode')
+            self.assertEqual(len(program.errors), 1)
+
+    def test_parser_reset(self):
+        parser = Parser('a = 1', {'range': True, 'tolerant': True})
+        first = parser.parseScript()
+        parser.reset('return b')
+        second = parser.parseScript()
+        self.assertEqual(toDict(first), toDict(parse('a = 1', range=True)))
+        self.assertEqual(second.body[0].range, [0, 8])
+        self.assertEqual(len(parser.errorHandler.errors), 1)
+        parser.reset('export default c', {'sourceType': 'module'})
+        self.assertEqual(parser.parseModule().body[0].range, None)
+        self.assertEqual(parser.errorHandler.errors, [])
+
+    def test_parse_expression(self):
+        self.assertEqual(toDict(parseExpression('{a: f(b)[0]}')), toDict(parse('({a: f(b)[0]})').body[0].expression))
+        self.assertEqual(parseExpression('<a>{b}</a>', jsx=True, range=True).range, [0, 10])
+        self.assertEqual(len(parseExpression('a /* b */ + c', comment=True).comments), 1)
+        self.assertRaises(Error, parseExpression, 'a; b')
+
+    def test_deep_nesting(self):
+        n = 5000
+        self.assertEqual(len(parse('x = ' + '[' * n + ']' * n + ';').body), 1)
+        self.assertEqual(len(parse('x = ' + '{a: ' * n + '[{}]' + '}' * n + ';').body), 1)
+        self.assertEqual(parse('a ? b : ' * n + 'c').body[0].expression.alternate.type, 'ConditionalExpression')
+        self.assertEqual(parse('a' + '.b' * n + '(c)' * n).body[0].expression.type, 'CallExpression')
+        self.assertEqual(toDict(parse('x = [[a] = [1], {b: {}}.b]')), toDict(parse('x = [([a] = [1]), ({b: {}}).b]')))
+        with self.assertRaises(Error) as cm:
+            parse('(' * n + ')' * n)
+        self.assertEqual(cm.exception.message, 'Line 1: Maximum nesting depth exceeded')
+        depth = Parser.maxNestingDepth
+        self.assertEqual(len(parse('{' * depth + '}' * depth).body), 1)
+        with self.assertRaises(Error) as cm:
+            parse('f(' * (depth + 1) + ')' * (depth + 1))
+        self.assertEqual(cm.exception.column, 2 * depth + 3)
+
+        def delegate(node, metadata):
+            raise RecursionError()
+
+        self.assertRaises(RecursionError, parse, 'a', delegate=delegate)
+
+    def test_node_slots(self):
+        program = parse('/* a */ b', range=True, attachComment=True)
+        statement = program.body[0]
+        self.assertEqual(statement.keys(), ['type', 'expression', 'range', 'leadingComments'])
+        self.assertIsNone(statement.trailingComments)
+        del statement.leadingComments
+        self.assertEqual(toDict(statement), toDict(parse('        b', range=True).body[0]))
+
+        def delegate(node, metadata):
+            node.depth = metadata.start.offset
+
+        program = parse('a(b)', delegate=delegate)
+        self.assertEqual(program.body[0].expression.arguments[0].depth, 2)
+        self.assertIsNone(program.body[0].expression.scope)
+        self.assertRaises(TypeError, vars, statement)
+        self.assertEqual(toDict(copy.deepcopy(program)), toDict(program))
+
+    def test_arena(self):
+        code = '/* a */ var a = [1, , b]; function f(x) { return x + a; }'
+        for options in (dict(tokens=True, comment=True), dict(range=True, tokens=True, comment=True)):
+            self.assertEqual(toDict(parse(code, arena=True, **options)), toDict(parse(code, **options)))
+        options = dict(loc=True, attachComment=True)
+        program = parse(code, arena=True, **options)
+        self.assertEqual(toDict(program), toDict(parse(code, **options)))
+        arena = program.arena
+        function = arena.select('FunctionDeclaration')[0]
+        self.assertEqual([arena.type(i) for i in arena.children(function)], ['Identifier', 'Identifier', 'BlockStatement'])
+        self.assertEqual(len(arena.subtree(function)), 8)
+        self.assertEqual(arena.parent(function), 0)
+        self.assertEqual(program.body[0].declarations[0].init.elements[1], None)
+        self.assertEqual(program.body[1].body.body[0].argument.left, arena.node(arena.select('Identifier', function)[2]))
+
+        class Names(NodeVisitor):
+            def visit_Identifier(self, node):
+                names.append(node.name)
+                yield node
+
+        names = []
+        Names().visit(program)
+        self.assertEqual(names, ['a', 'b', 'f', 'x', 'x', 'a'])
+
+    def test_regexp_grammar(self):
+        for pattern, flags in (('(?<a>.)\\k<a>', ''), ('\\p{Script=Greek}', 'u'), ('[\\w--\\q{x}]', 'v'), ('(?=a)*', '')):
+            validateRegExp(pattern, flags)
+        for pattern, flags in (('(?<a>.)(?<a>.)', ''), ('[z-a]', ''), ('(?=a)*', 'u'), ('[^\\p{RGI_Emoji}]', 'v'), ('a', 'gg')):
+            self.assertRaises(RegExpError, validateRegExp, pattern, flags)
+        self.assertEqual(validateRegExp('a*', '', ast=True)[3][0][3][0][:4], ('Quantifier', 0, 2, 0))
+        self.assertEqual(len(tokenize('/(?<a>.)\\k<b>/', tolerant=True).errors), 1)
+        pattern = '/' + '(' * 1000 + 'a' + ')' * 1000 + '/'
+        self.assertEqual(len(tokenize(pattern)), 1)
+        self.assertRaises(RegExpError, validateRegExp, '[' * 5000 + ']' * 5000, 'v')
+
 
 # class TestThirdParty(unittest.TestCase):
 #     pass
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Regenerates esprima/unicode_tables.py from the unicodedata module of the
+running interpreter:
+
+    python tools/generate_unicode_tables.py > esprima/unicode_tables.py
+"""
+
+from __future__ import print_function, unicode_literals
+
+import sys
+import unicodedata
+
+try:
+    unichr
+except NameError:
+    unichr = chr
+
+ID_START_CATEGORIES = frozenset(('Lu', 'Ll', 'Lt', 'Lm', 'Lo', 'Nl'))
+ID_CONTINUE_CATEGORIES = ID_START_CATEGORIES.union(('Mn', 'Mc', 'Nd', 'Pc'))
+
+# https://www.unicode.org/Public/UCD/latest/ucd/PropList.txt
+OTHER_ID_START = frozenset((
+    0x1885, 0x1886, 0x2118, 0x212E, 0x309B, 0x309C,
+))
+OTHER_ID_CONTINUE = frozenset((
+    0x00B7, 0x0387, 0x1369, 0x136A, 0x136B, 0x136C,
+    0x136D, 0x136E, 0x136F, 0x1370, 0x1371, 0x19DA,
+))
+
+# Characters the scanner treats as identifier characters on top of ID_Start
+# and ID_Continue: `$`, `_` and the `\` introducing a unicode escape, plus
+# ZWNJ and ZWJ.
+EXTRA_ID_START = frozenset((0x24, 0x5F, 0x5C))
+EXTRA_ID_CONTINUE = frozenset((0x200C, 0x200D))
+
+
+def ranges(predicate):
+    table = []
+    inside = False
+    for cp in range(sys.maxunicode + 1):
+        if predicate(cp) is not inside:
+            table.append(cp)
+            inside = not inside
+    if inside:
+        table.append(sys.maxunicode + 1)
+    return table
+
+
+def isIdentifierStart(cp):
+    return (
+        cp in EXTRA_ID_START or
+        cp in OTHER_ID_START or
+        unicodedata.category(unichr(cp)) in ID_START_CATEGORIES
+    )
+
+
+def isIdentifierPart(cp):
+    return (
+        isIdentifierStart(cp) or
+        cp in EXTRA_ID_CONTINUE or
+        cp in OTHER_ID_CONTINUE or
+        unicodedata.category(unichr(cp)) in ID_CONTINUE_CATEGORIES
+    )
+
+
+def dump(name, table):
+    print('%s = (' % name)
+    for i in range(0, len(table), 8):
+        print('    ' + ' '.join('0x%04X,' % cp for cp in table[i:i + 8]))
+    print(')')
+
+
+def main():
+    if sys.maxunicode < 0x10FFFF:
+        sys.exit('A wide unicode build is required')
+    print('# -*- coding: utf-8 -*-')
+    print('# Generated by tools/generate_unicode_tables.py, do not edit.')
+    print('#')
+    print('# Every table is a sorted tuple of range boundaries: a code point `cp`')
+    print('# belongs to the set when `bisect_right(TABLE, cp)` is odd.')
+    print()
+    print('from __future__ import unicode_literals')
+    print()
+    print("UNICODE_VERSION = '%s'" % unicodedata.unidata_version)
+    print()
+    dump('ID_START', ranges(isIdentifierStart))
+    print()
+    dump('ID_CONTINUE', ranges(isIdentifierPart))
+
+
+if __name__ == '__main__':
+    main()